@@ -13,6 +13,8 @@ from app.chat.domain.entities.law_reference import LawReference
 from app.chat.domain.repositories.chat_message_repository import ChatMessageRepository
 from app.chat.domain.repositories.chat_session_repository import ChatSessionRepository
 from app.search.application.use_cases.search_use_cases import SearchUseCases
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
+from app.search.domain.value_objects.search_filter import SearchFilter
 from app.shared.services.mlflow_tracker import MLflowTracker
 
 
@@ -53,7 +55,9 @@ class ChatUseCases:
         self,
         session_id: str,
         user_message: str,
-        conversation_history: List[Dict[str, str]] = None
+        conversation_history: List[Dict[str, str]] = None,
+        search_filter: Optional[SearchFilter] = None,
+        collection: str = DEFAULT_COLLECTION
     ) -> ChatGenerationResult:
         """메시지 전송 및 응답 생성"""
         start_time = time.time()
@@ -79,7 +83,11 @@ class ChatUseCases:
 
                 # 컨텍스트 검색
                 search_start = time.time()
-                search_result = await self.search_use_cases.search_documents(user_message)
+                search_result = await self.search_use_cases.search_documents(
+                    user_message,
+                    search_filter=search_filter,
+                    collection=collection
+                )
                 retrieve_time = time.time() - search_start
 
                 law_search_result: LawSearchResult = await self.law_information_service.search_related_laws(
@@ -205,5 +213,6 @@ class ChatUseCases:
             "avg_messages_per_session": total_messages / total_sessions if total_sessions > 0 else 0,
             "avg_response_time": avg_response_time,
             "avg_retrieve_time": avg_retrieve_time,
-            "avg_generate_time": avg_generate_time
+            "avg_generate_time": avg_generate_time,
+            "search": await self.search_use_cases.get_search_statistics()
         }
@@ -1,4 +1,5 @@
 from dataclasses import asdict
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
@@ -11,7 +12,10 @@ from app.chat.presentation.schemas.chat_schemas import (
     LawReferenceSchema,
 )
 from app.db.database import get_db
-from app.shared.dependencies import get_chat_use_cases
+from app.documents.application.use_cases.document_use_cases import DocumentUseCases
+from app.search.domain.value_objects.collection import normalize_collection
+from app.search.domain.value_objects.search_filter import SearchFilter
+from app.shared.dependencies import get_chat_use_cases, get_document_use_cases
 
 
 class ChatController:
@@ -28,9 +32,16 @@ class ChatController:
         async def send_message(
             request: ChatRequest,
             chat_use_cases: ChatUseCases = Depends(get_chat_use_cases),
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases),
             db: Session = Depends(get_db)
         ):
             """메시지 전송"""
+            try:
+                collection = normalize_collection(request.collection)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            search_filter = await self._build_search_filter(request, document_use_cases)
+
             try:
                 # 대화 기록을 딕셔너리 형태로 변환
                 conversation_history = [
@@ -48,7 +59,9 @@ class ChatController:
                 chat_result = await chat_use_cases.send_message(
                     session_id=session_id,
                     user_message=request.message,
-                    conversation_history=conversation_history
+                    conversation_history=conversation_history,
+                    search_filter=search_filter,
+                    collection=collection
                 )
 
                 # 새로운 대화 기록 생성
@@ -135,3 +148,28 @@ class ChatController:
                 return await chat_use_cases.get_chat_statistics()
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"통계 조회 중 오류: {str(e)}")
+
+    async def _build_search_filter(
+        self,
+        request: ChatRequest,
+        document_use_cases: DocumentUseCases
+    ) -> Optional[SearchFilter]:
+        """요청의 문서 ID·출처·페이지 조건을 검색 필터로 변환"""
+        if request.document_ids is None and request.sources is None and request.pages is None:
+            return None
+
+        sources = None
+        if request.document_ids is not None or request.sources is not None:
+            sources = list(request.sources or [])
+            for source in request.sources or []:
+                # 업로드 파일은 본문 해시 경로에 저장되므로 업로드한 파일명은 문서 기록으로 경로를 찾는다
+                document = await document_use_cases.get_document_by_filename(source)
+                if document:
+                    sources.append(document.chunk_source)
+            for document_id in request.document_ids or []:
+                document = await document_use_cases.get_document_by_id(document_id)
+                if not document:
+                    raise HTTPException(status_code=404, detail=f"문서를 찾을 수 없습니다: {document_id}")
+                sources.append(document.chunk_source)
+
+        return SearchFilter.create(sources=sources, pages=request.pages)
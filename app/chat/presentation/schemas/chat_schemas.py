@@ -18,6 +18,12 @@ class ChatRequest(BaseModel):
     message: str
     session_id: Optional[str] = None
     conversation_history: List[ChatMessageSchema] = []
+    # 검색할 문서 컬렉션 (지정하지 않으면 기본 컬렉션)
+    collection: Optional[str] = None
+    # 검색 범위 제한 (지정하지 않으면 전체 문서 검색)
+    document_ids: Optional[List[int]] = None
+    sources: Optional[List[str]] = None
+    pages: Optional[List[int]] = None
 
 
 class ChatResponse(BaseModel):
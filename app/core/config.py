@@ -14,6 +14,82 @@ class Settings(BaseSettings):
     openai_api_key: str
     faiss_db_path: str = "./data/faiss"
     upload_dir: str = "./data/uploads"
+    upload_chunk_size_kb: int = 1024  # 업로드를 디스크에 쓰고 해시를 계산하는 단위
+
+    # 문서 파싱 설정 (파싱·청크 분할은 프로세스 풀에서 실행)
+    document_parse_workers: int = 0  # 파싱 프로세스 수 (0이면 CPU 코어 수)
+    pdf_pages_per_task: int = 8  # PDF를 이 페이지 수씩 나눠 여러 프로세스에서 동시에 파싱
+
+    # 문서 수집 워커 설정 (업로드는 작업만 등록하고 워커 풀이 파싱·임베딩·색인)
+    ingestion_concurrency: int = 2  # 프로세스당 동시에 처리하는 문서 수
+    ingestion_max_attempts: int = 3  # 실패 시 재시도를 포함한 최대 시도 횟수
+    ingestion_retry_backoff_seconds: float = 5.0  # 재시도 대기 시간 (시도마다 두 배)
+    ingestion_poll_interval_seconds: float = 2.0  # 대기 작업 확인 주기 (다른 프로세스에서 등록된 작업·재시도)
+    ingestion_lease_seconds: float = 600.0  # 이 시간 동안 진행 갱신이 없는 처리 중 작업은 다시 대기열로
+    ingestion_batch_chunks: int = 256  # 한 번에 임베딩·색인을 커밋하는 청크 수 (재개 단위)
+
+    # 임베딩 제공자 설정 (openai, hashing: 외부 호출 없는 로컬 특징 해싱)
+    embedding_provider: str = "openai"
+    embedding_model: str = "text-embedding-ada-002"  # openai 제공자에서 사용
+    embedding_dimension: int = 0  # 0이면 모델 기본 차원 (hashing은 1536)
+
+    # 재임베딩 설정 (EMBEDDING_MODEL을 바꾼 뒤 기존 인덱스를 새 모델로 옮길 때)
+    reembed_batch_size: int = 256
+    reembed_batch_interval_ms: float = 100.0  # 배치 사이 대기 시간 (임베딩 API·검색 부하 제한)
+
+    # 임베딩 배치 설정
+    embedding_batch_size: int = 100
+    embedding_batch_max_tokens: int = 100_000
+    embedding_max_concurrency: int = 4  # 프로세스 전체 동시 임베딩 요청 수 (커넥션 풀 크기)
+    embedding_timeout: float = 30.0  # 임베딩 요청 타임아웃 (초)
+    embedding_max_retries: int = 3  # 일시적 오류 시 재시도 횟수 (지수 백오프)
+
+    # 질의 임베딩 캐시 설정
+    query_cache_max_entries: int = 10000  # 0이면 캐시 비활성화
+    query_cache_ttl_seconds: float = 86400.0
+    query_cache_disk_path: Optional[str] = None  # 지정하면 SQLite 디스크 계층 사용
+    query_cache_disk_max_entries: int = 100000
+
+    # 본문 해시 임베딩 캐시 (float16, 비우면 비활성화)
+    embedding_cache_path: Optional[str] = "./data/cache/embeddings.sqlite3"
+
+    # FAISS 인덱스 설정 (flat, ivf_flat, ivf_pq, hnsw, sq_fp16, sq8)
+    faiss_index_type: str = "flat"
+    faiss_nlist: int = 0  # 0이면 벡터 수에 따라 자동 계산
+    faiss_nprobe: int = 16
+    faiss_pq_m: int = 64
+    faiss_pq_nbits: int = 8
+    faiss_hnsw_m: int = 32
+    faiss_ef_construction: int = 200
+    faiss_ef_search: int = 128
+    faiss_min_train_size: int = 10000  # 학습형 인덱스로 전환하기 위한 최소 벡터 수
+    faiss_rerank_factor: int = 4  # 양자화 인덱스 후보 배수 (원본 벡터로 재채점, 1이면 끔)
+
+    # 벡터 연산 실행기 설정
+    faiss_omp_threads: int = 0  # 0이면 faiss 기본값(코어 수)
+    vector_executor_workers: int = 4  # FAISS 검색·NumPy 연산 전용 스레드 수
+    search_batch_size: int = 64  # 한 번의 index.search로 묶을 최대 동시 검색 수
+    search_batch_window_ms: float = 1.0  # 동시 검색을 모으는 대기 시간
+
+    # FAISS 세그먼트 저장소 설정
+    faiss_delta_max_rows: int = 10000  # 델타 인덱스가 이 크기를 넘으면 기본 인덱스로 체크포인트
+    faiss_max_segments: int = 32  # 세그먼트 수가 이를 넘으면 작은 세그먼트부터 병합
+    faiss_max_deleted_ratio: float = 0.3  # 삭제 비율이 이를 넘는 세그먼트는 재작성
+    faiss_reload_check_interval_ms: float = 500.0  # 다른 워커가 커밋한 새 버전 확인 주기 (0이면 요청마다)
+    faiss_snapshot_retention: int = 10  # 롤백할 수 있도록 보존할 최근 버전 수 (현재 버전 포함)
+
+    # 컬렉션 설정 (컬렉션별 인덱스는 처음 사용할 때 로드)
+    vector_collection_memory_budget_mb: int = 2048  # 넘으면 오래 쓰지 않은 컬렉션부터 닫음
+
+    # 하이브리드 검색 설정 (BM25 어휘 검색 + 벡터 검색)
+    hybrid_search_enabled: bool = True
+    hybrid_candidates: int = 20  # 결합 전 각 검색에서 가져올 후보 수
+    hybrid_rrf_k: int = 60  # RRF 순위 보정 상수
+
+    # 업로드 시 중복 청크 제거 설정 (중복은 대표 청크를 가리키고 임베딩·인덱스에서 제외)
+    dedup_enabled: bool = True
+    dedup_similarity_threshold: float = 0.9  # MinHash로 추정한 자카드 유사도가 이 이상이면 유사 중복
+    dedup_vector_threshold: float = 0.0  # 0보다 크면 유사 중복을 임베딩해 코사인 유사도까지 확인
 
     # MLflow 설정
     mlflow_tracking_uri: str = "./data/mlruns"
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
@@ -29,9 +29,36 @@ def get_db():
         db.close()
 
 
-def create_tables():
-    """테이블 생성"""
-    Base.metadata.create_all(bind=engine)
+def create_tables(bind=None):
+    """테이블 생성 (이미 있는 테이블에는 모델에 새로 추가된 컬럼·인덱스 생성)"""
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    create_missing_columns(bind)
+    create_missing_indexes(bind)
+
+
+def create_missing_columns(bind=None):
+    """create_all은 기존 테이블을 바꾸지 않으므로, 모델에 새로 추가된 NULL 허용 컬럼을 기존 테이블에 추가"""
+    bind = bind or engine
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+def create_missing_indexes(bind=None):
+    """create_all은 기존 테이블을 바꾸지 않으므로, 모델에는 있고 DB에는 없는 인덱스를 기존 테이블에 생성"""
+    bind = bind or engine
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=bind)
 
 
 def drop_tables():
@@ -41,7 +41,8 @@ class Document(Base, MetadataMixin):
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False, index=True)  # 본문 해시 경로 (같은 본문 업로드 조회)
+    upload_key = Column(String(64), unique=True, index=True)  # 컬렉션·저장 경로 해시 (실패하지 않은 문서만, 중복 등록 방지)
     file_size = Column(Integer)
     file_type = Column(String(50))
     upload_time = Column(DateTime(timezone=True), server_default=func.now())
@@ -53,6 +54,31 @@ class Document(Base, MetadataMixin):
         return f"<Document(id={self.id}, filename='{self.filename}')>"
 
 
+class IngestionJob(Base, MetadataMixin):
+    """문서 수집 작업 테이블 (백그라운드 워커가 대기 작업을 선점해 처리)"""
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(36), unique=True, index=True, nullable=False)
+    document_id = Column(Integer, index=True)
+    collection = Column(String(64))
+    status = Column(String(20), index=True)  # pending, processing, completed, failed
+    stage = Column(String(20))
+    progress = Column(Float, default=0.0)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    chunk_count = Column(Integer, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True))
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    available_at = Column(DateTime(timezone=True), index=True)
+
+    def __repr__(self):
+        return f"<IngestionJob(id={self.id}, job_id='{self.job_id}', status='{self.status}')>"
+
+
 class ChatSession(Base, MetadataMixin):
     """채팅 세션 테이블"""
     __tablename__ = "chat_sessions"
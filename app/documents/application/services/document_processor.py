@@ -1,12 +1,59 @@
+import asyncio
+import multiprocessing
+import os
 from abc import ABC, abstractmethod
-from typing import List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders.word_document import Docx2txtLoader
+from PyPDF2 import PdfReader
 
 from app.documents.domain.value_objects.document_chunk import DocumentChunk
 
+# 작업 프로세스가 돌려주는 분할 결과 (본문, 로더 메타데이터)
+ParsedText = Tuple[str, Dict[str, Any]]
+
+# 작업 프로세스마다 (chunk_size, chunk_overlap)별 분할기를 한 번만 만든다
+_splitters: Dict[Tuple[int, int], RecursiveCharacterTextSplitter] = {}
+
+
+def _split(texts: List[ParsedText], chunk_size: int, chunk_overlap: int) -> List[ParsedText]:
+    splitter = _splitters.get((chunk_size, chunk_overlap))
+    if splitter is None:
+        splitter = _splitters[(chunk_size, chunk_overlap)] = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
+        )
+    contents = [content for content, _ in texts]
+    metadatas = [metadata for _, metadata in texts]
+    return [(doc.page_content, doc.metadata) for doc in splitter.create_documents(contents, metadatas)]
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def _parse_pdf_pages(file_path: str, start: int, end: int, chunk_size: int, chunk_overlap: int) -> List[ParsedText]:
+    """PDF의 [start, end) 페이지를 추출해 청크로 분할 (작업 프로세스에서 실행)"""
+    reader = PdfReader(file_path)
+    texts = [
+        (reader.pages[page].extract_text() or "", {"source": file_path, "page": page})
+        for page in range(start, end)
+    ]
+    return _split(texts, chunk_size, chunk_overlap)
+
+
+def _parse_whole_document(file_path: str, chunk_size: int, chunk_overlap: int) -> List[ParsedText]:
+    """페이지 구분이 없는 문서(TXT, DOCX)를 통째로 읽어 청크로 분할 (작업 프로세스에서 실행)"""
+    if file_path.endswith('.docx'):
+        loader = Docx2txtLoader(file_path)
+    else:
+        loader = TextLoader(file_path, encoding='utf-8')
+    return _split([(doc.page_content, doc.metadata) for doc in loader.load()], chunk_size, chunk_overlap)
+
 
 class DocumentProcessor(ABC):
     """문서 처리 서비스 인터페이스"""
@@ -16,45 +63,106 @@ class DocumentProcessor(ABC):
         """문서를 처리하여 청크들로 분할"""
         pass
 
+    async def stream_document(self, file_path: str) -> AsyncIterator[List[DocumentChunk]]:
+        """문서 청크를 문서 순서대로 묶음 단위로 전달 (기본 구현은 전체 처리 후 한 묶음)"""
+        yield await self.process_document(file_path)
+
 
 class LangChainDocumentProcessor(DocumentProcessor):
-    """LangChain을 사용한 문서 처리기"""
+    """LangChain을 사용한 문서 처리기
 
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
+    파싱·분할은 CPU를 쓰므로 이벤트 루프 대신 프로세스 풀에서 실행한다.
+    PDF는 pages_per_task 페이지씩 나눠 여러 프로세스에서 동시에 파싱하고, 완료된 범위를
+    페이지 순서대로 묶음으로 내보낸다. TXT·DOCX는 페이지 구분이 없어 문서 하나를 한 프로세스에서 처리한다.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        max_workers: int = 0,
+        pages_per_task: int = 8
+    ):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+        self.pages_per_task = max(1, pages_per_task)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """처음 사용할 때 프로세스 풀 생성 (스레드가 있는 프로세스를 fork하지 않도록 spawn 사용)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), func, *args)
+
+    def close(self):
+        """프로세스 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
     async def process_document(self, file_path: str) -> List[DocumentChunk]:
         """문서를 처리하여 청크들로 분할"""
-        # 파일 확장자에 따른 로더 선택
+        chunks = []
+        async for batch in self.stream_document(file_path):
+            chunks.extend(batch)
+        return chunks
+
+    async def stream_document(self, file_path: str) -> AsyncIterator[List[DocumentChunk]]:
+        """문서를 처리해 청크를 페이지 범위 단위로 순서대로 전달"""
+        index = 0
+        async for texts in self._parse(file_path):
+            batch = []
+            for content, metadata in texts:
+                batch.append(DocumentChunk(
+                    content=content,
+                    chunk_id=f"{file_path}_{index}",
+                    source=file_path,
+                    page=metadata.get('page', 0),
+                    metadata=metadata
+                ))
+                index += 1
+            if batch:
+                yield batch
+
+    async def _parse(self, file_path: str) -> AsyncIterator[List[ParsedText]]:
+        # 파일 확장자에 따른 파싱 방식 선택
         if file_path.endswith('.pdf'):
-            loader = PyPDFLoader(file_path)
-        elif file_path.endswith('.docx'):
-            loader = Docx2txtLoader(file_path)
-        elif file_path.endswith('.txt'):
-            loader = TextLoader(file_path, encoding='utf-8')
+            async for texts in self._parse_pdf(file_path):
+                yield texts
+        elif file_path.endswith('.docx') or file_path.endswith('.txt'):
+            yield await self._run(_parse_whole_document, file_path, self.chunk_size, self.chunk_overlap)
         else:
             raise ValueError(f"지원하지 않는 파일 형식: {file_path}")
 
-        # 문서 로드
-        documents = loader.load()
+    async def _parse_pdf(self, file_path: str) -> AsyncIterator[List[ParsedText]]:
+        """페이지 범위를 프로세스 풀에 나눠 맡기고 앞 범위부터 순서대로 전달
 
-        # 텍스트 분할
-        texts = self.text_splitter.split_documents(documents)
-
-        # DocumentChunk 객체들로 변환
-        chunks = []
-        for i, text in enumerate(texts):
-            chunk_id = f"{file_path}_{i}"
-            chunk = DocumentChunk(
-                content=text.page_content,
-                chunk_id=chunk_id,
-                source=file_path,
-                page=getattr(text, 'metadata', {}).get('page', 0),
-                metadata=getattr(text, 'metadata', {})
-            )
-            chunks.append(chunk)
+        한 번에 맡기는 범위는 작업 프로세스 수의 두 배까지로 제한해, 소비하는 쪽이 느리면
+        결과가 메모리에 쌓이지 않고 파싱도 그만큼 기다린다.
+        """
+        page_count = await self._run(_count_pdf_pages, file_path)
+        ranges = deque(
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        )
 
-        return chunks
+        pending: deque = deque()
+        try:
+            while ranges or pending:
+                while ranges and len(pending) < 2 * self.max_workers:
+                    start, end = ranges.popleft()
+                    pending.append(asyncio.ensure_future(self._run(
+                        _parse_pdf_pages, file_path, start, end, self.chunk_size, self.chunk_overlap
+                    )))
+                yield await pending.popleft()
+        finally:
+            # 중간에 실패하거나 취소되면 아직 시작하지 않은 범위는 취소
+            for future in pending:
+                future.cancel()
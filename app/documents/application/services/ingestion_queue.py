@@ -0,0 +1,110 @@
+import asyncio
+from typing import Callable, ContextManager, List, Optional
+
+from app.documents.application.use_cases.document_use_cases import DocumentUseCases
+from app.documents.domain.entities.ingestion_job import IngestionJob
+
+
+class IngestionQueue:
+    """수집 작업 테이블을 폴링해 문서를 처리하는 제한된 크기의 비동기 워커 풀
+
+    - 워커 concurrency개가 각자 작업을 하나씩 선점해 처리하므로 동시에 처리되는 문서 수가 제한된다.
+    - 작업은 DB에 있으므로 재시작하거나 여러 프로세스가 떠 있어도 잃지 않고, 선점은 조건부 UPDATE로 한 워커만 가져간다.
+    - 처리 중에는 주기적으로 갱신 시각을 기록하고, lease_seconds 동안 갱신이 없는 작업(죽은 워커의 작업)은 대기열로 되돌린다.
+    - 워커마다 use_cases_scope로 자기 DB 세션을 연다 (요청 세션은 응답 후 닫힌다).
+    """
+
+    def __init__(
+        self,
+        use_cases_scope: Callable[[], ContextManager[DocumentUseCases]],
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        lease_seconds: float = 600.0
+    ):
+        self.use_cases_scope = use_cases_scope
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = max(0.1, poll_interval)
+        self.lease_seconds = max(self.poll_interval, lease_seconds)
+        # 갱신은 lease의 1/3마다 기록해 한두 번 늦어도 다른 워커가 가져가지 않도록
+        self.heartbeat_interval = self.lease_seconds / 3
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """워커와 멈춘 작업 회수 루프 시작 (실행 중인 이벤트 루프 안에서 호출)"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._recover_stale()))
+
+    async def stop(self):
+        """워커 종료 (처리 중이던 작업은 시도 횟수를 되돌려 대기열로 돌아간다)"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def notify(self):
+        """새 작업이 등록됐음을 알려 대기 중인 워커를 바로 깨움"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self):
+        while True:
+            try:
+                processed = await self._run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"문서 수집 작업 처리 중 오류: {e}")
+                processed = False
+
+            if not processed:
+                await self._wait()
+
+    async def _wait(self):
+        """새 작업 알림이나 폴링 주기(재시도 대기 작업·다른 프로세스에서 등록된 작업) 중 먼저 오는 것까지 대기"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _run_once(self) -> bool:
+        """작업 하나를 선점해 처리 (처리할 작업이 없으면 False)"""
+        with self.use_cases_scope() as use_cases:
+            job = await use_cases.claim_next_ingestion_job()
+            if job is None:
+                return False
+
+            heartbeat = asyncio.create_task(self._heartbeat(use_cases, job))
+            try:
+                await use_cases.process_ingestion_job(job)
+            finally:
+                heartbeat.cancel()
+            return True
+
+    async def _heartbeat(self, use_cases: DocumentUseCases, job: IngestionJob):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await use_cases.heartbeat_ingestion_job(job)
+
+    async def _recover_stale(self):
+        while True:
+            try:
+                with self.use_cases_scope() as use_cases:
+                    released = await use_cases.release_stale_ingestion_jobs(self.lease_seconds)
+                if released:
+                    print(f"멈춘 문서 수집 작업 {released}개를 대기열로 되돌렸습니다.")
+                    self.notify()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"멈춘 문서 수집 작업 회수 중 오류: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import aiofiles
+
+# 저장을 마치기 전의 임시 파일 디렉토리 (업로드 디렉토리 안에 두어 os.replace가 같은 파일 시스템에서 일어나도록)
+INCOMING_DIR = ".incoming"
+
+
+@dataclass
+class StoredUpload:
+    """본문 해시 경로에 저장된 업로드 파일"""
+    file_path: str
+    content_hash: str
+    file_size: int
+    # 이번 업로드로 새로 기록됐는지 (같은 본문의 파일이 이미 있었으면 False)
+    created: bool
+
+
+class ContentAddressedUploadStorage:
+    """업로드 파일을 본문 SHA-256 경로(<업로드 디렉토리>/<해시 앞 2자리>/<해시><확장자>)에 저장
+
+    요청 본문을 chunk_size씩 읽어 비동기로 임시 파일에 쓰면서 같은 패스에서 해시와 크기를 계산하고,
+    다 쓴 뒤 해시 경로로 옮긴다. 이름이 같은 다른 파일은 서로 덮어쓰지 않고, 같은 본문은 한 파일만 남는다.
+    """
+
+    def __init__(self, upload_dir: str, chunk_size: int = 1024 * 1024):
+        self.upload_dir = upload_dir
+        self.chunk_size = max(1, chunk_size)
+
+    def path_for(self, content_hash: str, extension: str) -> str:
+        return os.path.join(self.upload_dir, content_hash[:2], f"{content_hash}{extension.lower()}")
+
+    async def store(self, stream: Any, extension: str) -> StoredUpload:
+        """await read(size)를 지원하는 스트림(UploadFile)을 끝까지 읽어 저장 (실패하면 임시 파일을 지우고 예외)"""
+        incoming_dir = os.path.join(self.upload_dir, INCOMING_DIR)
+        os.makedirs(incoming_dir, exist_ok=True)
+        tmp_path = os.path.join(incoming_dir, f"{uuid.uuid4().hex}.part")
+
+        digest = hashlib.sha256()
+        file_size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                while True:
+                    chunk = await stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    file_size += len(chunk)
+                    await f.write(chunk)
+
+            content_hash = digest.hexdigest()
+            file_path = self.path_for(content_hash, extension)
+            if os.path.exists(file_path):
+                os.remove(tmp_path)
+                return StoredUpload(file_path, content_hash, file_size, created=False)
+
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(tmp_path, file_path)
+            return StoredUpload(file_path, content_hash, file_size, created=True)
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -1,11 +1,18 @@
+import asyncio
 import os
 import time
-from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 from app.documents.application.services.document_processor import DocumentProcessor
 from app.documents.domain.entities.document import Document, DocumentStatus
+from app.documents.domain.entities.ingestion_job import IngestionJob, IngestionStage
 from app.documents.domain.repositories.document_repository import DocumentRepository
+from app.documents.domain.repositories.ingestion_job_repository import IngestionJobRepository
+from app.documents.domain.value_objects.document_chunk import DocumentChunk
 from app.search.domain.repositories.vector_store_repository import VectorStoreRepository
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
 from app.shared.services.mlflow_tracker import MLflowTracker
 
 
@@ -17,30 +24,83 @@ class DocumentUseCases:
         document_repository: DocumentRepository,
         vector_store_repository: VectorStoreRepository,
         document_processor: DocumentProcessor,
-        mlflow_tracker: MLflowTracker
+        mlflow_tracker: MLflowTracker,
+        ingestion_job_repository: Optional[IngestionJobRepository] = None,
+        ingestion_max_attempts: int = 3,
+        ingestion_retry_backoff_seconds: float = 5.0,
+        ingestion_batch_chunks: int = 256
     ):
         self.document_repository = document_repository
         self.vector_store_repository = vector_store_repository
         self.document_processor = document_processor
         self.mlflow_tracker = mlflow_tracker
+        self.ingestion_job_repository = ingestion_job_repository
+        self.ingestion_max_attempts = max(1, ingestion_max_attempts)
+        self.ingestion_retry_backoff_seconds = max(0.0, ingestion_retry_backoff_seconds)
+        self.ingestion_batch_chunks = max(1, ingestion_batch_chunks)
 
-    async def upload_document(
+    async def enqueue_document(
         self,
         filename: str,
         file_path: str,
         file_size: int,
-        file_type: str
+        file_type: str,
+        collection: str = DEFAULT_COLLECTION,
+        content_hash: Optional[str] = None
+    ) -> IngestionJob:
+        """문서를 기록하고 수집 작업을 등록 (파싱·임베딩·색인은 수집 워커 풀이 백그라운드에서 처리)
+
+        같은 본문이 이 컬렉션에 동시에 올라오면 하나만 등록되고 나머지는 DuplicateUploadError로
+        먼저 등록된 문서(와 그 문서의 작업 ID)를 받는다.
+        """
+        job = IngestionJob.create_new(None, collection, self.ingestion_max_attempts)
+        document = await self._register_document(
+            filename, file_path, file_size, file_type, collection, content_hash, job.job_id
+        )
+        job.document_id = document.id
+        return await self.ingestion_job_repository.save(job)
+
+    async def find_duplicate_upload(self, file_path: str, collection: str = DEFAULT_COLLECTION) -> Optional[Document]:
+        """같은 본문(같은 해시 경로)이 이 컬렉션에 이미 처리됐거나 처리 중이면 그 문서 (실패한 문서는 제외)"""
+        for document in await self.document_repository.find_by_file_path(file_path):
+            if document.metadata.get("collection", DEFAULT_COLLECTION) != collection:
+                continue
+            if document.status != DocumentStatus.FAILED:
+                return document
+        return None
+
+    async def _register_document(
+        self,
+        filename: str,
+        file_path: str,
+        file_size: int,
+        file_type: str,
+        collection: str,
+        content_hash: Optional[str] = None,
+        ingestion_job_id: Optional[str] = None
     ) -> Document:
-        """문서 업로드 및 처리"""
-        start_time = time.time()
+        """문서 엔티티를 대기 상태로 저장 (지원하지 않는 형식이면 실패로 기록하고 ValueError)
 
-        # 문서 엔티티 생성
+        같은 컬렉션에 파일명이 같은 완료된 문서가 있으면 그 문서의 새 버전으로 기록해,
+        처리할 때 바뀐 청크만 색인하고 처리가 끝나면 이전 버전을 대체한다.
+        """
+        metadata = {"collection": collection}
+        if content_hash:
+            metadata["content_hash"] = content_hash
+        if ingestion_job_id:
+            # 같은 본문이 다시 올라오면 진행 중인 작업을 알려줄 수 있도록 등록할 때 함께 기록
+            metadata["ingestion_job_id"] = ingestion_job_id
+        previous = await self._previous_version(filename, file_path, collection)
+        if previous is not None:
+            metadata["chunk_source"] = previous.chunk_source
+            metadata["previous_document_id"] = previous.id
         document = Document(
             filename=filename,
             file_path=file_path,
             file_size=file_size,
             file_type=file_type,
-            status=DocumentStatus.PENDING
+            status=DocumentStatus.PENDING,
+            metadata=metadata
         )
 
         # 파일 형식 검증
@@ -49,49 +109,230 @@ class DocumentUseCases:
             await self.document_repository.save(document)
             raise ValueError(f"지원하지 않는 파일 형식: {file_type}")
 
+        return await self.document_repository.save(document)
+
+    async def _previous_version(self, filename: str, file_path: str, collection: str) -> Optional[Document]:
+        """같은 컬렉션에서 파일명이 같고 본문이 다른 가장 최근의 완료된 문서"""
+        for document in await self.document_repository.find_all_by_filename(filename):
+            if (
+                document.status == DocumentStatus.COMPLETED
+                and document.file_path != file_path
+                and document.metadata.get("collection", DEFAULT_COLLECTION) == collection
+            ):
+                return document
+        return None
+
+    async def _process_document(
+        self,
+        document: Document,
+        collection: str,
+        on_progress: Optional[Callable[[IngestionStage, float, int], Awaitable[None]]] = None,
+        resume: bool = False
+    ) -> Document:
+        """문서를 파싱·청크 분할해 컬렉션 벡터 저장소에 추가하고 완료로 기록 (실패하면 예외)
+
+        파싱 결과를 ingestion_batch_chunks개씩 받아 배치마다 임베딩·색인을 커밋하므로 메모리는
+        문서 크기가 아니라 배치 크기에 비례하고, 커밋된 배치는 바로 검색된다. 다음 배치는 앞 배치를
+        커밋한 뒤에 가져오므로 색인이 느리면 파싱도 기다린다.
+        resume이면 이전 시도에서 이미 커밋된 청크(저장소의 같은 출처 청크 수)를 건너뛰고 이어서 색인한다.
+
+        이전 버전이 있는 문서는 청크 지문(페이지·본문 해시)을 저장된 청크와 비교해 새로 생기거나
+        바뀐 청크만 임베딩·색인하고, 남은 이전 청크를 지운 뒤 이전 문서 기록을 대체한다.
+        비교는 매번 저장소 기준으로 하므로 재시도하면 이미 색인된 청크는 바뀌지 않은 청크로 본다.
+        새 버전으로 추가한 청크는 청크 ID에 문서 ID를 붙여, 끝내 실패하면 그 청크만 지울 수 있게 한다.
+        """
+        start_time = time.time()
+
         # 문서를 처리 중 상태로 변경
         document.mark_as_processing()
-        saved_document = await self.document_repository.save(document)
+        await self.document_repository.save(document)
 
-        try:
-            # MLflow 추적 시작
-            run_name = f"upload_document_{filename}"
-            with self.mlflow_tracker.start_run(run_name):
-                # 파라미터 로깅
-                await self.mlflow_tracker.log_params({
-                    "filename": filename,
-                    "file_size": file_size,
-                    "file_type": file_type
-                })
-
-                # 문서 처리
-                chunks = await self.document_processor.process_document(file_path)
-
-                # 벡터 저장소에 추가
-                success = await self.vector_store_repository.add_documents(chunks)
-
-                if success:
-                    processing_time = time.time() - start_time
-                    document.mark_as_completed(len(chunks), processing_time)
-
-                    # 메트릭 로깅
-                    await self.mlflow_tracker.log_metrics({
-                        "chunk_count": len(chunks),
-                        "processing_time": processing_time,
-                        "success": 1
-                    })
-                else:
-                    document.mark_as_failed()
+        source = document.chunk_source
+        replacing = "previous_document_id" in document.metadata
+        committed = 0
+        remaining: Dict[str, int] = {}
+        if replacing:
+            remaining = await self.vector_store_repository.get_source_fingerprints(source, collection)
+        elif resume:
+            # 배치는 문서 순서대로 하나씩 원자적으로 커밋되므로 저장소의 청크 수가 곧 체크포인트
+            committed = await self.vector_store_repository.count_source_chunks(source, collection)
+
+        # MLflow 추적 시작
+        run_name = f"upload_document_{document.filename}"
+        with self.mlflow_tracker.start_run(run_name):
+            # 파라미터 로깅
+            await self.mlflow_tracker.log_params({
+                "filename": document.filename,
+                "file_size": document.file_size,
+                "file_type": document.file_type,
+                "collection": collection,
+                "resumed_chunks": committed
+            })
+
+            # 문서 처리 (파싱 → 분할 → 배치별 임베딩·색인)
+            if on_progress is not None:
+                await on_progress(IngestionStage.PARSING, 0.1, committed)
+            chunk_count = 0
+            unchanged_count = 0
+            async for batch in self._batches(self.document_processor.stream_document(document.file_path)):
+                start = chunk_count
+                chunk_count += len(batch)
+                if chunk_count <= committed:
+                    continue
+
+                # 이전 시도에서 커밋된 앞부분은 제외
+                batch = batch[max(0, committed - start):]
+                if source != document.file_path:
+                    batch = [replace(chunk, source=source) for chunk in batch]
+                if replacing:
+                    changed = self._changed_chunks(batch, remaining)
+                    unchanged_count += len(batch) - len(changed)
+                    batch = [
+                        replace(chunk, chunk_id=f"{self._replacement_key_prefix(document)}{chunk.chunk_id}")
+                        for chunk in changed
+                    ]
+
+                # 벡터 저장소에 추가 (이전 버전에서 위치만 바뀐 청크는 저장된 벡터 재사용)
+                success = not batch or await self.vector_store_repository.add_documents(
+                    batch, collection, reuse_source=source if replacing else None
+                )
+                if not success:
                     await self.mlflow_tracker.log_metric("success", 0)
+                    raise RuntimeError("청크를 벡터 저장소에 추가하지 못했습니다")
+
+                if on_progress is not None:
+                    await on_progress(IngestionStage.INDEXING, 0.5, chunk_count)
+
+            removed_count = 0
+            if replacing:
+                # 새 버전에 없는 이전 청크 삭제 후 이전 문서 기록 대체
+                removed_count = await self.vector_store_repository.delete_source_chunks(
+                    source, {fingerprint: count for fingerprint, count in remaining.items() if count > 0}, collection
+                )
+                await self._retire_previous_version(document)
+
+            processing_time = time.time() - start_time
+            document.mark_as_completed(chunk_count, processing_time)
+
+            # 메트릭 로깅
+            await self.mlflow_tracker.log_metrics({
+                "chunk_count": chunk_count,
+                "unchanged_chunks": unchanged_count,
+                "removed_chunks": removed_count,
+                "processing_time": processing_time,
+                "success": 1
+            })
+
+            # 문서 상태 업데이트
+            return await self.document_repository.save(document)
 
-                # 문서 상태 업데이트
-                return await self.document_repository.save(document)
+    @staticmethod
+    def _changed_chunks(chunks: List[DocumentChunk], remaining: Dict[str, int]) -> List[DocumentChunk]:
+        """저장된 청크에 지문이 같은 청크가 남아 있으면 그 청크를 그대로 쓰고(remaining에서 차감) 나머지만 반환"""
+        changed = []
+        for chunk in chunks:
+            fingerprint = chunk.fingerprint
+            if remaining.get(fingerprint, 0) > 0:
+                remaining[fingerprint] -= 1
+            else:
+                changed.append(chunk)
+        return changed
+
+    async def _retire_previous_version(self, document: Document):
+        """새 버전으로 대체된 이전 문서 기록과 (다른 문서가 쓰지 않으면) 원본 파일 삭제 (청크는 새 버전이 이어 씀)"""
+        previous = await self.document_repository.find_by_id(document.metadata.pop("previous_document_id"))
+        if previous is None:
+            return
+        await self.document_repository.delete(previous.id)
+        if not await self.document_repository.find_by_file_path(previous.file_path) and os.path.exists(previous.file_path):
+            os.remove(previous.file_path)
+
+    @staticmethod
+    def _replacement_key_prefix(document: Document) -> str:
+        """이전 버전을 대체하는 문서가 추가한 청크의 청크 ID 접두어"""
+        return f"{document.id}:"
+
+    async def _discard_partial_chunks(self, document: Document, collection: str):
+        """처리에 실패한 문서의 이미 색인된 청크 삭제
+
+        이전 버전을 대체하던 문서는 이 문서가 추가한 청크만 지워 이전 버전 청크만 남긴다.
+        """
+        if "previous_document_id" in document.metadata:
+            await self.vector_store_repository.delete_chunks_with_key_prefix(
+                document.chunk_source, self._replacement_key_prefix(document), collection
+            )
+        else:
+            await self.vector_store_repository.delete_documents(document.chunk_source, collection)
+
+    async def _batches(self, chunks: AsyncIterator[List[DocumentChunk]]) -> AsyncIterator[List[DocumentChunk]]:
+        """파서가 내보내는 청크 묶음을 ingestion_batch_chunks개 배치로 다시 묶음"""
+        pending: List[DocumentChunk] = []
+        async for part in chunks:
+            pending.extend(part)
+            while len(pending) >= self.ingestion_batch_chunks:
+                yield pending[:self.ingestion_batch_chunks]
+                pending = pending[self.ingestion_batch_chunks:]
+        if pending:
+            yield pending
+
+    async def claim_next_ingestion_job(self) -> Optional[IngestionJob]:
+        """처리할 수 있는 다음 수집 작업을 선점 (없으면 None)"""
+        return await self.ingestion_job_repository.claim_next()
+
+    async def process_ingestion_job(self, job: IngestionJob) -> IngestionJob:
+        """선점한 수집 작업 처리 (실패하면 재시도 횟수 안에서 백오프 후 다시 대기열로)"""
+        document = await self.document_repository.find_by_id(job.document_id)
+        if document is None:
+            job.mark_as_failed("문서 기록을 찾을 수 없습니다")
+            return await self.ingestion_job_repository.save(job)
+
+        async def report(stage: IngestionStage, progress: float, indexed_chunks: int):
+            job.update_progress(stage, progress, indexed_chunks)
+            await self.ingestion_job_repository.save(job)
+
+        try:
+            # 재시도·재시작이면 이전 시도에서 커밋된 배치 다음부터 이어서 처리
+            document = await self._process_document(document, job.collection, report, resume=True)
+            job.mark_as_completed(document.chunk_count)
+
+        except asyncio.CancelledError:
+            # 종료로 중단된 작업은 시도 횟수를 되돌려 다음 워커가 바로 이어받도록
+            job.release()
+            document.mark_as_pending()
+            await self.document_repository.save(document)
+            await self.ingestion_job_repository.save(job)
+            raise
 
         except Exception as e:
-            document.mark_as_failed()
+            if job.can_retry:
+                job.schedule_retry(str(e), self.ingestion_retry_backoff_seconds * 2 ** (job.attempts - 1))
+                document.mark_as_pending()
+            else:
+                # 더 이어서 처리하지 않으므로 이미 색인된 배치는 지운다
+                await self._discard_partial_chunks(document, job.collection)
+                job.mark_as_failed(str(e))
+                document.mark_as_failed()
             await self.document_repository.save(document)
             await self.mlflow_tracker.log_text(str(e), "error.txt")
-            raise
+
+        return await self.ingestion_job_repository.save(job)
+
+    async def heartbeat_ingestion_job(self, job: IngestionJob):
+        """처리 중인 작업의 갱신 시각을 기록 (다른 워커가 멈춘 작업으로 보고 가져가지 않도록)"""
+        job.updated_at = datetime.now()
+        await self.ingestion_job_repository.save(job)
+
+    async def release_stale_ingestion_jobs(self, lease_seconds: float) -> int:
+        """lease_seconds 동안 갱신이 없는 처리 중 작업(종료된 워커의 작업)을 대기열로 되돌림"""
+        return await self.ingestion_job_repository.release_stale(datetime.now() - timedelta(seconds=lease_seconds))
+
+    async def get_ingestion_job(self, job_id: str) -> Optional[IngestionJob]:
+        """수집 작업 조회"""
+        return await self.ingestion_job_repository.find_by_job_id(job_id)
+
+    async def get_ingestion_statistics(self) -> Dict[str, int]:
+        """상태별 수집 작업 수"""
+        return await self.ingestion_job_repository.count_by_status()
 
     async def get_document_by_id(self, document_id: int) -> Optional[Document]:
         """문서 ID로 조회"""
@@ -112,14 +353,26 @@ class DocumentUseCases:
             return False
 
         try:
-            # 벡터 저장소에서 삭제
-            await self.vector_store_repository.delete_documents(document.filename)
+            # 같은 본문 파일을 공유하는 다른 문서 (같은 파일을 다른 컬렉션에 올렸거나 실패 후 다시 올린 경우)
+            collection = document.metadata.get("collection", DEFAULT_COLLECTION)
+            sharing = [
+                other for other in await self.document_repository.find_by_file_path(document.file_path)
+                if other.id != document.id
+            ]
+
+            # 벡터 저장소에서 삭제 (청크 출처는 첫 버전의 업로드 파일 경로, 같은 컬렉션의 다른 문서가 쓰면 유지)
+            if not any(
+                other.metadata.get("collection", DEFAULT_COLLECTION) == collection
+                and other.chunk_source == document.chunk_source
+                for other in sharing
+            ):
+                await self.vector_store_repository.delete_documents(document.chunk_source, collection)
 
             # 데이터베이스에서 삭제
             await self.document_repository.delete(document_id)
 
-            # 실제 파일 삭제
-            if os.path.exists(document.file_path):
+            # 실제 파일 삭제 (다른 문서가 참조하지 않을 때만)
+            if not sharing and os.path.exists(document.file_path):
                 os.remove(document.file_path)
 
             return True
@@ -131,8 +384,35 @@ class DocumentUseCases:
         total_documents = await self.document_repository.count()
         vector_count = await self.vector_store_repository.get_document_count()
 
-        return {
+        statistics = {
             "total_documents": total_documents,
             "total_chunks": vector_count,
             "avg_chunks_per_document": vector_count / total_documents if total_documents > 0 else 0
         }
+        if self.ingestion_job_repository is not None:
+            statistics["ingestion_jobs"] = await self.get_ingestion_statistics()
+        return statistics
+
+    async def get_vector_storage_report(self, sample_size: int = 20000, k: int = 10) -> dict:
+        """벡터 저장 방식별 메모리 절감과 recall 손실 리포트"""
+        return await self.vector_store_repository.evaluate_quantization(sample_size=sample_size, k=k)
+
+    async def list_index_snapshots(self, collection: str = DEFAULT_COLLECTION) -> List[dict]:
+        """벡터 인덱스의 보존된 버전 목록"""
+        return await self.vector_store_repository.list_snapshots(collection)
+
+    async def rollback_index_snapshot(self, version: int, collection: str = DEFAULT_COLLECTION) -> int:
+        """벡터 인덱스를 보존된 버전으로 롤백 (문서 DB 기록은 그대로 둔다)"""
+        return await self.vector_store_repository.rollback_snapshot(version, collection)
+
+    async def gc_index_snapshots(self, keep: Optional[int] = None, collection: str = DEFAULT_COLLECTION) -> int:
+        """벡터 인덱스의 오래된 버전 정리"""
+        return await self.vector_store_repository.gc_snapshots(keep, collection)
+
+    async def start_reembedding(self, collection: str = DEFAULT_COLLECTION) -> dict:
+        """컬렉션을 설정된 임베딩 모델로 다시 임베딩 (백그라운드, 완료 시 인덱스 전환)"""
+        return await self.vector_store_repository.start_reembedding(collection)
+
+    async def get_reembedding_status(self, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        """재임베딩 진행 상황"""
+        return await self.vector_store_repository.get_reembedding_status(collection)
@@ -33,6 +33,14 @@ class Document:
     def is_processed(self) -> bool:
         return self.status == DocumentStatus.COMPLETED
 
+    @property
+    def chunk_source(self) -> str:
+        """벡터 저장소에서 이 문서 청크의 출처 (새 버전으로 다시 올린 문서는 첫 버전의 경로를 이어 씀)"""
+        return self.metadata.get("chunk_source", self.file_path)
+
+    def mark_as_pending(self):
+        self.status = DocumentStatus.PENDING
+
     def mark_as_processing(self):
         self.status = DocumentStatus.PROCESSING
 
@@ -0,0 +1,101 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from app.documents.domain.entities.document import DocumentStatus
+
+
+class IngestionStage(Enum):
+    QUEUED = "queued"
+    PARSING = "parsing"
+    INDEXING = "indexing"
+    RETRY_WAIT = "retry_wait"
+    DONE = "done"
+
+
+@dataclass
+class IngestionJob:
+    """문서 수집(파싱·청크 분할·임베딩·색인) 백그라운드 작업 도메인 엔티티"""
+    job_id: str
+    document_id: int
+    collection: str
+    id: Optional[int] = None
+    status: DocumentStatus = DocumentStatus.PENDING
+    stage: IngestionStage = IngestionStage.QUEUED
+    progress: float = 0.0
+    attempts: int = 0
+    max_attempts: int = 3
+    chunk_count: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    # 재시도 대기 중이면 다시 처리할 수 있는 시각
+    available_at: Optional[datetime] = None
+    metadata: Dict[str, Any] = None
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
+
+    @classmethod
+    def create_new(cls, document_id: int, collection: str, max_attempts: int = 3) -> "IngestionJob":
+        """새 수집 작업 생성"""
+        now = datetime.now()
+        return cls(
+            job_id=str(uuid.uuid4()),
+            document_id=document_id,
+            collection=collection,
+            max_attempts=max(1, max_attempts),
+            created_at=now,
+            updated_at=now,
+            available_at=now
+        )
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DocumentStatus.COMPLETED, DocumentStatus.FAILED)
+
+    @property
+    def can_retry(self) -> bool:
+        return self.attempts < self.max_attempts
+
+    def update_progress(self, stage: IngestionStage, progress: float, chunk_count: Optional[int] = None):
+        self.stage = stage
+        self.progress = min(max(progress, 0.0), 1.0)
+        if chunk_count is not None:
+            # 처리 중에는 지금까지 색인된 청크 수
+            self.chunk_count = chunk_count
+        self.updated_at = datetime.now()
+
+    def mark_as_completed(self, chunk_count: int):
+        self.status = DocumentStatus.COMPLETED
+        self.stage = IngestionStage.DONE
+        self.progress = 1.0
+        self.chunk_count = chunk_count
+        self.error = None
+        self.finished_at = self.updated_at = datetime.now()
+
+    def schedule_retry(self, error: str, delay_seconds: float):
+        """실패한 시도를 기록하고 delay_seconds 뒤에 다시 처리하도록 대기열로 되돌림"""
+        self.status = DocumentStatus.PENDING
+        self.stage = IngestionStage.RETRY_WAIT
+        self.error = error
+        self.updated_at = datetime.now()
+        self.available_at = self.updated_at + timedelta(seconds=delay_seconds)
+
+    def release(self):
+        """처리를 끝내지 못하고 종료될 때 시도 횟수를 되돌리고 바로 다시 처리하도록 대기열로 되돌림"""
+        self.status = DocumentStatus.PENDING
+        self.stage = IngestionStage.QUEUED
+        self.attempts = max(0, self.attempts - 1)
+        self.updated_at = self.available_at = datetime.now()
+
+    def mark_as_failed(self, error: str):
+        self.status = DocumentStatus.FAILED
+        self.stage = IngestionStage.DONE
+        self.error = error
+        self.finished_at = self.updated_at = datetime.now()
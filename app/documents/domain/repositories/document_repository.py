@@ -3,12 +3,20 @@ from typing import List, Optional
 from ..entities.document import Document
 
 
+class DuplicateUploadError(Exception):
+    """같은 컬렉션에 같은 저장 경로(본문)의 문서가 이미 처리됐거나 처리 중이라 등록하지 못했을 때"""
+
+    def __init__(self, document: Document):
+        super().__init__(f"같은 내용의 문서가 이미 등록되어 있습니다: {document.id}")
+        self.document = document
+
+
 class DocumentRepository(ABC):
     """문서 저장소 인터페이스"""
 
     @abstractmethod
     async def save(self, document: Document) -> Document:
-        """문서 저장"""
+        """문서 저장 (새 문서가 같은 컬렉션의 실패하지 않은 문서와 저장 경로가 같으면 DuplicateUploadError)"""
         pass
 
     @abstractmethod
@@ -21,6 +29,16 @@ class DocumentRepository(ABC):
         """파일명으로 문서 조회"""
         pass
 
+    @abstractmethod
+    async def find_all_by_filename(self, filename: str) -> List[Document]:
+        """파일명이 같은 모든 문서 조회 (최근 문서부터)"""
+        pass
+
+    @abstractmethod
+    async def find_by_file_path(self, file_path: str) -> List[Document]:
+        """저장 경로로 문서 조회 (본문 해시 경로를 공유하는 문서들)"""
+        pass
+
     @abstractmethod
     async def find_all(self, skip: int = 0, limit: int = 100) -> List[Document]:
         """모든 문서 조회"""
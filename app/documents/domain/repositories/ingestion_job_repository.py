@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..entities.ingestion_job import IngestionJob
+
+
+class IngestionJobRepository(ABC):
+    """문서 수집 작업 저장소 인터페이스 (작업 대기열을 겸하는 영속 작업 테이블)"""
+
+    @abstractmethod
+    async def save(self, job: IngestionJob) -> IngestionJob:
+        """작업 저장"""
+        pass
+
+    @abstractmethod
+    async def find_by_job_id(self, job_id: str) -> Optional[IngestionJob]:
+        """작업 ID로 조회"""
+        pass
+
+    @abstractmethod
+    async def claim_next(self) -> Optional[IngestionJob]:
+        """처리할 수 있는 가장 오래된 대기 작업을 처리 중으로 선점 (다른 워커와 겹치지 않음)"""
+        pass
+
+    @abstractmethod
+    async def release_stale(self, updated_before: datetime) -> int:
+        """updated_before 이후 진행 갱신이 없는 처리 중 작업을 대기 상태로 되돌리고 수 반환"""
+        pass
+
+    @abstractmethod
+    async def count_by_status(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        pass
@@ -1,7 +1,13 @@
+import hashlib
 from dataclasses import dataclass
 from typing import Dict, Any
 
 
+def chunk_fingerprint(content: str, page: int) -> str:
+    """청크 비교용 지문 (페이지와 본문 SHA-256이 같으면 다시 임베딩·색인할 필요가 없는 같은 청크)"""
+    return f"{page}:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+
+
 @dataclass(frozen=True)
 class DocumentChunk:
     """문서 청크 값 객체"""
@@ -19,6 +25,10 @@ class DocumentChunk:
     def content_length(self) -> int:
         return len(self.content)
 
+    @property
+    def fingerprint(self) -> str:
+        return chunk_fingerprint(self.content, self.page)
+
     @property
     def is_empty(self) -> bool:
         return len(self.content.strip()) == 0
@@ -1,10 +1,13 @@
+import hashlib
 from typing import List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.documents.domain.entities.document import Document, DocumentStatus
-from app.documents.domain.repositories.document_repository import DocumentRepository
+from app.documents.domain.repositories.document_repository import DocumentRepository, DuplicateUploadError
 from app.db.models import Document as DocumentModel
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
 
 
 class SqlAlchemyDocumentRepository(DocumentRepository):
@@ -14,7 +17,7 @@ class SqlAlchemyDocumentRepository(DocumentRepository):
         self.db = db_session
 
     async def save(self, document: Document) -> Document:
-        """문서 저장"""
+        """문서 저장 (같은 컬렉션·저장 경로의 중복 등록은 upload_key 유일 제약으로 막고 DuplicateUploadError)"""
         if document.id is None:
             # 새 문서 생성
             db_document = DocumentModel(
@@ -26,10 +29,21 @@ class SqlAlchemyDocumentRepository(DocumentRepository):
                 chunk_count=document.chunk_count,
                 processing_time=document.processing_time,
                 is_processed=document.is_processed,
-                metadata_json=document.metadata
+                metadata_json=self._metadata_with_status(document),
+                upload_key=self._upload_key(document)
             )
             self.db.add(db_document)
-            self.db.commit()
+            try:
+                self.db.commit()
+            except IntegrityError:
+                # 동시에 올라온 같은 본문이 먼저 등록됨
+                self.db.rollback()
+                existing = self.db.query(DocumentModel).filter(
+                    DocumentModel.upload_key == db_document.upload_key
+                ).first()
+                if existing is None:
+                    raise
+                raise DuplicateUploadError(self._to_domain_entity(existing))
             self.db.refresh(db_document)
             document.id = db_document.id
         else:
@@ -46,7 +60,10 @@ class SqlAlchemyDocumentRepository(DocumentRepository):
                 db_document.chunk_count = document.chunk_count
                 db_document.processing_time = document.processing_time
                 db_document.is_processed = document.is_processed
-                db_document.metadata_json = document.metadata
+                db_document.metadata_json = self._metadata_with_status(document)
+                if document.status == DocumentStatus.FAILED:
+                    # 실패한 문서는 같은 본문을 다시 올릴 수 있도록 중복 키에서 뺀다
+                    db_document.upload_key = None
                 self.db.commit()
 
         return document
@@ -71,6 +88,20 @@ class SqlAlchemyDocumentRepository(DocumentRepository):
             return self._to_domain_entity(db_document)
         return None
 
+    async def find_all_by_filename(self, filename: str) -> List[Document]:
+        """파일명이 같은 모든 문서 조회 (최근 문서부터)"""
+        db_documents = self.db.query(DocumentModel).filter(
+            DocumentModel.filename == filename
+        ).order_by(DocumentModel.id.desc()).all()
+        return [self._to_domain_entity(doc) for doc in db_documents]
+
+    async def find_by_file_path(self, file_path: str) -> List[Document]:
+        """저장 경로로 문서 조회 (본문 해시 경로를 공유하는 문서들)"""
+        db_documents = self.db.query(DocumentModel).filter(
+            DocumentModel.file_path == file_path
+        ).order_by(DocumentModel.id).all()
+        return [self._to_domain_entity(doc) for doc in db_documents]
+
     async def find_all(self, skip: int = 0, limit: int = 100) -> List[Document]:
         """모든 문서 조회"""
         db_documents = self.db.query(DocumentModel).offset(skip).limit(limit).all()
@@ -100,9 +131,25 @@ class SqlAlchemyDocumentRepository(DocumentRepository):
         ).offset(skip).limit(limit).all()
         return [self._to_domain_entity(doc) for doc in db_documents]
 
+    @staticmethod
+    def _upload_key(document: Document) -> Optional[str]:
+        """컬렉션과 저장 경로의 해시 (실패한 문서는 None)"""
+        if document.status == DocumentStatus.FAILED:
+            return None
+        collection = document.metadata.get("collection", DEFAULT_COLLECTION)
+        return hashlib.sha256(f"{collection}\0{document.file_path}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _metadata_with_status(document: Document) -> dict:
+        """처리 상태를 메타데이터에 함께 기록 (테이블에는 완료 여부 컬럼만 있음)"""
+        return {**document.metadata, "status": document.status.value}
+
     def _to_domain_entity(self, db_document: DocumentModel) -> Document:
         """DB 모델을 도메인 엔티티로 변환"""
+        metadata = dict(db_document.metadata_json or {})
         status = DocumentStatus.COMPLETED if db_document.is_processed else DocumentStatus.PENDING
+        if "status" in metadata:
+            status = DocumentStatus(metadata.pop("status"))
 
         return Document(
             id=db_document.id,
@@ -114,5 +161,5 @@ class SqlAlchemyDocumentRepository(DocumentRepository):
             chunk_count=db_document.chunk_count,
             processing_time=db_document.processing_time,
             status=status,
-            metadata=db_document.metadata_json or {}
+            metadata=metadata
         )
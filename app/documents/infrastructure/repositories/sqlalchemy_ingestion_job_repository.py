@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.documents.domain.entities.document import DocumentStatus
+from app.documents.domain.entities.ingestion_job import IngestionJob, IngestionStage
+from app.documents.domain.repositories.ingestion_job_repository import IngestionJobRepository
+from app.db.models import IngestionJob as IngestionJobModel
+
+# 한 번에 살펴볼 선점 후보 수 (다른 워커가 먼저 가져간 작업은 건너뜀)
+CLAIM_CANDIDATES = 10
+
+
+class SqlAlchemyIngestionJobRepository(IngestionJobRepository):
+    """SQLAlchemy를 사용한 문서 수집 작업 저장소 구현
+
+    선점은 상태가 여전히 pending인 행만 바꾸는 조건부 UPDATE로 처리하므로
+    여러 워커 프로세스가 같은 테이블을 폴링해도 한 작업은 한 워커만 가져간다.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    async def save(self, job: IngestionJob) -> IngestionJob:
+        """작업 저장"""
+        if job.id is None:
+            db_job = IngestionJobModel(job_id=job.job_id)
+            self._apply(db_job, job)
+            self.db.add(db_job)
+            self.db.commit()
+            self.db.refresh(db_job)
+            job.id = db_job.id
+        else:
+            db_job = self.db.query(IngestionJobModel).filter(
+                IngestionJobModel.id == job.id
+            ).first()
+            if db_job:
+                self._apply(db_job, job)
+                self.db.commit()
+
+        return job
+
+    async def find_by_job_id(self, job_id: str) -> Optional[IngestionJob]:
+        """작업 ID로 조회"""
+        db_job = self.db.query(IngestionJobModel).filter(
+            IngestionJobModel.job_id == job_id
+        ).first()
+
+        if db_job:
+            return self._to_domain_entity(db_job)
+        return None
+
+    async def claim_next(self) -> Optional[IngestionJob]:
+        """처리할 수 있는 가장 오래된 대기 작업을 처리 중으로 선점"""
+        now = datetime.now()
+        candidates = self.db.query(IngestionJobModel.id).filter(
+            IngestionJobModel.status == DocumentStatus.PENDING.value,
+            or_(IngestionJobModel.available_at.is_(None), IngestionJobModel.available_at <= now)
+        ).order_by(IngestionJobModel.available_at, IngestionJobModel.id).limit(CLAIM_CANDIDATES).all()
+        self.db.commit()
+
+        for (job_pk,) in candidates:
+            claimed = self.db.query(IngestionJobModel).filter(
+                IngestionJobModel.id == job_pk,
+                IngestionJobModel.status == DocumentStatus.PENDING.value
+            ).update({
+                IngestionJobModel.status: DocumentStatus.PROCESSING.value,
+                IngestionJobModel.stage: IngestionStage.PARSING.value,
+                IngestionJobModel.progress: 0.0,
+                IngestionJobModel.attempts: IngestionJobModel.attempts + 1,
+                IngestionJobModel.started_at: now,
+                IngestionJobModel.updated_at: now
+            }, synchronize_session=False)
+            self.db.commit()
+            if claimed:
+                db_job = self.db.query(IngestionJobModel).filter(IngestionJobModel.id == job_pk).first()
+                return self._to_domain_entity(db_job)
+        return None
+
+    async def release_stale(self, updated_before: datetime) -> int:
+        """진행 갱신이 끊긴 처리 중 작업을 대기 상태로 되돌림"""
+        released = self.db.query(IngestionJobModel).filter(
+            IngestionJobModel.status == DocumentStatus.PROCESSING.value,
+            IngestionJobModel.updated_at < updated_before
+        ).update({
+            IngestionJobModel.status: DocumentStatus.PENDING.value,
+            IngestionJobModel.stage: IngestionStage.QUEUED.value,
+            IngestionJobModel.available_at: datetime.now()
+        }, synchronize_session=False)
+        self.db.commit()
+        return released
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        rows = self.db.query(IngestionJobModel.status, func.count(IngestionJobModel.id)).group_by(
+            IngestionJobModel.status
+        ).all()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def _apply(db_job: IngestionJobModel, job: IngestionJob):
+        """도메인 엔티티 값을 DB 모델에 반영"""
+        db_job.document_id = job.document_id
+        db_job.collection = job.collection
+        db_job.status = job.status.value
+        db_job.stage = job.stage.value
+        db_job.progress = job.progress
+        db_job.attempts = job.attempts
+        db_job.max_attempts = job.max_attempts
+        db_job.chunk_count = job.chunk_count
+        db_job.error = job.error
+        db_job.created_at = job.created_at
+        db_job.started_at = job.started_at
+        db_job.finished_at = job.finished_at
+        db_job.updated_at = job.updated_at
+        db_job.available_at = job.available_at
+        db_job.metadata_json = job.metadata
+
+    def _to_domain_entity(self, db_job: IngestionJobModel) -> IngestionJob:
+        """DB 모델을 도메인 엔티티로 변환"""
+        return IngestionJob(
+            id=db_job.id,
+            job_id=db_job.job_id,
+            document_id=db_job.document_id,
+            collection=db_job.collection,
+            status=DocumentStatus(db_job.status),
+            stage=IngestionStage(db_job.stage),
+            progress=db_job.progress or 0.0,
+            attempts=db_job.attempts or 0,
+            max_attempts=db_job.max_attempts or 1,
+            chunk_count=db_job.chunk_count or 0,
+            error=db_job.error,
+            created_at=db_job.created_at,
+            started_at=db_job.started_at,
+            finished_at=db_job.finished_at,
+            updated_at=db_job.updated_at,
+            available_at=db_job.available_at,
+            metadata=db_job.metadata_json or {}
+        )
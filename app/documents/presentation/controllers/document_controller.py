@@ -1,14 +1,17 @@
 import os
-import shutil
+from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.db.database import get_db
+from app.documents.application.services.upload_storage import ContentAddressedUploadStorage
 from app.documents.application.use_cases.document_use_cases import DocumentUseCases
-from app.documents.presentation.schemas.document_schemas import DocumentResponse
-from app.shared.dependencies import get_document_use_cases
+from app.documents.domain.entities.document import Document
+from app.documents.domain.repositories.document_repository import DuplicateUploadError
+from app.documents.presentation.schemas.document_schemas import DocumentResponse, IngestionJobResponse
+from app.search.domain.value_objects.collection import normalize_collection
+from app.shared.dependencies import get_document_use_cases, get_ingestion_queue, get_upload_storage
 
 
 class DocumentController:
@@ -21,13 +24,22 @@ class DocumentController:
     def _register_routes(self):
         """라우트 등록"""
 
-        @self.router.post("/upload", response_model=DocumentResponse)
+        @self.router.post("/upload", response_model=DocumentResponse, status_code=202)
         async def upload_document(
+            response: Response,
             file: UploadFile = File(...),
+            collection: Optional[str] = None,
             document_use_cases: DocumentUseCases = Depends(get_document_use_cases),
+            upload_storage: ContentAddressedUploadStorage = Depends(get_upload_storage),
             db: Session = Depends(get_db)
         ):
-            """문서 업로드"""
+            """문서 업로드 (파일을 저장하고 수집 작업을 등록한 뒤 바로 응답, 같은 본문이 이미 있으면 처리 생략)"""
+            try:
+                collection = normalize_collection(collection)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            stored = None
             try:
                 # 지원되는 파일 형식 확인
                 allowed_extensions = ['.pdf', '.txt', '.docx']
@@ -39,42 +51,83 @@ class DocumentController:
                         detail=f"지원하지 않는 파일 형식입니다. 지원 형식: {', '.join(allowed_extensions)}"
                     )
 
-                # 업로드 디렉토리 생성
-                os.makedirs(settings.upload_dir, exist_ok=True)
-
-                # 파일 저장
-                file_path = os.path.join(settings.upload_dir, file.filename)
-                with open(file_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
+                # 파일 저장 (읽으면서 SHA-256과 크기를 계산해 본문 해시 경로에 저장)
+                stored = await upload_storage.store(file, file_extension)
 
-                # 파일 정보 가져오기
-                file_size = os.path.getsize(file_path)
+                # 같은 본문이 이 컬렉션에 이미 처리됐거나 처리 중이면 파싱·임베딩 없이 기존 문서 반환
+                duplicate = await document_use_cases.find_duplicate_upload(stored.file_path, collection)
+                if duplicate:
+                    response.status_code = 200
+                    return self._duplicate_response(duplicate)
 
-                # 문서 업로드 처리
-                document = await document_use_cases.upload_document(
-                    filename=file.filename,
-                    file_path=file_path,
-                    file_size=file_size,
-                    file_type=file_extension
-                )
+                # 수집 작업 등록 (파싱·임베딩·색인은 워커 풀에서 처리)
+                try:
+                    job = await document_use_cases.enqueue_document(
+                        filename=file.filename,
+                        file_path=stored.file_path,
+                        file_size=stored.file_size,
+                        file_type=file_extension,
+                        collection=collection,
+                        content_hash=stored.content_hash
+                    )
+                except DuplicateUploadError as e:
+                    # 같은 본문이 동시에 올라와 다른 요청이 먼저 등록함
+                    response.status_code = 200
+                    return self._duplicate_response(e.document)
+                get_ingestion_queue().notify()
 
                 return DocumentResponse(
                     success=True,
-                    message="문서가 성공적으로 업로드되고 처리되었습니다.",
-                    document_id=str(document.id)
+                    message="문서가 업로드되어 처리 대기열에 등록되었습니다.",
+                    document_id=str(job.document_id),
+                    job_id=job.job_id,
+                    status=job.status.value
                 )
 
+            except HTTPException:
+                raise
             except ValueError as e:
-                # 파일 삭제
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+                # 이번 업로드로 새로 저장한 파일만 삭제 (같은 본문의 기존 파일은 다른 문서가 사용)
+                if stored and stored.created and os.path.exists(stored.file_path):
+                    os.remove(stored.file_path)
                 raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
-                # 파일 삭제
-                if 'file_path' in locals() and os.path.exists(file_path):
-                    os.remove(file_path)
+                if stored and stored.created and os.path.exists(stored.file_path):
+                    os.remove(stored.file_path)
                 raise HTTPException(status_code=500, detail=f"파일 업로드 중 오류: {str(e)}")
 
+        @self.router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+        async def get_ingestion_job(
+            job_id: str,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """문서 수집 작업 진행 상황 조회"""
+            try:
+                job = await document_use_cases.get_ingestion_job(job_id)
+                if not job:
+                    raise HTTPException(status_code=404, detail="수집 작업을 찾을 수 없습니다.")
+
+                return IngestionJobResponse(
+                    job_id=job.job_id,
+                    document_id=job.document_id,
+                    collection=job.collection,
+                    status=job.status.value,
+                    stage=job.stage.value,
+                    progress=job.progress,
+                    attempts=job.attempts,
+                    max_attempts=job.max_attempts,
+                    chunk_count=job.chunk_count,
+                    error=job.error,
+                    created_at=job.created_at,
+                    started_at=job.started_at,
+                    finished_at=job.finished_at,
+                    available_at=job.available_at
+                )
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"수집 작업 조회 중 오류: {str(e)}")
+
         @self.router.get("/")
         async def list_documents(
             skip: int = 0,
@@ -159,3 +212,111 @@ class DocumentController:
                 return await document_use_cases.get_document_statistics()
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"통계 조회 중 오류: {str(e)}")
+
+        @self.router.get("/statistics/vector-storage")
+        async def get_vector_storage_report(
+            sample_size: int = 20000,
+            k: int = 10,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """벡터 저장 방식별 메모리·recall 리포트"""
+            try:
+                return await document_use_cases.get_vector_storage_report(sample_size, k)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"리포트 생성 중 오류: {str(e)}")
+
+        @self.router.get("/index/snapshots")
+        async def list_index_snapshots(
+            collection: Optional[str] = None,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """벡터 인덱스 버전 목록"""
+            try:
+                collection = normalize_collection(collection)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            try:
+                return await document_use_cases.list_index_snapshots(collection)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"인덱스 버전 조회 중 오류: {str(e)}")
+
+        @self.router.post("/index/snapshots/{version}/rollback")
+        async def rollback_index_snapshot(
+            version: int,
+            collection: Optional[str] = None,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """벡터 인덱스를 보존된 버전으로 롤백"""
+            try:
+                collection = normalize_collection(collection)
+                new_version = await document_use_cases.rollback_index_snapshot(version, collection)
+                return {"restored_from": version, "version": new_version}
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"인덱스 롤백 중 오류: {str(e)}")
+
+        @self.router.post("/index/snapshots/gc")
+        async def gc_index_snapshots(
+            keep: Optional[int] = None,
+            collection: Optional[str] = None,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """오래된 벡터 인덱스 버전 정리"""
+            try:
+                collection = normalize_collection(collection)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            try:
+                removed = await document_use_cases.gc_index_snapshots(keep, collection)
+                return {"removed": removed}
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"인덱스 버전 정리 중 오류: {str(e)}")
+
+        @self.router.post("/index/reembed")
+        async def start_reembedding(
+            collection: Optional[str] = None,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """설정된 임베딩 모델로 재임베딩 시작"""
+            try:
+                collection = normalize_collection(collection)
+                return await document_use_cases.start_reembedding(collection)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"재임베딩 시작 중 오류: {str(e)}")
+
+        @self.router.get("/index/reembed")
+        async def get_reembedding_status(
+            collection: Optional[str] = None,
+            document_use_cases: DocumentUseCases = Depends(get_document_use_cases)
+        ):
+            """재임베딩 진행 상황"""
+            try:
+                collection = normalize_collection(collection)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            try:
+                status = await document_use_cases.get_reembedding_status(collection)
+                if status is None:
+                    raise HTTPException(status_code=404, detail="재임베딩 기록이 없습니다.")
+                return status
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"재임베딩 상태 조회 중 오류: {str(e)}")
+
+    @staticmethod
+    def _duplicate_response(document: Document) -> DocumentResponse:
+        """같은 본문이 이 컬렉션에 이미 있을 때 기존 문서와 그 수집 작업으로 응답"""
+        return DocumentResponse(
+            success=True,
+            message="같은 내용의 문서가 이미 업로드되어 있습니다.",
+            document_id=str(document.id),
+            job_id=document.metadata.get("ingestion_job_id"),
+            status=document.status.value
+        )
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 
@@ -10,4 +11,23 @@ class DocumentUploadRequest(BaseModel):
 class DocumentResponse(BaseModel):
     success: bool
     message: str
-    document_id: Optional[str] = None
\ No newline at end of file
+    document_id: Optional[str] = None
+    job_id: Optional[str] = None
+    status: Optional[str] = None
+
+
+class IngestionJobResponse(BaseModel):
+    job_id: str
+    document_id: int
+    collection: str
+    status: str
+    stage: str
+    progress: float
+    attempts: int
+    max_attempts: int
+    chunk_count: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    available_at: Optional[datetime] = None
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import random
+import re
+import unicodedata
+import zlib
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import List, Optional
+
+import httpx
+import numpy as np
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# 모델별 기본 임베딩 차원
+EMBEDDING_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+DEFAULT_EMBEDDING_DIMENSION = 1536
+
+# 로컬 특징 해싱 임베딩의 모델 이름 접두사 (뒤에 차원이 붙는다)
+HASHING_MODEL_PREFIX = "local-hashing-"
+
+# 재시도할 일시적 오류 (타임아웃, 연결 실패, 요청 한도 초과, 서버 오류)
+_RETRYABLE_ERRORS = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+
+
+class EmbeddingProvider(str, Enum):
+    """설정으로 선택하는 임베딩 구현"""
+    OPENAI = "openai"
+    HASHING = "hashing"
+
+
+class EmbeddingService(ABC):
+    """임베딩 서비스 인터페이스"""
+
+    # 임베딩 모델 이름 (캐시 키 구분용)
+    model: str
+    # 벡터 차원 (벡터 저장소가 이 차원으로 열린다)
+    dimension: int
+
+    @property
+    def cache_namespace(self) -> str:
+        """임베딩 캐시 키 구분용 모델과 차원 (같은 모델도 차원이 다르면 벡터가 다르다)"""
+        return f"{self.model}:{self.dimension}"
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 묶음을 한 번의 요청으로 임베딩 (입력 순서대로 반환)"""
+        pass
+
+    async def aclose(self):
+        """사용 중인 연결 정리"""
+
+
+class OpenAIEmbeddingService(EmbeddingService):
+    """커넥션 풀을 공유하는 비동기 OpenAI 임베딩 서비스
+
+    이벤트 루프를 막지 않도록 AsyncOpenAI를 사용하고, 프로세스 전체의 동시 요청 수를
+    세마포어로 제한한다. 일시적 오류는 지수 백오프(지터 포함)로 재시도하며 대기 중에는
+    동시 요청 슬롯을 반납한다.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = EMBEDDING_MODEL,
+        dimension: Optional[int] = None,
+        max_concurrency: int = 4,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0
+    ):
+        self.model = model
+        default_dimension = EMBEDDING_DIMENSIONS.get(model, DEFAULT_EMBEDDING_DIMENSION)
+        self.dimension = dimension or default_dimension
+        # text-embedding-3 계열은 더 짧은 차원을 요청할 수 있다
+        self._request_options = {} if self.dimension == default_dimension else {"dimensions": self.dimension}
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # 재시도는 직접 처리하므로 SDK 자체 재시도는 끈다
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=self.http_client,
+            max_retries=0
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 묶음을 한 번의 요청으로 임베딩 (입력 순서대로 반환)"""
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self.client.embeddings.create(
+                        model=self.model,
+                        input=texts,
+                        **self._request_options
+                    )
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                logger.warning(
+                    "임베딩 요청 실패 (%s), %.2f초 후 재시도 (%d/%d)",
+                    type(e).__name__, delay, attempt, self.max_retries
+                )
+                await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """지수 백오프 대기 시간 (full jitter)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def aclose(self):
+        """커넥션 풀 종료"""
+        await self.client.close()
+
+
+_HASHING_WORD_PATTERN = re.compile(r"\w+")
+
+
+class HashingEmbeddingService(EmbeddingService):
+    """외부 호출 없이 CPU에서 계산하는 결정적 특징 해싱 임베딩 (오프라인 벤치마크·부하 테스트용)
+
+    단어와 한글 음절 bigram을 CRC32로 차원에 사상하고 부호 해싱으로 충돌 편향을 줄인 뒤 정규화한다.
+    같은 텍스트는 프로세스·실행에 관계없이 같은 벡터가 되고, 어휘가 겹칠수록 유사도가 높다.
+    """
+
+    def __init__(self, dimension: int = DEFAULT_EMBEDDING_DIMENSION):
+        self.dimension = dimension
+        self.model = f"{HASHING_MODEL_PREFIX}{dimension}"
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 묶음 임베딩 (큰 묶음도 이벤트 루프를 막지 않도록 스레드에서 계산)"""
+        return await asyncio.to_thread(self._embed, texts)
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode("utf-8")) for feature in self._features(text)),
+                dtype=np.uint32
+            )
+            if not len(hashes):
+                continue
+            # 최상위 비트는 부호, 나머지는 차원 위치
+            signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+            np.add.at(matrix[row], (hashes & 0x7FFFFFFF) % self.dimension, signs)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+    @staticmethod
+    def _features(text: str) -> List[str]:
+        """단어 전체와 단어 안의 음절 bigram"""
+        features = []
+        for word in _HASHING_WORD_PATTERN.findall(unicodedata.normalize("NFKC", text).lower()):
+            features.append(word)
+            features.extend(f"#{word[i:i + 2]}" for i in range(len(word) - 1))
+        return features
+
+
+def create_embedding_service(model: str, dimension: int, api_key: str, **options) -> EmbeddingService:
+    """저장소에 기록된 모델 이름으로 임베딩 서비스 생성 (재임베딩 전환 전 이전 모델 질의용)"""
+    if model.startswith(HASHING_MODEL_PREFIX):
+        return HashingEmbeddingService(dimension=dimension)
+    return OpenAIEmbeddingService(api_key=api_key, model=model, dimension=dimension, **options)
@@ -1,5 +1,9 @@
+from typing import Optional
+
 from app.search.domain.entities.search_result import SearchResult
 from app.search.domain.repositories.vector_store_repository import VectorStoreRepository
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
+from app.search.domain.value_objects.search_filter import SearchFilter
 from app.shared.services.mlflow_tracker import MLflowTracker
 
 
@@ -17,19 +21,25 @@ class SearchUseCases:
     async def search_documents(
         self,
         query: str,
-        k: int = 3
+        k: int = 3,
+        search_filter: Optional[SearchFilter] = None,
+        collection: str = DEFAULT_COLLECTION
     ) -> SearchResult:
-        """문서 검색"""
+        """컬렉션 문서 검색 (필터가 있으면 지정한 출처·페이지 범위에서만 검색)"""
         with self.mlflow_tracker.start_run("document_search"):
             # 파라미터 로깅
             await self.mlflow_tracker.log_params({
                 "query": query,
-                "k": k
+                "k": k,
+                "collection": collection,
+                "search_filter": search_filter.to_dict() if search_filter else None
             })
 
             try:
                 # 벡터 저장소에서 검색
-                search_result = await self.vector_store_repository.search_similar(query, k)
+                search_result = await self.vector_store_repository.search_similar(
+                    query, k, search_filter, collection
+                )
 
                 # 메트릭 로깅
                 await self.mlflow_tracker.log_metrics({
@@ -62,11 +72,15 @@ class SearchUseCases:
         """검색 통계"""
         document_count = await self.vector_store_repository.get_document_count()
         document_list = await self.vector_store_repository.list_documents()
+        cache_statistics = await self.vector_store_repository.get_cache_statistics()
+        collections = await self.vector_store_repository.list_collections()
 
         return {
+            "collections": collections,
             "total_chunks": document_count,
             "unique_documents": len(set(document_list)),
-            "avg_chunks_per_document": document_count / len(set(document_list)) if document_list else 0
+            "avg_chunks_per_document": document_count / len(set(document_list)) if document_list else 0,
+            **cache_statistics
         }
 
     async def health_check(self) -> bool:
@@ -1,22 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional
 
 from app.documents.domain.value_objects.document_chunk import DocumentChunk
 from app.search.domain.entities.search_result import SearchResult
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
 from app.search.domain.value_objects.embedding_result import EmbeddingResult
+from app.search.domain.value_objects.search_filter import SearchFilter
 
 
 class VectorStoreRepository(ABC):
     """벡터 저장소 인터페이스"""
 
     @abstractmethod
-    async def add_documents(self, chunks: List[DocumentChunk]) -> bool:
-        """문서 청크들을 벡터 저장소에 추가"""
+    async def add_documents(
+        self,
+        chunks: List[DocumentChunk],
+        collection: str = DEFAULT_COLLECTION,
+        reuse_source: Optional[str] = None
+    ) -> bool:
+        """문서 청크들을 컬렉션 벡터 저장소에 추가 (reuse_source 청크와 본문이 같은 청크는 저장된 벡터 재사용)"""
         pass
 
     @abstractmethod
-    async def search_similar(self, query: str, k: int = 3) -> SearchResult:
-        """유사한 문서 검색"""
+    async def search_similar(
+        self,
+        query: str,
+        k: int = 3,
+        search_filter: Optional[SearchFilter] = None,
+        collection: str = DEFAULT_COLLECTION
+    ) -> SearchResult:
+        """컬렉션에서 유사한 문서 검색 (필터가 있으면 조건에 맞는 청크만 대상)"""
         pass
 
     @abstractmethod
@@ -25,23 +38,99 @@ class VectorStoreRepository(ABC):
         pass
 
     @abstractmethod
-    async def delete_documents(self, document_id: str) -> bool:
-        """문서 삭제"""
+    async def delete_documents(self, document_id: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        """컬렉션에서 문서 삭제 (document_id는 청크 출처 경로 또는 파일명과 정확히 일치해야 함)"""
         pass
 
     @abstractmethod
-    async def get_document_count(self) -> int:
-        """저장된 문서 청크 수"""
+    async def get_source_fingerprints(self, source: str, collection: str = DEFAULT_COLLECTION) -> Dict[str, int]:
+        """출처의 청크 지문(페이지·본문 해시)별 청크 수"""
         pass
 
     @abstractmethod
-    async def list_documents(self) -> List[str]:
-        """저장된 문서 목록"""
+    async def delete_source_chunks(
+        self,
+        source: str,
+        fingerprints: Dict[str, int],
+        collection: str = DEFAULT_COLLECTION
+    ) -> int:
+        """출처의 청크 중 지문별로 주어진 수만큼 삭제하고 삭제된 수 반환"""
         pass
 
     @abstractmethod
-    async def clear_all(self) -> bool:
-        """모든 문서 삭제"""
+    async def delete_chunks_with_key_prefix(
+        self,
+        source: str,
+        key_prefix: str,
+        collection: str = DEFAULT_COLLECTION
+    ) -> int:
+        """출처의 청크 중 청크 ID가 key_prefix로 시작하는 청크를 삭제하고 삭제된 수 반환"""
+        pass
+
+    @abstractmethod
+    async def count_source_chunks(self, source: str, collection: str = DEFAULT_COLLECTION) -> int:
+        """컬렉션에 저장된 출처(업로드 파일 경로)의 청크 수"""
+        pass
+
+    @abstractmethod
+    async def get_document_count(self, collection: str = DEFAULT_COLLECTION) -> int:
+        """컬렉션에 저장된 문서 청크 수"""
+        pass
+
+    @abstractmethod
+    async def list_documents(self, collection: str = DEFAULT_COLLECTION) -> List[str]:
+        """컬렉션에 저장된 문서 목록"""
+        pass
+
+    @abstractmethod
+    async def list_collections(self) -> List[str]:
+        """컬렉션 목록"""
+        pass
+
+    @abstractmethod
+    async def clear_all(self, collection: str = DEFAULT_COLLECTION) -> bool:
+        """컬렉션의 모든 문서 삭제"""
+        pass
+
+    @abstractmethod
+    async def list_snapshots(self, collection: str = DEFAULT_COLLECTION) -> List[dict]:
+        """컬렉션의 보존된 인덱스 버전 목록"""
+        pass
+
+    @abstractmethod
+    async def rollback_snapshot(self, version: int, collection: str = DEFAULT_COLLECTION) -> int:
+        """보존된 인덱스 버전으로 롤백하고 새로 공개된 버전 반환"""
+        pass
+
+    @abstractmethod
+    async def gc_snapshots(self, keep: Optional[int] = None, collection: str = DEFAULT_COLLECTION) -> int:
+        """최근 keep개 인덱스 버전만 남기고 정리"""
+        pass
+
+    @abstractmethod
+    async def start_reembedding(self, collection: str = DEFAULT_COLLECTION) -> dict:
+        """컬렉션을 설정된 임베딩 모델로 다시 임베딩하는 백그라운드 작업 시작"""
+        pass
+
+    @abstractmethod
+    async def get_reembedding_status(self, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        """재임베딩 진행 상황"""
+        pass
+
+    @abstractmethod
+    async def evaluate_quantization(
+        self,
+        sample_size: int = 20000,
+        num_queries: int = 200,
+        k: int = 10,
+        collection: str = DEFAULT_COLLECTION
+    ) -> dict:
+        """인덱스 유형별 메모리 사용량과 recall 비교 리포트"""
+        pass
+
+    @abstractmethod
+    async def get_cache_statistics(self) -> dict:
+        """임베딩 캐시 통계"""
         pass
 
     @abstractmethod
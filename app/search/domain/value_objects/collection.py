@@ -0,0 +1,20 @@
+import re
+from typing import Optional
+
+# 컬렉션을 지정하지 않은 요청이 사용하는 기본 컬렉션 (기존 단일 저장소)
+DEFAULT_COLLECTION = "default"
+
+_COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def normalize_collection(name: Optional[str]) -> str:
+    """컬렉션 이름 검증 (비어 있으면 기본 컬렉션)
+
+    이름은 디렉토리 이름으로 쓰이므로 영문·숫자·'_'·'-'만 허용한다.
+    """
+    if name is None or not name.strip():
+        return DEFAULT_COLLECTION
+    name = name.strip()
+    if not _COLLECTION_NAME_PATTERN.match(name):
+        raise ValueError(f"잘못된 컬렉션 이름: {name}")
+    return name
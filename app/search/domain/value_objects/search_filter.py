@@ -0,0 +1,42 @@
+import os
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Optional
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """벡터 검색 메타데이터 필터 값 객체
+
+    sources는 청크 출처(업로드 파일 경로) 또는 파일명, pages는 페이지 번호 집합이다.
+    None인 조건은 적용하지 않는다.
+    """
+    sources: Optional[FrozenSet[str]] = None
+    pages: Optional[FrozenSet[int]] = None
+
+    @classmethod
+    def create(
+        cls,
+        sources: Optional[Iterable[str]] = None,
+        pages: Optional[Iterable[int]] = None
+    ) -> "SearchFilter":
+        return cls(
+            sources=frozenset(sources) if sources is not None else None,
+            pages=frozenset(pages) if pages is not None else None
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return self.sources is None and self.pages is None
+
+    def matches_source(self, source: str) -> bool:
+        """출처 경로 또는 파일명이 필터에 포함되는지 확인"""
+        if self.sources is None:
+            return True
+        return source in self.sources or os.path.basename(source) in self.sources
+
+    def to_dict(self) -> dict:
+        """로깅용 표현"""
+        return {
+            "sources": sorted(self.sources) if self.sources is not None else None,
+            "pages": sorted(self.pages) if self.pages is not None else None
+        }
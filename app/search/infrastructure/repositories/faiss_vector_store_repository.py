@@ -1,79 +1,371 @@
+import asyncio
 import json
 import os
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
 
 import faiss
 import numpy as np
-from openai import OpenAI
 
-from app.documents.domain.value_objects.document_chunk import DocumentChunk
+from app.documents.domain.value_objects.document_chunk import DocumentChunk, chunk_fingerprint
+from app.search.application.services.embedding_service import (
+    EmbeddingService,
+    OpenAIEmbeddingService,
+    create_embedding_service,
+)
 from app.search.domain.entities.search_result import SearchResult
 from app.search.domain.repositories.vector_store_repository import VectorStoreRepository
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
 from app.search.domain.value_objects.embedding_result import EmbeddingResult
+from app.search.domain.value_objects.search_filter import SearchFilter
+from app.search.infrastructure.vector_store.chunk_store import ChunkRows
+from app.search.infrastructure.vector_store.collection_registry import CollectionRegistry
+from app.search.infrastructure.vector_store.dedup import DuplicateIndex, DuplicateMatch
+from app.search.infrastructure.vector_store.embedding_cache import (
+    ContentEmbeddingCache,
+    content_hash,
+)
+from app.search.infrastructure.vector_store.index_factory import (
+    IndexConfig,
+    IndexType,
+    detect_index_type,
+    evaluate_index_types,
+)
+from app.search.infrastructure.vector_store.query_cache import QueryEmbeddingCache
+from app.search.infrastructure.vector_store.reembedding import ReembeddingMigration, ReembeddingState
+from app.search.infrastructure.vector_store.search_batcher import SearchBatcher
+from app.search.infrastructure.vector_store.segment_store import (
+    EmbeddingModelMismatch,
+    SegmentStore,
+    StoreSnapshot,
+)
+from app.search.infrastructure.vector_store.sparse_index import (
+    citation_tokens,
+    is_citation_query,
+)
+
+
+# 구버전 저장 형식 파일
+LEGACY_INDEX_FILE = "faiss_index.bin"
+LEGACY_METADATA_FILE = "metadata.json"
+LEGACY_VECTORS_FILE = "vectors.npy"
+LEGACY_VECTOR_IDS_FILE = "vector_ids.npy"
+
+
+def _estimate_tokens(text: str) -> int:
+    """임베딩 요청 토큰 수 추정 (UTF-8 2바이트당 1토큰으로 보수적으로 계산)"""
+    return len(text.encode("utf-8")) // 2 + 1
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """코사인 유사도를 위해 행 단위로 L2 정규화"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def _reciprocal_rank_fusion(rankings: List[List[int]], k: int, rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """여러 순위 목록을 RRF(순위 역수 합)로 합친 상위 k개 (ID, 점수)
+
+    점수는 모든 목록에서 1위일 때의 합 대비 비율(0~1)이라 순위와 같은 순서로 줄어든다.
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank + 1)
+    best = len(rankings) / (rrf_k + 1)
+    ranked = sorted(fused, key=lambda chunk_id: -fused[chunk_id])[:k]
+    return [(chunk_id, fused[chunk_id] / best) for chunk_id in ranked]
 
 
 class FAISSVectorStoreRepository(VectorStoreRepository):
     """FAISS를 사용한 벡터 저장소 구현"""
 
-    def __init__(self, faiss_db_path: str, openai_api_key: str, dimension: int = 1536):
+    def __init__(
+        self,
+        faiss_db_path: str,
+        openai_api_key: str,
+        dimension: Optional[int] = None,
+        embedding_batch_size: int = 100,
+        embedding_batch_max_tokens: int = 100_000,
+        embedding_max_concurrency: int = 4,
+        index_config: Optional[IndexConfig] = None,
+        delta_max_rows: int = 10000,
+        max_segments: int = 32,
+        max_deleted_ratio: float = 0.3,
+        embedding_service: Optional[EmbeddingService] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        embedding_cache: Optional[ContentEmbeddingCache] = None,
+        executor_workers: int = 4,
+        omp_threads: int = 0,
+        search_batch_size: int = 64,
+        search_batch_window_ms: float = 1.0,
+        hybrid_search: bool = True,
+        hybrid_candidates: int = 20,
+        rrf_k: int = 60,
+        collection_memory_budget_mb: int = 2048,
+        reload_check_interval_ms: float = 500.0,
+        snapshot_retention: int = 10,
+        embedding_service_factory: Optional[Callable[[str, int], EmbeddingService]] = None,
+        reembed_batch_size: int = 256,
+        reembed_batch_interval_ms: float = 100.0,
+        dedup_enabled: bool = True,
+        dedup_similarity_threshold: float = 0.9,
+        dedup_vector_threshold: float = 0.0
+    ):
         self.faiss_db_path = faiss_db_path
-        self.openai_client = OpenAI(api_key=openai_api_key)
-        self.dimension = dimension
+        self.embedding_service = embedding_service or OpenAIEmbeddingService(
+            api_key=openai_api_key,
+            max_concurrency=embedding_max_concurrency
+        )
+        # 저장소에 기록된 이전 모델용 서비스 (재임베딩 전환 전까지 질의·추가에 사용)
+        self.embedding_service_factory = embedding_service_factory or (
+            lambda model, dimension: create_embedding_service(
+                model, dimension, openai_api_key, max_concurrency=embedding_max_concurrency
+            )
+        )
+        self._model_services: Dict[Tuple[str, int], EmbeddingService] = {}
+        self.query_cache = query_cache or QueryEmbeddingCache(namespace=self.embedding_service.cache_namespace)
+        self.embedding_cache = embedding_cache
+        self.dimension = dimension or self.embedding_service.dimension
+        self.index_config = index_config or IndexConfig()
+
+        # 임베딩 배치 설정 (동시 요청 수는 임베딩 서비스가 제한)
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.embedding_batch_max_tokens = max(1, embedding_batch_max_tokens)
+
+        # 하이브리드 검색 설정 (BM25 어휘 검색 + 벡터 검색을 RRF로 결합)
+        self.hybrid_search = hybrid_search
+        self.hybrid_candidates = max(1, hybrid_candidates)
+        self.rrf_k = max(1, rrf_k)
+
+        # FAISS 검색·NumPy 연산은 이벤트 루프 대신 전용 실행기에서 수행
+        if omp_threads > 0:
+            faiss.omp_set_num_threads(omp_threads)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, executor_workers),
+            thread_name_prefix="vector-store"
+        )
+        self.search_batcher = SearchBatcher(
+            self.executor,
+            max_batch_size=search_batch_size,
+            window_seconds=search_batch_window_ms / 1000
+        )
 
-        self.index_path = os.path.join(faiss_db_path, "faiss_index.bin")
-        self.metadata_path = os.path.join(faiss_db_path, "metadata.json")
+        # 세그먼트 저장소 설정 (컬렉션마다 같은 설정으로 연다)
+        self.delta_max_rows = delta_max_rows
+        self.max_segments = max_segments
+        self.max_deleted_ratio = max_deleted_ratio
+        self.snapshot_retention = snapshot_retention
+
+        # 새 임베딩 모델로의 재임베딩 작업 (컬렉션별, 배치 사이 대기로 속도 제한)
+        self.reembed_batch_size = max(1, reembed_batch_size)
+        self.reembed_batch_interval = max(0.0, reembed_batch_interval_ms / 1000)
+        self.reembeddings: Dict[str, ReembeddingMigration] = {}
+        self._reembedding_tasks: Dict[str, asyncio.Future] = {}
+        self._reembedding_checked: Set[str] = set()
+
+        # 업로드 시 중복 청크 제거 (저장소별 MinHash 색인은 저장소가 닫히면 함께 해제)
+        self.dedup_enabled = dedup_enabled
+        self.dedup_similarity_threshold = dedup_similarity_threshold
+        self.dedup_vector_threshold = dedup_vector_threshold
+        self._duplicate_indexes: "WeakKeyDictionary[SegmentStore, DuplicateIndex]" = WeakKeyDictionary()
+        self.duplicates_exact = 0
+        self.duplicates_near = 0
+        self.duplicates_rejected = 0
+
+        # 다른 워커가 커밋한 새 버전 확인 주기 (컬렉션별, 0이면 요청마다 확인)
+        self.reload_check_interval = max(0.0, reload_check_interval_ms / 1000)
+        self._reload_checked_at: Dict[str, float] = {}
+        self._reloading: Set[str] = set()
+        self.index_reloads = 0
 
         # 디렉토리 생성
         os.makedirs(faiss_db_path, exist_ok=True)
 
-        # FAISS 인덱스 로드 또는 생성
-        self._load_or_create_index()
-
-        # 메타데이터 로드 또는 생성
-        self._load_or_create_metadata()
+        # 컬렉션별 저장소는 처음 사용할 때 열고 메모리 예산을 넘으면 오래 쓰지 않은 것부터 닫는다
+        self.collections = CollectionRegistry(
+            faiss_db_path,
+            self._open_store,
+            memory_budget_bytes=collection_memory_budget_mb * 1024 * 1024
+        )
 
-    def _load_or_create_index(self):
-        """FAISS 인덱스를 로드하거나 새로 생성"""
-        if os.path.exists(self.index_path):
-            self.index = faiss.read_index(self.index_path)
-        else:
-            self.index = faiss.IndexFlatIP(self.dimension)
+        # 기본 컬렉션은 구버전 저장소 변환을 위해 시작 시 로드
+        self.collections.acquire(DEFAULT_COLLECTION)
+        self.collections.release(DEFAULT_COLLECTION)
+
+    def _open_store(self, collection: str, path: str) -> SegmentStore:
+        """컬렉션의 세그먼트 저장소와 FAISS 인덱스를 메모리 매핑으로 로드 또는 생성"""
+        os.makedirs(path, exist_ok=True)
+        store = SegmentStore(
+            path,
+            self.dimension,
+            self.index_config,
+            delta_max_rows=self.delta_max_rows,
+            max_segments=self.max_segments,
+            max_deleted_ratio=self.max_deleted_ratio,
+            snapshot_retention=self.snapshot_retention,
+            embedding_model=self.embedding_service.model
+        )
+        # 저장소 임베딩 모델의 서비스를 만들 수 있는지 시작 시 확인
+        self._service_for(store.snapshot)
+
+        if collection == DEFAULT_COLLECTION and os.path.exists(os.path.join(path, LEGACY_METADATA_FILE)):
+            self._migrate_legacy_store(store)
+
+        # 설정된 인덱스 유형과 다르면 저장된 벡터로 전환
+        if store.needs_migration():
+            store.checkpoint()
+        return store
+
+    @asynccontextmanager
+    async def _collection(self, collection: str, create: bool = True) -> AsyncIterator[Optional[SegmentStore]]:
+        """컬렉션 저장소를 사용하는 동안 닫히지 않도록 잡아 둔다 (없고 create가 False면 None)"""
+        store = self.collections.acquire_loaded(collection)
+        if store is None:
+            store = await self._run(self.collections.acquire, collection, create)
+        if store is not None:
+            self._check_for_reload(collection, store)
+            self._resume_reembedding(collection, store)
+        try:
+            yield store
+        finally:
+            if store is not None:
+                self.collections.release(collection)
+
+    async def _snapshot(self, collection: str) -> Optional[StoreSnapshot]:
+        """컬렉션의 현재 스냅샷 (컬렉션이 없으면 None, 스냅샷은 저장소가 닫혀도 계속 유효)"""
+        async with self._collection(collection, create=False) as store:
+            return None if store is None else store.snapshot
+
+    def _check_for_reload(self, collection: str, store: SegmentStore):
+        """다른 워커가 새 버전을 커밋했으면 백그라운드에서 다시 읽기 (이번 요청은 현재 스냅샷으로 진행)"""
+        now = time.monotonic()
+        if collection in self._reloading or now - self._reload_checked_at.get(collection, 0.0) < self.reload_check_interval:
+            return
+        self._reload_checked_at[collection] = now
+        if store.has_newer_version():
+            self._reloading.add(collection)
+            asyncio.ensure_future(self._reload(collection))
+
+    async def _reload(self, collection: str):
+        """새 세그먼트만 열어 스냅샷 교체 (다시 읽는 동안 저장소가 닫히지 않도록 잡아 둔다)"""
+        store = self.collections.acquire_loaded(collection)
+        try:
+            if store is not None and await self._run(store.refresh):
+                self.index_reloads += 1
+        except Exception as e:
+            print(f"인덱스 다시 읽기 중 오류: {e}")
+        finally:
+            self._reloading.discard(collection)
+            if store is not None:
+                self.collections.release(collection)
+
+    def _service_for(self, snapshot: StoreSnapshot) -> EmbeddingService:
+        """스냅샷 벡터를 만든 임베딩 모델·차원의 서비스 (재임베딩 전환 전에는 설정과 다른 이전 모델·차원)"""
+        model, dimension = snapshot.embedding_model, snapshot.dimension
+        if model == self.embedding_service.model and dimension == self.embedding_service.dimension:
+            return self.embedding_service
+
+        service = self._model_services.get((model, dimension))
+        if service is None:
+            service = self.embedding_service_factory(model, dimension)
+            self._model_services[(model, dimension)] = service
+        return service
+
+    def _migrate_legacy_store(self, store: SegmentStore):
+        """metadata.json 기반 구버전 저장소를 세그먼트 저장소로 변환 (재임베딩 없음)"""
+        # 이미 변환이 커밋된 뒤 중단되었다면 남은 구버전 파일만 정리
+        if store.next_id == 0:
+            with open(os.path.join(self.faiss_db_path, LEGACY_METADATA_FILE), 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+
+            if 'chunks' in legacy:
+                rows = self._legacy_id_rows(legacy)
+                next_id = legacy['next_id']
+            else:
+                rows = self._legacy_list_rows(legacy)
+                next_id = len(rows)
+
+            store.next_id = next_id
+            store.append(rows)
+            store.checkpoint()
+
+        for name in (LEGACY_INDEX_FILE, LEGACY_METADATA_FILE, LEGACY_VECTORS_FILE, LEGACY_VECTOR_IDS_FILE):
+            path = os.path.join(self.faiss_db_path, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _legacy_id_rows(self, legacy: dict) -> ChunkRows:
+        """청크 ID 키 메타데이터 + vectors.npy 형식에서 행 복원"""
+        vectors = np.load(os.path.join(self.faiss_db_path, LEGACY_VECTORS_FILE))
+        vector_ids = np.load(os.path.join(self.faiss_db_path, LEGACY_VECTOR_IDS_FILE))
+        order = np.argsort(vector_ids)
+        vectors, vector_ids = vectors[order], vector_ids[order]
+        chunks = [legacy['chunks'][str(chunk_id)] for chunk_id in vector_ids.tolist()]
+
+        return ChunkRows(
+            ids=vector_ids.astype(np.int64),
+            vectors=vectors.astype(np.float32),
+            texts=[chunk['content'].encode('utf-8') for chunk in chunks],
+            chunk_keys=[chunk['chunk_id'].encode('utf-8') for chunk in chunks],
+            sources=[chunk['source'] for chunk in chunks],
+            pages=[chunk['page'] for chunk in chunks]
+        )
 
-    def _load_or_create_metadata(self):
-        """메타데이터를 로드하거나 새로 생성"""
-        if os.path.exists(self.metadata_path):
-            with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                self.metadata = json.load(f)
+    def _legacy_list_rows(self, legacy: dict) -> ChunkRows:
+        """순번 기반 IndexFlatIP + 리스트 메타데이터 형식에서 행 복원"""
+        index_path = os.path.join(self.faiss_db_path, LEGACY_INDEX_FILE)
+        legacy_index = faiss.read_index(index_path) if os.path.exists(index_path) else None
+        count = min(len(legacy['documents']), legacy_index.ntotal if legacy_index else 0)
+        if count != len(legacy['documents']):
+            print(f"기존 인덱스와 메타데이터 크기가 달라 {count}개 청크만 이전합니다.")
+
+        # 기존 순번을 그대로 청크 ID로 사용하고 벡터는 인덱스에서 복원
+        if count:
+            vectors = legacy_index.reconstruct_n(0, count).astype(np.float32)
         else:
-            self.metadata = {
-                'documents': [],
-                'sources': [],
-                'chunk_ids': [],
-                'pages': []
-            }
-
-    def _save_index(self):
-        """FAISS 인덱스 저장"""
-        faiss.write_index(self.index, self.index_path)
-
-    def _save_metadata(self):
-        """메타데이터 저장"""
-        with open(self.metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+            vectors = np.empty((0, self.dimension), dtype=np.float32)
+
+        return ChunkRows(
+            ids=np.arange(count, dtype=np.int64),
+            vectors=vectors,
+            texts=[text.encode('utf-8') for text in legacy['documents'][:count]],
+            chunk_keys=[key.encode('utf-8') for key in legacy['chunk_ids'][:count]],
+            sources=legacy['sources'][:count],
+            pages=legacy['pages'][:count]
+        )
 
-    async def generate_embedding(self, text: str) -> EmbeddingResult:
-        """텍스트 임베딩 생성"""
+    async def _run(self, func, *args):
+        """CPU 작업을 벡터 연산 실행기에서 실행"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def close(self):
+        """실행기 종료 (진행 중인 작업은 마무리) 후 열린 저장소 닫기
+
+        실행 중인 재임베딩은 취소하며, 진행 기록이 실행 중으로 남으므로 다음 시작 때 이어서 실행된다.
+        """
+        for task in self._reembedding_tasks.values():
+            task.cancel()
+        self.executor.shutdown(wait=True)
+        self.collections.close()
+
+    async def generate_embedding(
+        self,
+        text: str,
+        embedding_service: Optional[EmbeddingService] = None
+    ) -> EmbeddingResult:
+        """텍스트 임베딩 생성 (서비스를 지정하지 않으면 설정된 모델)"""
         start_time = time.time()
 
-        response = self.openai_client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=text
-        )
+        vectors = await (embedding_service or self.embedding_service).embed([text])
 
-        embedding = np.array(response.data[0].embedding, dtype=np.float32)
-        # 코사인 유사도를 위해 벡터 정규화
-        embedding = embedding / np.linalg.norm(embedding)
+        # 코사인 유사도를 위해 벡터 정규화 (단어가 없는 질의의 영벡터는 NaN이 되지 않도록 그대로 둔다)
+        embedding = _normalize_rows(np.array(vectors[0], dtype=np.float32).reshape(1, -1))[0]
 
         generation_time = time.time() - start_time
 
@@ -83,29 +375,152 @@ class FAISSVectorStoreRepository(VectorStoreRepository):
             generation_time=generation_time
         )
 
-    async def add_documents(self, chunks: List[DocumentChunk]) -> bool:
-        """문서 청크들을 벡터 저장소에 추가"""
-        try:
-            embeddings = []
-
-            for chunk in chunks:
-                embedding_result = await self.generate_embedding(chunk.content)
-                embeddings.append(embedding_result.as_numpy_array())
-
-                # 메타데이터 저장
-                self.metadata['documents'].append(chunk.content)
-                self.metadata['sources'].append(chunk.source)
-                self.metadata['chunk_ids'].append(chunk.chunk_id)
-                self.metadata['pages'].append(chunk.page)
+    async def _embed_query(self, query: str, embedding_service: EmbeddingService) -> Tuple[np.ndarray, float]:
+        """질의 임베딩 (캐시 우선)과 소요 시간"""
+        start_time = time.time()
 
-            # FAISS 인덱스에 임베딩 추가
-            if embeddings:
-                embeddings_array = np.vstack(embeddings)
-                self.index.add(embeddings_array)
+        namespace = None if embedding_service is self.embedding_service else embedding_service.cache_namespace
+        cached = await self.query_cache.get(query, namespace)
+        if cached is not None:
+            return cached.reshape(1, -1), time.time() - start_time
+
+        embedding_result = await self.generate_embedding(query, embedding_service)
+        query_embedding = embedding_result.as_numpy_array()
+        await self.query_cache.put(query, query_embedding, namespace)
+
+        return query_embedding.reshape(1, -1), time.time() - start_time
+
+    def _iter_embedding_batches(self, texts: List[str]) -> Iterator[Tuple[int, List[str]]]:
+        """개수와 토큰 한도를 넘지 않도록 텍스트를 (시작 위치, 배치)로 분할"""
+        start = 0
+        batch: List[str] = []
+        batch_tokens = 0
+
+        for position, text in enumerate(texts):
+            tokens = _estimate_tokens(text)
+            if batch and (
+                len(batch) >= self.embedding_batch_size
+                or batch_tokens + tokens > self.embedding_batch_max_tokens
+            ):
+                yield start, batch
+                start, batch, batch_tokens = position, [], 0
+
+            batch.append(text)
+            batch_tokens += tokens
+
+        if batch:
+            yield start, batch
+
+    async def _embed_texts(
+        self,
+        texts: List[str],
+        embedding_service: Optional[EmbeddingService] = None,
+        reuse: Optional[Dict[bytes, np.ndarray]] = None
+    ) -> np.ndarray:
+        """텍스트 목록을 배치 단위로 임베딩하여 정규화된 (n, dimension) 행렬로 반환
+
+        본문 해시 캐시나 reuse(본문 해시 → 저장된 벡터)에 있는 텍스트와 같은 호출 안에서
+        반복되는 텍스트는 다시 요청하지 않는다.
+        """
+        embedding_service = embedding_service or self.embedding_service
+        namespace = embedding_service.cache_namespace
+        hashes = [content_hash(text) for text in texts]
+
+        cached: Dict[bytes, np.ndarray] = {}
+        if self.embedding_cache is not None and texts:
+            cached = await asyncio.to_thread(self.embedding_cache.get_many, namespace, hashes)
+        if reuse:
+            cached.update(reuse)
+
+        # 캐시에 없는 고유 본문만 임베딩 요청 대상으로 선정 (해시 -> 요청 행)
+        pending: Dict[bytes, int] = {}
+        pending_texts: List[str] = []
+        for text, digest in zip(texts, hashes):
+            if digest not in cached and digest not in pending:
+                pending[digest] = len(pending_texts)
+                pending_texts.append(text)
+
+        fresh = np.empty((len(pending_texts), embedding_service.dimension), dtype=np.float32)
+
+        async def embed_batch(start: int, batch: List[str]):
+            fresh[start:start + len(batch)] = await embedding_service.embed(batch)
+
+        await asyncio.gather(*(
+            embed_batch(start, batch)
+            for start, batch in self._iter_embedding_batches(pending_texts)
+        ))
+
+        embeddings = await self._run(
+            self._assemble_embeddings, hashes, pending, fresh, cached, embedding_service.dimension
+        )
 
-                # 인덱스와 메타데이터 저장
-                self._save_index()
-                self._save_metadata()
+        # 정규화된 새 벡터를 캐시에 저장
+        if self.embedding_cache is not None and len(pending):
+            await asyncio.to_thread(self.embedding_cache.put_many, namespace, list(pending), fresh)
+
+        return embeddings
+
+    def _assemble_embeddings(
+        self,
+        hashes: List[bytes],
+        pending: Dict[bytes, int],
+        fresh: np.ndarray,
+        cached: Dict[bytes, np.ndarray],
+        dimension: int
+    ) -> np.ndarray:
+        """새 벡터와 캐시 벡터를 입력 순서의 정규화된 행렬로 조립 (실행기 스레드에서 실행)"""
+        _normalize_rows(fresh)
+
+        embeddings = np.empty((len(hashes), dimension), dtype=np.float32)
+        for position, digest in enumerate(hashes):
+            row = pending.get(digest)
+            embeddings[position] = fresh[row] if row is not None else cached[digest]
+
+        # float16으로 저장된 캐시 벡터까지 포함해 전체 행렬을 한 번에 정규화
+        return _normalize_rows(embeddings)
+
+    async def add_documents(
+        self,
+        chunks: List[DocumentChunk],
+        collection: str = DEFAULT_COLLECTION,
+        reuse_source: Optional[str] = None
+    ) -> bool:
+        """문서 청크들을 컬렉션 벡터 저장소에 추가
+
+        reuse_source를 주면 그 출처에 본문이 같은 청크가 있는 청크(페이지만 바뀐 청크 등)는
+        임베딩하지 않고 저장된 벡터를 재사용한다.
+        """
+        try:
+            if chunks:
+                async with self._collection(collection) as store:
+                    # 임베딩하는 사이 재임베딩 전환이 일어나면 새 모델로 한 번 더 임베딩
+                    for attempt in range(2):
+                        snapshot = store.snapshot
+                        embedding_service = self._service_for(snapshot)
+                        texts = [chunk.content for chunk in chunks]
+                        reuse = None
+                        if reuse_source is not None:
+                            reuse = await self._run(self._source_vectors, snapshot, reuse_source, texts)
+                        # 중복 청크를 제외하고 배치 임베딩 생성
+                        embeddings_array, canonical_ids, batch_refs = await self._embed_deduplicated(
+                            store, snapshot, texts, embedding_service, reuse
+                        )
+
+                        # 새 청크만 세그먼트로 기록 (기존 파일은 다시 쓰지 않음)
+                        try:
+                            await self._run(store.append, ChunkRows(
+                                ids=None,
+                                vectors=embeddings_array,
+                                texts=[chunk.content.encode('utf-8') for chunk in chunks],
+                                chunk_keys=[chunk.chunk_id.encode('utf-8') for chunk in chunks],
+                                sources=[chunk.source for chunk in chunks],
+                                pages=[chunk.page for chunk in chunks],
+                                canonical_ids=canonical_ids
+                            ), embedding_service.model, batch_refs)
+                            break
+                        except EmbeddingModelMismatch:
+                            if attempt:
+                                raise
 
             return True
 
@@ -113,66 +528,226 @@ class FAISSVectorStoreRepository(VectorStoreRepository):
             print(f"문서 추가 중 오류: {e}")
             return False
 
-    async def search_similar(self, query: str, k: int = 3) -> SearchResult:
-        """유사한 문서 검색"""
+    async def _embed_deduplicated(
+        self,
+        store: SegmentStore,
+        snapshot: StoreSnapshot,
+        texts: List[str],
+        embedding_service: EmbeddingService,
+        reuse: Optional[Dict[bytes, np.ndarray]] = None
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """중복이 아닌 청크만 임베딩하고 중복 청크는 대표 청크 벡터를 복사
+
+        (벡터, 기존 대표 청크 ID, 같은 배치 안의 대표 청크 위치)를 반환하며 참조가 없으면 -1이다.
+        """
+        if not self.dedup_enabled:
+            return await self._embed_texts(texts, embedding_service, reuse), None, None
+
+        duplicate_index = self._duplicate_indexes.get(store)
+        if duplicate_index is None:
+            duplicate_index = DuplicateIndex(self.dedup_similarity_threshold)
+            self._duplicate_indexes[store] = duplicate_index
+        matches = await self._run(self._find_duplicates, duplicate_index, snapshot, texts)
+
+        # 유사 중복은 벡터 확인이 켜져 있으면 임베딩해 대표 청크와 비교
+        verify = self.dedup_vector_threshold > 0
+        embed_positions = [
+            position for position, match in enumerate(matches)
+            if match is None or (verify and not match.exact)
+        ]
+        embedded = await self._embed_texts([texts[position] for position in embed_positions], embedding_service, reuse)
+        vectors, canonical_ids, batch_refs, counts = await self._run(
+            self._assemble_deduplicated, snapshot, matches, embed_positions, embedded, embedding_service.dimension
+        )
+
+        # 실행기 스레드에서 동시에 조립되므로 통계는 이벤트 루프에서 합산
+        self.duplicates_exact += counts["exact"]
+        self.duplicates_near += counts["near"]
+        self.duplicates_rejected += counts["rejected"]
+        return vectors, canonical_ids, batch_refs
+
+    @staticmethod
+    def _source_vectors(snapshot: StoreSnapshot, source: str, texts: List[str]) -> Dict[bytes, np.ndarray]:
+        """출처의 청크 중 texts와 본문이 같은 청크의 저장된 벡터 (본문 해시 → 벡터)"""
+        wanted = {content_hash(text) for text in texts}
+        vectors: Dict[bytes, np.ndarray] = {}
+        for chunk_id, text, _ in snapshot.chunks_for_source(source):
+            digest = content_hash(text.decode("utf-8"))
+            if digest in wanted and digest not in vectors:
+                store, position = snapshot.locate(chunk_id)
+                vectors[digest] = np.array(store.vectors[position], dtype=np.float32)
+        return vectors
+
+    @staticmethod
+    def _find_duplicates(
+        duplicate_index: DuplicateIndex,
+        snapshot: StoreSnapshot,
+        texts: List[str]
+    ) -> List[Optional[DuplicateMatch]]:
+        duplicate_index.update(snapshot)
+        return duplicate_index.find(snapshot, texts)
+
+    def _assemble_deduplicated(
+        self,
+        snapshot: StoreSnapshot,
+        matches: List[Optional[DuplicateMatch]],
+        embed_positions: List[int],
+        embedded: np.ndarray,
+        dimension: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int]]:
+        """임베딩한 벡터와 대표 청크 벡터로 입력 순서의 행렬과 참조 배열, 중복 판정 수 조립 (실행기 스레드에서 실행)"""
+        vectors = np.empty((len(matches), dimension), dtype=np.float32)
+        vectors[embed_positions] = embedded
+        canonical_ids = np.full(len(matches), -1, dtype=np.int64)
+        batch_refs = np.full(len(matches), -1, dtype=np.int64)
+        embedded_positions = set(embed_positions)
+        counts = {"exact": 0, "near": 0, "rejected": 0}
+
+        for position, match in enumerate(matches):
+            if match is None:
+                continue
+            if match.canonical_id >= 0:
+                segment, row = snapshot.locate(match.canonical_id)
+                reference = np.asarray(segment.vectors[row], dtype=np.float32)
+            else:
+                reference = vectors[match.batch_position]
+
+            if position in embedded_positions and float(vectors[position] @ reference) < self.dedup_vector_threshold:
+                # 본문은 비슷하지만 의미가 달라 대표 청크로 기록
+                counts["rejected"] += 1
+                continue
+
+            vectors[position] = reference
+            canonical_ids[position] = match.canonical_id
+            batch_refs[position] = match.batch_position
+            counts["exact" if match.exact else "near"] += 1
+        return vectors, canonical_ids, batch_refs, counts
+
+    async def search_similar(
+        self,
+        query: str,
+        k: int = 3,
+        search_filter: Optional[SearchFilter] = None,
+        collection: str = DEFAULT_COLLECTION
+    ) -> SearchResult:
+        """컬렉션에서 유사한 문서 검색 (필터가 있으면 조건에 맞는 청크만 대상)
+
+        하이브리드 검색이 켜져 있으면 벡터 검색과 BM25 어휘 검색 후보를 RRF로 결합한다.
+        """
         search_start_time = time.time()
 
         try:
-            if self.index.ntotal == 0:
+            # 검색과 본문 조회를 같은 스냅샷에서 수행 (동시 쓰기와 격리)
+            snapshot = await self._snapshot(collection)
+            if snapshot is None or snapshot.ntotal == 0:
                 return SearchResult.empty_result()
 
-            # 쿼리 임베딩 생성
-            embedding_result = await self.generate_embedding(query)
-            query_embedding = embedding_result.as_numpy_array().reshape(1, -1)
-
-            # 유사한 문서 검색
-            actual_k = min(k, self.index.ntotal)
-            scores, indices = self.index.search(query_embedding, actual_k)
-
-            search_time = time.time() - search_start_time
-
-            # 검색 결과를 컨텍스트로 결합
-            contexts = []
-            similarity_scores = []
-
-            for i, idx in enumerate(indices[0]):
-                if idx < len(self.metadata['documents']):
-                    contexts.append(self.metadata['documents'][idx])
-                    similarity_scores.append(float(scores[0][i]))
-
-            return SearchResult(
-                contexts=contexts,
-                similarity_scores=similarity_scores,
-                retrieved_chunks=len(contexts),
-                search_time=search_time - embedding_result.generation_time,
-                embedding_time=embedding_result.generation_time
+            if search_filter is not None and search_filter.is_empty:
+                search_filter = None
+            candidates = max(k, self.hybrid_candidates) if self.hybrid_search else k
+
+            lexical_ids: Optional[List[int]] = None
+            if self.hybrid_search:
+                # 조문 인용만으로 된 질의(예: "제750조")는 해당 조문이 있으면 임베딩 없이 어휘 검색으로 응답
+                if is_citation_query(query):
+                    lexical_scores, lexical_result = await self._run(
+                        snapshot.sparse_search, query, k, search_filter, citation_tokens(query)
+                    )
+                    if lexical_result.shape[1]:
+                        # 점수는 최상위 BM25 점수 대비 비율 (0~1)
+                        scores = (lexical_scores[0] / lexical_scores[0][0]).tolist()
+                        return self._build_result(
+                            snapshot, lexical_result[0].tolist(), scores, search_start_time, 0.0
+                        )
+
+                _, lexical_result = await self._run(snapshot.sparse_search, query, candidates, search_filter)
+                lexical_ids = lexical_result[0].tolist()
+
+            # 쿼리 임베딩 생성 (스냅샷을 만든 모델로, 반복 질의는 캐시 사용)
+            query_embedding, embedding_time = await self._embed_query(query, self._service_for(snapshot))
+
+            if search_filter is not None:
+                # 필터에 맞는 청크만 검색
+                scores, indices = await self._run(
+                    snapshot.search_filtered, query_embedding, candidates, search_filter
+                )
+            else:
+                # 유사한 문서 검색 (동시 검색은 하나의 다중 행 질의로 묶여 실행기에서 처리)
+                scores, indices = await self.search_batcher.search(snapshot, query_embedding, candidates)
+
+            dense_scores = {
+                int(chunk_id): float(score)
+                for chunk_id, score in zip(indices[0], scores[0]) if chunk_id >= 0
+            }
+            if lexical_ids is None:
+                ranked = list(dense_scores.items())[:k]
+            else:
+                # 결합한 순위와 점수 순서가 같도록 RRF 점수를 보고
+                ranked = _reciprocal_rank_fusion([list(dense_scores), lexical_ids], k, self.rrf_k)
+
+            return self._build_result(
+                snapshot,
+                [chunk_id for chunk_id, _ in ranked],
+                [score for _, score in ranked],
+                search_start_time,
+                embedding_time
             )
 
         except Exception as e:
             print(f"검색 중 오류: {e}")
             return SearchResult.empty_result()
 
-    async def delete_documents(self, document_id: str) -> bool:
-        """문서 삭제"""
-        try:
-            # 삭제할 대상 찾기
-            indices_to_remove = []
-            for i, source in enumerate(self.metadata['sources']):
-                if document_id in source or document_id in self.metadata['chunk_ids'][i]:
-                    indices_to_remove.append(i)
-
-            if not indices_to_remove:
-                return False
-
-            # 메타데이터에서 삭제 (역순으로 삭제하여 인덱스 변화 방지)
-            for idx in sorted(indices_to_remove, reverse=True):
-                del self.metadata['documents'][idx]
-                del self.metadata['sources'][idx]
-                del self.metadata['chunk_ids'][idx]
-                del self.metadata['pages'][idx]
+    def _build_result(
+        self,
+        snapshot: StoreSnapshot,
+        chunk_ids: List[int],
+        scores: List[float],
+        search_start_time: float,
+        embedding_time: float
+    ) -> SearchResult:
+        """검색된 청크 본문을 컨텍스트로 결합"""
+        search_time = time.time() - search_start_time
+
+        contexts = []
+        similarity_scores = []
+
+        for chunk_id, score in zip(chunk_ids, scores):
+            content = snapshot.content(chunk_id)
+            if content is not None:
+                contexts.append(content)
+                similarity_scores.append(score)
+
+        return SearchResult(
+            contexts=contexts,
+            similarity_scores=similarity_scores,
+            retrieved_chunks=len(contexts),
+            search_time=search_time - embedding_time,
+            embedding_time=embedding_time
+        )
 
-            # FAISS 인덱스 재구성
-            await self._rebuild_index()
+    async def delete_documents(self, document_id: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        """컬렉션에서 문서 삭제 (출처 경로가 일치하는 청크, 없으면 파일명이 일치하는 청크)"""
+        try:
+            async with self._collection(collection, create=False) as store:
+                if store is None:
+                    return False
+
+                snapshot = store.snapshot
+                if document_id in snapshot.source_segments:
+                    sources = [document_id]
+                else:
+                    sources = [
+                        source for source in snapshot.source_segments
+                        if os.path.basename(source) == document_id
+                    ]
+                if not sources:
+                    return False
+
+                # 삭제할 대상 찾기 (출처 색인으로 해당 문서의 청크만 조회)
+                ids_to_remove = await self._run(snapshot.ids_for_sources, sources)
+
+                # 삭제 목록만 기록 (재임베딩·전체 재기록 없음)
+                await self._run(store.delete, ids_to_remove)
 
             return True
 
@@ -180,48 +755,217 @@ class FAISSVectorStoreRepository(VectorStoreRepository):
             print(f"문서 삭제 중 오류: {e}")
             return False
 
-    async def _rebuild_index(self):
-        """인덱스 재구성"""
-        # 새 인덱스 생성
-        self.index = faiss.IndexFlatIP(self.dimension)
-
-        if self.metadata['documents']:
-            # 모든 문서에 대해 임베딩 재생성
-            embeddings = []
-            for doc in self.metadata['documents']:
-                embedding_result = await self.generate_embedding(doc)
-                embeddings.append(embedding_result.as_numpy_array())
-
-            if embeddings:
-                embeddings_array = np.vstack(embeddings)
-                self.index.add(embeddings_array)
-
-        # 인덱스와 메타데이터 저장
-        self._save_index()
-        self._save_metadata()
-
-    async def get_document_count(self) -> int:
-        """저장된 문서 청크 수"""
-        return len(self.metadata['documents'])
+    async def list_snapshots(self, collection: str = DEFAULT_COLLECTION) -> List[dict]:
+        """컬렉션의 보존된 인덱스 버전 목록 (최신순)"""
+        async with self._collection(collection, create=False) as store:
+            return [] if store is None else await self._run(store.list_snapshots)
+
+    async def rollback_snapshot(self, version: int, collection: str = DEFAULT_COLLECTION) -> int:
+        """보존된 버전으로 롤백하고 새로 공개된 버전 반환 (없는 버전·검증 실패는 ValueError)"""
+        async with self._collection(collection, create=False) as store:
+            if store is None:
+                raise ValueError(f"컬렉션이 없습니다: {collection}")
+            return await self._run(store.rollback, version)
+
+    async def gc_snapshots(self, keep: Optional[int] = None, collection: str = DEFAULT_COLLECTION) -> int:
+        """최근 keep개 버전만 남기고 정리, 삭제한 버전 수 반환"""
+        async with self._collection(collection, create=False) as store:
+            return 0 if store is None else await self._run(store.gc_snapshots, keep)
+
+    def _resume_reembedding(self, collection: str, store: SegmentStore):
+        """재시작 전에 진행 중이던 재임베딩을 이어서 실행 (프로세스마다 컬렉션당 한 번 확인)"""
+        if collection in self._reembedding_checked:
+            return
+        self._reembedding_checked.add(collection)
+        progress = ReembeddingMigration.read_progress(store.path)
+        if progress is not None and progress["state"] == ReembeddingState.RUNNING.value:
+            self._start_reembedding(collection, store)
+
+    def _start_reembedding(self, collection: str, store: SegmentStore) -> ReembeddingMigration:
+        migration = ReembeddingMigration(
+            store,
+            self.embedding_service.model,
+            self.embedding_service.dimension,
+            embed=lambda texts: self._embed_texts(texts, self.embedding_service),
+            run_sync=self._run,
+            batch_size=self.reembed_batch_size,
+            batch_interval=self.reembed_batch_interval
+        )
+        self.reembeddings[collection] = migration
+        self._reembedding_tasks[collection] = asyncio.ensure_future(self._run_reembedding(collection, migration))
+        return migration
 
-    async def list_documents(self) -> List[str]:
-        """저장된 문서 목록"""
-        return list(set(self.metadata['sources']))
+    async def _run_reembedding(self, collection: str, migration: ReembeddingMigration):
+        """작업이 끝날 때까지 저장소가 닫히지 않도록 잡아 둔다"""
+        store = self.collections.acquire_loaded(collection)
+        try:
+            await migration.run()
+        finally:
+            if store is not None:
+                self.collections.release(collection)
+
+    async def start_reembedding(self, collection: str = DEFAULT_COLLECTION) -> dict:
+        """컬렉션을 설정된 임베딩 모델로 다시 임베딩하는 백그라운드 작업 시작, 진행 상황 반환
+
+        작업 중에도 검색·추가·삭제는 이전 모델의 인덱스로 계속 처리된다.
+        """
+        async with self._collection(collection, create=False) as store:
+            if store is None:
+                raise ValueError(f"컬렉션이 없습니다: {collection}")
+            snapshot = store.snapshot
+            if (
+                snapshot.embedding_model == self.embedding_service.model
+                and snapshot.dimension == self.embedding_service.dimension
+            ):
+                return {"state": ReembeddingState.COMPLETED.value, "target_model": snapshot.embedding_model}
+
+            migration = self.reembeddings.get(collection)
+            if migration is None or not migration.running:
+                migration = self._start_reembedding(collection, store)
+            return dict(migration.progress)
+
+    async def get_reembedding_status(self, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        """재임베딩 진행 상황 (다른 워커가 실행 중인 작업 포함, 작업 기록이 없으면 None)"""
+        migration = self.reembeddings.get(collection)
+        if migration is not None:
+            return dict(migration.progress)
+        async with self._collection(collection, create=False) as store:
+            return None if store is None else ReembeddingMigration.read_progress(store.path)
+
+    async def evaluate_quantization(
+        self,
+        sample_size: int = 20000,
+        num_queries: int = 200,
+        k: int = 10,
+        collection: str = DEFAULT_COLLECTION
+    ) -> dict:
+        """컬렉션의 저장된 벡터 표본으로 인덱스 유형별 메모리 절감과 recall 손실 측정"""
+        snapshot = await self._snapshot(collection)
+        vectors = None if snapshot is None else await self._run(
+            snapshot.sample_vectors, sample_size + num_queries
+        )
+        if vectors is None or len(vectors) <= num_queries:
+            return {"sample_size": 0, "num_queries": 0, "k": k, "results": []}
+
+        # 표본 일부를 질의로 떼어 내고 나머지로 인덱스를 만든다
+        vectors = np.random.default_rng(0).permutation(vectors)
+        queries, database = vectors[:num_queries], vectors[num_queries:]
+        index_types = list(dict.fromkeys([
+            IndexType.FLAT,
+            IndexType.SQ_FP16,
+            IndexType.SQ8,
+            self.index_config.index_type
+        ]))
+        results = await self._run(
+            evaluate_index_types, self.index_config, database, queries, min(k, len(database)), index_types
+        )
 
-    async def clear_all(self) -> bool:
-        """모든 문서 삭제"""
+        return {
+            "current_index_type": detect_index_type(snapshot.base_index).value,
+            "rerank_factor": self.index_config.rerank_factor,
+            "sample_size": len(database),
+            "num_queries": len(queries),
+            "k": min(k, len(database)),
+            "results": results
+        }
+
+    async def get_source_fingerprints(self, source: str, collection: str = DEFAULT_COLLECTION) -> Dict[str, int]:
+        """출처의 청크 지문(페이지·본문 해시)별 청크 수 (다른 워커가 커밋한 버전까지 반영)"""
+        async with self._collection(collection, create=False) as store:
+            if store is None:
+                return {}
+            await self._run(store.refresh)
+            chunks = await self._run(self._source_fingerprints, store.snapshot, source)
+            return {fingerprint: len(ids) for fingerprint, ids in chunks.items()}
+
+    async def delete_source_chunks(
+        self,
+        source: str,
+        fingerprints: Dict[str, int],
+        collection: str = DEFAULT_COLLECTION
+    ) -> int:
+        """출처의 청크 중 지문별로 주어진 수만큼 삭제 (삭제 목록만 기록)"""
         try:
-            self.metadata = {
-                'documents': [],
-                'sources': [],
-                'chunk_ids': [],
-                'pages': []
-            }
+            async with self._collection(collection, create=False) as store:
+                if store is None or not fingerprints:
+                    return 0
+
+                chunks = await self._run(self._source_fingerprints, store.snapshot, source)
+                ids_to_remove = [
+                    chunk_id
+                    for fingerprint, count in fingerprints.items()
+                    for chunk_id in chunks.get(fingerprint, [])[:count]
+                ]
+                if not ids_to_remove:
+                    return 0
+                return await self._run(store.delete, np.array(ids_to_remove, dtype=np.int64))
 
-            self.index = faiss.IndexFlatIP(self.dimension)
+        except Exception as e:
+            print(f"청크 삭제 중 오류: {e}")
+            return 0
+
+    async def delete_chunks_with_key_prefix(
+        self,
+        source: str,
+        key_prefix: str,
+        collection: str = DEFAULT_COLLECTION
+    ) -> int:
+        """출처의 청크 중 청크 ID가 key_prefix로 시작하는 청크 삭제 (다른 워커가 커밋한 청크까지)"""
+        try:
+            async with self._collection(collection, create=False) as store:
+                if store is None:
+                    return 0
+                await self._run(store.refresh)
+                ids_to_remove = await self._run(
+                    store.snapshot.ids_with_key_prefix, source, key_prefix.encode("utf-8")
+                )
+                if not len(ids_to_remove):
+                    return 0
+                return await self._run(store.delete, ids_to_remove)
 
-            self._save_index()
-            self._save_metadata()
+        except Exception as e:
+            print(f"청크 삭제 중 오류: {e}")
+            return 0
+
+    @staticmethod
+    def _source_fingerprints(snapshot: StoreSnapshot, source: str) -> Dict[str, List[int]]:
+        """출처의 살아있는 청크 ID를 지문별로 (본문은 저장된 텍스트로 해시)"""
+        chunks: Dict[str, List[int]] = {}
+        for chunk_id, text, page in snapshot.chunks_for_source(source):
+            chunks.setdefault(chunk_fingerprint(text.decode("utf-8"), page), []).append(chunk_id)
+        return chunks
+
+    async def count_source_chunks(self, source: str, collection: str = DEFAULT_COLLECTION) -> int:
+        """컬렉션에 저장된 출처의 살아있는 청크 수 (출처 색인의 세그먼트별 청크 수 합)
+
+        수집 재개 지점으로 쓰이므로 다른 워커가 커밋한 버전까지 바로 반영해 센다.
+        """
+        async with self._collection(collection, create=False) as store:
+            if store is None:
+                return 0
+            await self._run(store.refresh)
+            return sum(store.snapshot.source_segments.get(source, {}).values())
+
+    async def get_document_count(self, collection: str = DEFAULT_COLLECTION) -> int:
+        """컬렉션에 저장된 문서 청크 수"""
+        snapshot = await self._snapshot(collection)
+        return 0 if snapshot is None else len(snapshot)
+
+    async def list_documents(self, collection: str = DEFAULT_COLLECTION) -> List[str]:
+        """컬렉션에 저장된 문서 목록 (출처 색인의 키)"""
+        snapshot = await self._snapshot(collection)
+        return [] if snapshot is None else snapshot.sources()
+
+    async def list_collections(self) -> List[str]:
+        """디스크에 있는 컬렉션 목록"""
+        return await self._run(self.collections.list_collections)
+
+    async def clear_all(self, collection: str = DEFAULT_COLLECTION) -> bool:
+        """컬렉션의 모든 문서 삭제"""
+        try:
+            async with self._collection(collection, create=False) as store:
+                if store is not None:
+                    await self._run(store.clear)
 
             return True
 
@@ -229,10 +973,27 @@ class FAISSVectorStoreRepository(VectorStoreRepository):
             print(f"전체 삭제 중 오류: {e}")
             return False
 
+    async def get_cache_statistics(self) -> dict:
+        """임베딩 캐시 통계"""
+        statistics = {
+            "query_embedding_cache": self.query_cache.stats(),
+            "vector_collections": {**self.collections.stats(), "reloads": self.index_reloads},
+            "deduplication": {
+                "enabled": self.dedup_enabled,
+                "exact_duplicates": self.duplicates_exact,
+                "near_duplicates": self.duplicates_near,
+                "rejected_by_vector_check": self.duplicates_rejected
+            }
+        }
+        if self.embedding_cache is not None:
+            statistics["content_embedding_cache"] = await asyncio.to_thread(self.embedding_cache.stats)
+        return statistics
+
     async def health_check(self) -> bool:
         """헬스 체크"""
         try:
-            # 인덱스가 정상적으로 로드되었는지 확인
-            return self.index is not None and isinstance(self.index.ntotal, int)
+            # 기본 컬렉션 인덱스가 정상적으로 로드되었는지 확인
+            snapshot = await self._snapshot(DEFAULT_COLLECTION)
+            return snapshot is not None and snapshot.base_index is not None and isinstance(snapshot.ntotal, int)
         except Exception:
             return False
@@ -0,0 +1,291 @@
+import json
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+IDS_FILE = "ids.i64"
+VECTORS_FILE = "vectors.f32"
+PAGES_FILE = "pages.i32"
+SOURCE_INDEX_FILE = "source_index.i32"
+SOURCES_FILE = "sources.json"
+TEXTS_FILE = "texts.bin"
+TEXT_OFFSETS_FILE = "text_offsets.i64"
+CHUNK_KEYS_FILE = "chunk_keys.bin"
+CHUNK_KEY_OFFSETS_FILE = "chunk_key_offsets.i64"
+# 출처별로 모은 행 위치와 출처별 (n + 1)개 오프셋 (출처 → 청크 색인)
+SOURCE_ROWS_FILE = "source_rows.i32"
+SOURCE_ROW_OFFSETS_FILE = "source_row_offsets.i64"
+# 중복 청크가 가리키는 대표 청크 ID (대표 청크는 -1, 중복이 없는 세그먼트에는 파일이 없음)
+CANONICAL_IDS_FILE = "canonical_ids.i64"
+
+COLUMN_FILES = (
+    IDS_FILE,
+    VECTORS_FILE,
+    PAGES_FILE,
+    SOURCE_INDEX_FILE,
+    SOURCES_FILE,
+    TEXTS_FILE,
+    TEXT_OFFSETS_FILE,
+    CHUNK_KEYS_FILE,
+    CHUNK_KEY_OFFSETS_FILE,
+)
+
+
+def open_array(path: str, dtype, shape_tail=()) -> np.ndarray:
+    """읽기 전용 memmap으로 배열 열기 (빈 파일은 빈 배열)"""
+    itemsize = np.dtype(dtype).itemsize * int(np.prod(shape_tail, dtype=np.int64))
+    size = os.path.getsize(path)
+    if size == 0:
+        return np.empty((0, *shape_tail), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(size // itemsize, *shape_tail))
+
+
+def open_blob(path: str):
+    """읽기 전용 mmap으로 바이너리 blob 열기"""
+    if os.path.getsize(path) == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def write_strings(blob_path: str, offsets_path: str, values: Sequence[bytes]):
+    """문자열들을 하나의 blob과 (n + 1)개의 오프셋 테이블로 기록"""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    if values:
+        np.cumsum([len(value) for value in values], out=offsets[1:])
+    with open(blob_path, "wb") as f:
+        for value in values:
+            f.write(value)
+        f.flush()
+        os.fsync(f.fileno())
+    write_array(offsets_path, offsets)
+
+
+def write_array(path: str, array: np.ndarray):
+    with open(path, "wb") as f:
+        np.ascontiguousarray(array).tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@dataclass
+class ChunkRows:
+    """청크 저장소에 기록할 행 묶음 (ids가 None이면 저장소가 추가 시 부여)"""
+    ids: Optional[np.ndarray]
+    vectors: np.ndarray
+    texts: List[bytes]
+    chunk_keys: List[bytes]
+    sources: List[str]
+    pages: List[int]
+    # 중복 청크면 대표 청크 ID, 아니면 -1 (None이면 모두 대표 청크)
+    canonical_ids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def canonical(self) -> np.ndarray:
+        """행별 대표 청크 ID (-1이면 대표 청크)"""
+        if self.canonical_ids is None:
+            return np.full(len(self), -1, dtype=np.int64)
+        return np.asarray(self.canonical_ids, dtype=np.int64)
+
+    @classmethod
+    def empty(cls, dimension: int) -> "ChunkRows":
+        return cls(
+            ids=np.empty(0, dtype=np.int64),
+            vectors=np.empty((0, dimension), dtype=np.float32),
+            texts=[],
+            chunk_keys=[],
+            sources=[],
+            pages=[]
+        )
+
+    def concat(self, other: "ChunkRows") -> "ChunkRows":
+        return ChunkRows(
+            ids=np.concatenate([self.ids, other.ids]),
+            vectors=np.vstack([self.vectors, other.vectors]),
+            texts=self.texts + other.texts,
+            chunk_keys=self.chunk_keys + other.chunk_keys,
+            sources=self.sources + other.sources,
+            pages=self.pages + other.pages,
+            canonical_ids=(
+                None if self.canonical_ids is None and other.canonical_ids is None
+                else np.concatenate([self.canonical(), other.canonical()])
+            )
+        )
+
+
+class ChunkStore:
+    """청크 ID·벡터·본문을 열 단위 파일로 저장하고 memmap으로 읽는 저장소
+
+    본문은 하나의 UTF-8 blob과 오프셋 테이블로 저장하므로 로드 시 파싱이 없고,
+    여러 워커가 OS 페이지 캐시를 통해 같은 페이지를 공유한다.
+    ID는 오름차순으로 저장되어 위치 조회는 이진 탐색으로 처리한다.
+    """
+
+    def __init__(self, path: str, dimension: int):
+        self.path = path
+        self.dimension = dimension
+
+        self.ids = open_array(os.path.join(path, IDS_FILE), np.int64)
+        self.vectors = open_array(os.path.join(path, VECTORS_FILE), np.float32, (dimension,))
+        self.pages = open_array(os.path.join(path, PAGES_FILE), np.int32)
+        self.source_index = open_array(os.path.join(path, SOURCE_INDEX_FILE), np.int32)
+        self.text_offsets = open_array(os.path.join(path, TEXT_OFFSETS_FILE), np.int64)
+        self.chunk_key_offsets = open_array(os.path.join(path, CHUNK_KEY_OFFSETS_FILE), np.int64)
+        self._texts = open_blob(os.path.join(path, TEXTS_FILE))
+        self._chunk_keys = open_blob(os.path.join(path, CHUNK_KEYS_FILE))
+
+        with open(os.path.join(path, SOURCES_FILE), "r", encoding="utf-8") as f:
+            self.sources: List[str] = json.load(f)
+        self.source_positions = {source: position for position, source in enumerate(self.sources)}
+
+        self.source_rows = open_array(os.path.join(path, SOURCE_ROWS_FILE), np.int32)
+        self.source_row_offsets = open_array(os.path.join(path, SOURCE_ROW_OFFSETS_FILE), np.int64)
+
+        canonical_path = os.path.join(path, CANONICAL_IDS_FILE)
+        self.canonical_ids = open_array(canonical_path, np.int64) if os.path.exists(canonical_path) else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def write(cls, path: str, dimension: int, rows: ChunkRows) -> "ChunkStore":
+        """새 디렉토리에 청크 열 파일들을 기록하고 memmap으로 다시 연다"""
+        os.makedirs(path, exist_ok=True)
+
+        source_list = list(dict.fromkeys(rows.sources))
+        source_positions = {source: position for position, source in enumerate(source_list)}
+
+        write_array(os.path.join(path, IDS_FILE), np.asarray(rows.ids, dtype=np.int64))
+        write_array(
+            os.path.join(path, VECTORS_FILE),
+            np.asarray(rows.vectors, dtype=np.float32).reshape(-1, dimension)
+        )
+        write_array(os.path.join(path, PAGES_FILE), np.asarray(rows.pages, dtype=np.int32))
+        write_array(
+            os.path.join(path, SOURCE_INDEX_FILE),
+            np.array([source_positions[source] for source in rows.sources], dtype=np.int32)
+        )
+        write_strings(
+            os.path.join(path, TEXTS_FILE),
+            os.path.join(path, TEXT_OFFSETS_FILE),
+            rows.texts
+        )
+        write_strings(
+            os.path.join(path, CHUNK_KEYS_FILE),
+            os.path.join(path, CHUNK_KEY_OFFSETS_FILE),
+            rows.chunk_keys
+        )
+        if (rows.canonical() >= 0).any():
+            write_array(os.path.join(path, CANONICAL_IDS_FILE), rows.canonical())
+        with open(os.path.join(path, SOURCES_FILE), "w", encoding="utf-8") as f:
+            json.dump(source_list, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        cls.index_sources(path)
+
+        return cls(path, dimension)
+
+    @staticmethod
+    def has_source_index(path: str) -> bool:
+        return os.path.exists(os.path.join(path, SOURCE_ROW_OFFSETS_FILE))
+
+    @staticmethod
+    def index_sources(path: str):
+        """출처별 행 위치 색인 기록 (색인이 없던 이전 세그먼트도 이 함수로 생성)"""
+        source_index = open_array(os.path.join(path, SOURCE_INDEX_FILE), np.int32)
+        with open(os.path.join(path, SOURCES_FILE), "r", encoding="utf-8") as f:
+            num_sources = len(json.load(f))
+
+        offsets = np.zeros(num_sources + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source_index, minlength=num_sources), out=offsets[1:])
+        write_array(
+            os.path.join(path, SOURCE_ROWS_FILE),
+            np.argsort(source_index, kind="stable").astype(np.int32)
+        )
+
+        # 오프셋 파일을 마지막에 rename하므로 이 파일이 있으면 색인이 완성된 것으로 본다
+        offsets_path = os.path.join(path, SOURCE_ROW_OFFSETS_FILE)
+        write_array(offsets_path + ".tmp", offsets)
+        os.replace(offsets_path + ".tmp", offsets_path)
+
+    @staticmethod
+    def link(source_path: str, target_path: str):
+        """변경 없는 열 파일들을 새 디렉토리에 하드링크 (복사 없이 세대 전환)"""
+        os.makedirs(target_path, exist_ok=True)
+        for name in COLUMN_FILES:
+            os.link(os.path.join(source_path, name), os.path.join(target_path, name))
+
+    def rows(self, positions: Optional[np.ndarray] = None) -> ChunkRows:
+        """지정한 위치(없으면 전체)의 행들을 기록용 묶음으로 반환"""
+        if positions is None:
+            positions = np.arange(len(self))
+        return ChunkRows(
+            ids=np.asarray(self.ids[positions], dtype=np.int64),
+            vectors=np.asarray(self.vectors[positions], dtype=np.float32).reshape(-1, self.dimension),
+            texts=[self.text_bytes(position) for position in positions],
+            chunk_keys=[self.chunk_key_bytes(position) for position in positions],
+            sources=[self.source(position) for position in positions],
+            pages=[int(page) for page in self.pages[positions]],
+            canonical_ids=(
+                None if self.canonical_ids is None
+                else np.asarray(self.canonical_ids[positions], dtype=np.int64)
+            )
+        )
+
+    def canonical_mask(self) -> np.ndarray:
+        """대표 청크 행 여부 (중복 청크는 인덱스에 넣지 않는다)"""
+        if self.canonical_ids is None:
+            return np.ones(len(self), dtype=bool)
+        return np.asarray(self.canonical_ids) < 0
+
+    def position_of(self, chunk_id: int) -> Optional[int]:
+        """청크 ID의 행 위치 (없으면 None)"""
+        position = int(np.searchsorted(self.ids, chunk_id))
+        if position < len(self.ids) and self.ids[position] == chunk_id:
+            return position
+        return None
+
+    def text_bytes(self, position: int) -> bytes:
+        return self._texts[self.text_offsets[position]:self.text_offsets[position + 1]]
+
+    def chunk_key_bytes(self, position: int) -> bytes:
+        return self._chunk_keys[self.chunk_key_offsets[position]:self.chunk_key_offsets[position + 1]]
+
+    def content(self, position: int) -> str:
+        """청크 본문"""
+        return self.text_bytes(position).decode("utf-8")
+
+    def source(self, position: int) -> str:
+        return self.sources[self.source_index[position]]
+
+    def chunk(self, position: int) -> Dict:
+        """청크 한 건의 메타데이터와 본문"""
+        return {
+            "content": self.content(position),
+            "source": self.source(position),
+            "chunk_id": self.chunk_key_bytes(position).decode("utf-8"),
+            "page": int(self.pages[position])
+        }
+
+    def positions_for_source(self, source: str) -> np.ndarray:
+        """출처에 속한 행 위치들 (오름차순, 해당 출처의 청크 수만큼만 읽음)"""
+        source_position = self.source_positions.get(source)
+        if source_position is None:
+            return np.empty(0, dtype=np.int64)
+        start = self.source_row_offsets[source_position]
+        end = self.source_row_offsets[source_position + 1]
+        return np.asarray(self.source_rows[start:end], dtype=np.int64)
+
+    def source_counts(self, positions: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """지정한 행(없으면 전체)의 출처별 청크 수"""
+        source_index = self.source_index if positions is None else self.source_index[positions]
+        counts = np.bincount(source_index, minlength=len(self.sources))
+        return {
+            self.sources[position]: int(count)
+            for position, count in enumerate(counts.tolist()) if count
+        }
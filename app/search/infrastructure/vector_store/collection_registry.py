@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from app.search.domain.value_objects.collection import DEFAULT_COLLECTION
+from app.search.infrastructure.vector_store.segment_store import MANIFEST_FILE, SegmentStore
+
+COLLECTIONS_DIR = "collections"
+
+
+class CollectionRegistry:
+    """컬렉션별 세그먼트 저장소를 처음 사용할 때 열고, 메모리 예산을 넘으면 LRU로 닫는 레지스트리
+
+    기본 컬렉션은 기존 저장소 경로를 그대로 쓰고, 나머지는 collections/<이름>/ 아래에 둔다.
+    사용 중(acquire 후 release 전)인 저장소는 닫지 않으므로 한 디렉토리에 쓰는 저장소는 항상 하나다.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        open_store: Callable[[str, str], SegmentStore],
+        memory_budget_bytes: int = 2 * 1024 ** 3
+    ):
+        self.root_path = root_path
+        self.open_store = open_store
+        self.memory_budget_bytes = memory_budget_bytes
+
+        self._stores: "OrderedDict[str, SegmentStore]" = OrderedDict()
+        self._in_use: Counter = Counter()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def path_for(self, name: str) -> str:
+        if name == DEFAULT_COLLECTION:
+            return self.root_path
+        return os.path.join(self.root_path, COLLECTIONS_DIR, name)
+
+    def exists(self, name: str) -> bool:
+        return name in self._stores or os.path.exists(os.path.join(self.path_for(name), MANIFEST_FILE))
+
+    def acquire(self, name: str, create: bool = True) -> Optional[SegmentStore]:
+        """컬렉션 저장소를 사용 중으로 표시하고 반환 (없고 create가 False면 None)
+
+        디스크 읽기가 있으므로 벡터 연산 실행기에서 호출한다. 적재는 컬렉션별 잠금으로
+        직렬화하므로 한 컬렉션을 여는 동안 다른 컬렉션 요청은 기다리지 않는다.
+        """
+        with self._lock:
+            loading_lock = self._loading.setdefault(name, threading.Lock())
+
+        with loading_lock:
+            with self._lock:
+                store = self._stores.get(name)
+                if store is not None:
+                    return self._mark_in_use(name, store)
+            if not create and not self.exists(name):
+                return None
+            store = self.open_store(name, self.path_for(name))
+
+            with self._lock:
+                self._stores[name] = store
+                self.loads += 1
+                return self._mark_in_use(name, store)
+
+    def acquire_loaded(self, name: str) -> Optional[SegmentStore]:
+        """이미 열린 컬렉션이면 디스크 읽기 없이 사용 중으로 표시하고 반환 (아니면 None)"""
+        with self._lock:
+            store = self._stores.get(name)
+            return None if store is None else self._mark_in_use(name, store)
+
+    def _mark_in_use(self, name: str, store: SegmentStore) -> SegmentStore:
+        self._stores.move_to_end(name)
+        self._in_use[name] += 1
+        self._evict()
+        return store
+
+    def release(self, name: str):
+        with self._lock:
+            self._in_use[name] -= 1
+            if self._in_use[name] <= 0:
+                del self._in_use[name]
+            self._evict()
+
+    def _evict(self):
+        """예산을 넘는 동안 가장 오래 쓰지 않은 유휴 저장소부터 닫기 (잠금 안에서 호출)"""
+        while self._resident_bytes() > self.memory_budget_bytes:
+            idle = [name for name in self._stores if not self._in_use[name]]
+            if not idle:
+                return
+            # 진행 중인 검색은 이미 잡은 스냅샷을 계속 사용하고, 참조가 사라지면 매핑이 해제된다
+            self._stores.pop(idle[0]).close()
+            self.evictions += 1
+
+    def close(self):
+        """종료 시 열린 저장소를 모두 닫기"""
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+            self._stores.clear()
+
+    def _resident_bytes(self) -> int:
+        return sum(store.resident_bytes() for store in self._stores.values())
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._stores)
+
+    def list_collections(self) -> List[str]:
+        """디스크에 있는 모든 컬렉션 이름"""
+        names = [DEFAULT_COLLECTION] if self.exists(DEFAULT_COLLECTION) else []
+        collections_path = os.path.join(self.root_path, COLLECTIONS_DIR)
+        if os.path.isdir(collections_path):
+            names.extend(sorted(
+                name for name in os.listdir(collections_path)
+                if os.path.exists(os.path.join(collections_path, name, MANIFEST_FILE))
+            ))
+        return names
+
+    def stats(self) -> Dict:
+        """모니터링용 적재 상태"""
+        with self._lock:
+            return {
+                "loaded": list(self._stores),
+                "resident_bytes": self._resident_bytes(),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
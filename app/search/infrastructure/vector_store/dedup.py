@@ -0,0 +1,229 @@
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.search.infrastructure.vector_store.chunk_store import ChunkStore, open_array, write_array
+
+if TYPE_CHECKING:
+    from app.search.infrastructure.vector_store.segment_store import StoreSnapshot
+
+# 세그먼트 청크 본문의 MinHash 서명 (n, NUM_PERMUTATIONS)
+SIGNATURES_FILE = "minhash.u32"
+
+# 서명 길이와 LSH 밴드 구성 (밴드당 4행: 자카드 0.5 부근부터 후보가 되고 서명 비교로 걸러낸다)
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 5
+# 한 청크에서 서명을 비교할 최대 후보 수 (밴드가 많이 겹친 순)
+MAX_CANDIDATES = 32
+
+# (a * h + b) mod p 순열 (p = 2^31 - 1이므로 uint64 곱셈이 넘치지 않는다)
+_PRIME = (1 << 31) - 1
+_permutations = np.random.default_rng(20240601)
+_PERMUTATION_A = _permutations.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERMUTATION_B = _permutations.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_SHINGLE_WEIGHTS = np.uint64(1_000_003) ** np.arange(SHINGLE_SIZE, dtype=np.uint64)
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def normalize_text(text: str) -> str:
+    """중복 비교용 정규화 (NFKC, 소문자, 공백 정리)"""
+    return _WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+def _numbers(normalized: str) -> Tuple[str, ...]:
+    """본문에 나온 숫자 (조문 번호·날짜·금액)"""
+    return tuple(_NUMBER_PATTERN.findall(normalized))
+
+
+def minhash_signature(normalized: str) -> np.ndarray:
+    """정규화된 본문의 문자 SHINGLE_SIZE-gram 집합에 대한 MinHash 서명"""
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < SHINGLE_SIZE:
+        codes = np.concatenate([codes, np.zeros(SHINGLE_SIZE - len(codes), dtype=np.uint64)])
+
+    # 연속한 코드 포인트를 다항식으로 묶어 shingle 해시 계산 (uint64 overflow는 의도된 mod 2^64)
+    windows = np.lib.stride_tricks.sliding_window_view(codes, SHINGLE_SIZE)
+    with np.errstate(over="ignore"):
+        hashes = windows @ _SHINGLE_WEIGHTS
+        hashes ^= hashes >> np.uint64(29)
+    hashes = np.unique(hashes % np.uint64(_PRIME))
+
+    permuted = (np.outer(_PERMUTATION_A, hashes) + _PERMUTATION_B[:, None]) % np.uint64(_PRIME)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def minhash_signatures(texts: Sequence[bytes]) -> np.ndarray:
+    signatures = np.empty((len(texts), NUM_PERMUTATIONS), dtype=np.uint32)
+    for position, text in enumerate(texts):
+        signatures[position] = minhash_signature(normalize_text(text.decode("utf-8")))
+    return signatures
+
+
+def write_signatures(path: str, texts: Sequence[bytes], signatures: Optional[np.ndarray] = None):
+    """세그먼트 청크 본문들의 MinHash 서명 기록 (병합처럼 이미 계산된 서명이 있으면 그대로 기록)"""
+    if signatures is None:
+        signatures = minhash_signatures(texts)
+    write_array(os.path.join(path, SIGNATURES_FILE), signatures)
+
+
+def read_signatures(store: ChunkStore) -> np.ndarray:
+    """세그먼트의 MinHash 서명 (서명 도입 전 세그먼트는 본문으로 계산하되 파일은 쓰지 않음)"""
+    path = os.path.join(store.path, SIGNATURES_FILE)
+    if os.path.exists(path):
+        return open_array(path, np.uint32, (NUM_PERMUTATIONS,))
+    # 체크섬이 기록된 세그먼트 디렉토리에는 파일을 추가하지 않는다
+    return minhash_signatures([store.text_bytes(position) for position in range(len(store))])
+
+
+def _band_keys(signature: np.ndarray) -> List[bytes]:
+    rows = NUM_PERMUTATIONS // NUM_BANDS
+    return [bytes([band]) + signature[band * rows:(band + 1) * rows].tobytes() for band in range(NUM_BANDS)]
+
+
+@dataclass
+class DuplicateMatch:
+    """중복으로 판정된 청크가 가리킬 대표 청크"""
+    # 기존 대표 청크 ID (같은 배치의 앞선 청크를 가리키면 -1)
+    canonical_id: int
+    # 같은 배치 안의 대표 청크 위치 (기존 청크를 가리키면 -1)
+    batch_position: int
+    # 정규화한 본문이 같은지 (아니면 MinHash 추정 유사도가 임계치 이상인 유사 중복)
+    exact: bool
+    similarity: float
+
+
+class DuplicateIndex:
+    """컬렉션 대표 청크의 MinHash 서명을 LSH 밴드로 색인해 중복 후보를 찾는 메모리 색인
+
+    세그먼트는 불변이고 청크 ID는 병합 후에도 유지되므로 처음 보는 세그먼트만 추가로 색인하고,
+    삭제된 청크는 조회할 때 스냅샷으로 걸러낸다. 중복 청크는 대표 청크를 가리키므로 색인하지 않는다.
+    유사 중복은 숫자(조문 번호·날짜·금액)가 모두 같을 때만 인정해 다른 조문을 합치지 않는다.
+    """
+
+    def __init__(self, threshold: float = 0.9):
+        self.threshold = threshold
+        self._buckets: Dict[bytes, List[int]] = {}
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._segments: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def update(self, snapshot: "StoreSnapshot"):
+        """스냅샷에서 처음 보는 세그먼트의 대표 청크를 색인 (실행기 스레드에서 호출)"""
+        with self._lock:
+            # 삭제로 쌓인 항목이 살아있는 청크보다 훨씬 많아지면 처음부터 다시 색인
+            if len(self._signatures) > 2 * max(len(snapshot), 1000):
+                self._buckets, self._signatures, self._segments = {}, {}, set()
+
+            for name, store in snapshot.segments.items():
+                if name in self._segments:
+                    continue
+                signatures = read_signatures(store)
+                positions = snapshot.live_rows(name)
+                positions = positions[store.canonical_mask()[positions]]
+                for position in positions.tolist():
+                    self._add(int(store.ids[position]), np.array(signatures[position]))
+                self._segments.add(name)
+
+    def _add(self, chunk_id: int, signature: np.ndarray):
+        if chunk_id in self._signatures:
+            return
+        self._signatures[chunk_id] = signature
+        for key in _band_keys(signature):
+            self._buckets.setdefault(key, []).append(chunk_id)
+
+    def find(self, snapshot: "StoreSnapshot", texts: Sequence[str]) -> List[Optional[DuplicateMatch]]:
+        """새 청크들의 대표 청크 (스냅샷의 살아있는 청크 또는 같은 배치의 앞선 청크, 없으면 None)"""
+        normalized = [normalize_text(text) for text in texts]
+        signatures = [minhash_signature(text) for text in normalized]
+
+        matches: List[Optional[DuplicateMatch]] = []
+        batch_exact: Dict[str, int] = {}
+        batch_buckets: Dict[bytes, List[int]] = {}
+        with self._lock:
+            for position, (text, signature) in enumerate(zip(normalized, signatures)):
+                if text in batch_exact:
+                    matches.append(DuplicateMatch(-1, batch_exact[text], True, 1.0))
+                    continue
+
+                keys = _band_keys(signature)
+                match = self._best_existing(snapshot, text, signature, keys)
+                if match is None:
+                    match = self._best_in_batch(text, signature, keys, normalized, signatures, batch_buckets)
+                matches.append(match)
+
+                if match is None:
+                    # 대표 청크가 되는 배치 청크만 이후 청크의 후보로 둔다
+                    batch_exact[text] = position
+                    for key in keys:
+                        batch_buckets.setdefault(key, []).append(position)
+        return matches
+
+    def _best_existing(
+        self,
+        snapshot: "StoreSnapshot",
+        text: str,
+        signature: np.ndarray,
+        keys: List[bytes]
+    ) -> Optional[DuplicateMatch]:
+        best = None
+        for chunk_id in self._candidates(self._buckets, keys):
+            similarity = float(np.mean(self._signatures[chunk_id] == signature))
+            if similarity < self.threshold or (best is not None and similarity <= best.similarity):
+                continue
+            content = snapshot.content(chunk_id)
+            if content is None:
+                continue
+            exact = self._compare(text, normalize_text(content))
+            if exact is not None:
+                best = DuplicateMatch(chunk_id, -1, exact, similarity)
+                if exact:
+                    break
+        return best
+
+    def _best_in_batch(
+        self,
+        text: str,
+        signature: np.ndarray,
+        keys: List[bytes],
+        normalized: List[str],
+        signatures: List[np.ndarray],
+        batch_buckets: Dict[bytes, List[int]]
+    ) -> Optional[DuplicateMatch]:
+        best = None
+        for candidate in self._candidates(batch_buckets, keys):
+            similarity = float(np.mean(signatures[candidate] == signature))
+            if similarity < self.threshold or (best is not None and similarity <= best.similarity):
+                continue
+            if self._compare(text, normalized[candidate]) is not None:
+                best = DuplicateMatch(-1, candidate, False, similarity)
+        return best
+
+    @staticmethod
+    def _candidates(buckets: Dict[bytes, List[int]], keys: List[bytes]) -> List[int]:
+        """밴드가 많이 겹친 순으로 최대 MAX_CANDIDATES개 후보"""
+        hits: Counter = Counter()
+        for key in keys:
+            hits.update(buckets.get(key, ()))
+        return [candidate for candidate, _ in hits.most_common(MAX_CANDIDATES)]
+
+    @staticmethod
+    def _compare(text: str, candidate: str) -> Optional[bool]:
+        """같은 본문이면 True, 숫자까지 같은 유사 중복이면 False, 중복이 아니면 None"""
+        if text == candidate:
+            return True
+        if _numbers(text) != _numbers(candidate):
+            return None
+        return False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"indexed_chunks": len(self._signatures), "buckets": len(self._buckets)}
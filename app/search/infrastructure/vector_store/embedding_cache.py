@@ -0,0 +1,95 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# SQLite 한 쿼리에 넣을 최대 바인딩 파라미터 수
+_MAX_QUERY_PARAMS = 500
+
+
+def content_hash(text: str) -> bytes:
+    """청크 본문의 SHA-256 다이제스트"""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class ContentEmbeddingCache:
+    """(모델·차원, 본문 해시) 키의 영구 임베딩 캐시
+
+    벡터는 float16 바이트열로 SQLite 파일에 저장해 1536차원 기준 항목당 약 3KB만 차지한다.
+    같은 조항이 여러 문서에 반복되거나 같은 파일을 다시 올려도 임베딩 요청 없이 재사용한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 수집 작업은 스레드에서 캐시를 조회하므로 연결을 잠금으로 보호
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, content_hash BLOB NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, content_hash)) WITHOUT ROWID"
+            )
+
+    def get_many(self, model: str, hashes: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """캐시에 있는 해시들의 float32 벡터"""
+        unique_hashes = list(dict.fromkeys(hashes))
+        found: Dict[bytes, np.ndarray] = {}
+
+        with self._lock:
+            for start in range(0, len(unique_hashes), _MAX_QUERY_PARAMS):
+                batch = unique_hashes[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT content_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND content_hash IN ({placeholders})",
+                    (model, *batch)
+                ).fetchall()
+                for digest, vector in rows:
+                    found[bytes(digest)] = np.frombuffer(vector, dtype=np.float16).astype(np.float32)
+
+            self.hits += len(found)
+            self.misses += len(unique_hashes) - len(found)
+
+        return found
+
+    def put_many(self, model: str, hashes: Sequence[bytes], vectors: np.ndarray):
+        """해시별 벡터를 float16으로 저장"""
+        if not len(hashes):
+            return
+
+        compact = np.asarray(vectors, dtype=np.float16).reshape(len(hashes), -1)
+        rows: List[tuple] = [
+            (model, digest, compact[position].tobytes())
+            for position, digest in enumerate(hashes)
+        ]
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, content_hash, vector) VALUES (?, ?, ?)",
+                rows
+            )
+
+    def stats(self) -> Dict[str, float]:
+        """모니터링용 적중/미적중 통계"""
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
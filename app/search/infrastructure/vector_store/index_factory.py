@@ -0,0 +1,238 @@
+import math
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Dict, List, Optional, Sequence
+
+import faiss
+import numpy as np
+
+# faiss k-means가 경고 없이 학습하기 위해 필요한 centroid당 최소 학습 벡터 수
+_MIN_POINTS_PER_CENTROID = 39
+# 학습 시 centroid당 사용할 최대 학습 벡터 수
+_MAX_POINTS_PER_CENTROID = 256
+# 스칼라 양자화 범위 학습에 사용할 최대 벡터 수
+_MAX_SQ_TRAINING_VECTORS = 65536
+
+
+class IndexType(Enum):
+    FLAT = "flat"
+    IVF_FLAT = "ivf_flat"
+    IVF_PQ = "ivf_pq"
+    HNSW = "hnsw"
+    SQ_FP16 = "sq_fp16"
+    SQ8 = "sq8"
+
+    @property
+    def requires_training(self) -> bool:
+        return self in (IndexType.IVF_FLAT, IndexType.IVF_PQ)
+
+    @property
+    def is_quantized(self) -> bool:
+        """벡터를 손실 압축 코드로 저장하는지 (원본 float32 벡터로 재채점할 대상)"""
+        return self in (IndexType.IVF_PQ, IndexType.SQ_FP16, IndexType.SQ8)
+
+    @property
+    def supports_remove(self) -> bool:
+        """개별 ID 삭제 지원 여부 (HNSW는 재구성 필요)"""
+        return self != IndexType.HNSW
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    """FAISS 인덱스 구성 값 객체"""
+    index_type: IndexType = IndexType.FLAT
+    nlist: int = 0
+    nprobe: int = 16
+    pq_m: int = 64
+    pq_nbits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 128
+    min_train_size: int = 10000
+    rerank_factor: int = 4
+
+    def resolve_nlist(self, num_vectors: int) -> int:
+        """IVF 리스트 수 (0이면 벡터 수의 제곱근 기준으로 자동 계산)"""
+        if self.nlist > 0:
+            return self.nlist
+        auto_nlist = int(4 * math.sqrt(max(num_vectors, 1)))
+        return max(1, min(auto_nlist, num_vectors // _MIN_POINTS_PER_CENTROID))
+
+    def required_training_size(self, num_vectors: int) -> int:
+        """학습형 인덱스를 만들기 위해 필요한 최소 벡터 수"""
+        if self.index_type == IndexType.SQ8:
+            # 차원별 값 범위만 학습하므로 벡터 하나 이상이면 충분
+            return 1
+        if not self.index_type.requires_training:
+            return 0
+        required = _MIN_POINTS_PER_CENTROID * self.resolve_nlist(num_vectors)
+        if self.index_type == IndexType.IVF_PQ:
+            required = max(required, _MIN_POINTS_PER_CENTROID * (1 << self.pq_nbits))
+        return max(required, self.min_train_size)
+
+    def can_build(self, num_vectors: int) -> bool:
+        """현재 벡터 수로 설정된 인덱스 유형을 만들 수 있는지 확인"""
+        return num_vectors >= self.required_training_size(num_vectors)
+
+    def factory_string(self, num_vectors: int) -> str:
+        """faiss.index_factory 설명 문자열"""
+        if self.index_type == IndexType.IVF_FLAT:
+            return f"IDMap2,IVF{self.resolve_nlist(num_vectors)},Flat"
+        if self.index_type == IndexType.IVF_PQ:
+            return f"IDMap2,IVF{self.resolve_nlist(num_vectors)},PQ{self.pq_m}x{self.pq_nbits}"
+        if self.index_type == IndexType.HNSW:
+            return f"IDMap2,HNSW{self.hnsw_m}"
+        if self.index_type == IndexType.SQ_FP16:
+            return "IDMap2,SQfp16"
+        if self.index_type == IndexType.SQ8:
+            return "IDMap2,SQ8"
+        return "IDMap2,Flat"
+
+
+def build_index(
+    config: IndexConfig,
+    dimension: int,
+    vectors: np.ndarray,
+    ids: np.ndarray
+) -> faiss.Index:
+    """저장된 벡터로 설정된 유형의 인덱스를 학습·생성
+
+    학습에 필요한 벡터 수가 부족하면 Flat 인덱스로 대체한다.
+    """
+    if not config.can_build(len(ids)):
+        config = replace(config, index_type=IndexType.FLAT)
+
+    index = faiss.index_factory(
+        dimension,
+        config.factory_string(len(ids)),
+        faiss.METRIC_INNER_PRODUCT
+    )
+
+    if config.index_type == IndexType.HNSW:
+        faiss.downcast_index(index.index).hnsw.efConstruction = config.ef_construction
+
+    if not index.is_trained:
+        index.train(_sample_training_vectors(config, vectors))
+
+    apply_search_params(index, config)
+
+    if len(ids):
+        index.add_with_ids(vectors, ids)
+
+    return index
+
+
+def apply_search_params(index: faiss.Index, config: IndexConfig):
+    """런타임 검색 파라미터(nprobe, efSearch) 적용"""
+    index_type = detect_index_type(index)
+    parameter_space = faiss.ParameterSpace()
+
+    if index_type in (IndexType.IVF_FLAT, IndexType.IVF_PQ):
+        parameter_space.set_index_parameter(index, "nprobe", config.nprobe)
+    elif index_type == IndexType.HNSW:
+        parameter_space.set_index_parameter(index, "efSearch", config.ef_search)
+
+
+def search_parameters(
+    index: faiss.Index,
+    config: IndexConfig,
+    selector: Optional[faiss.IDSelector] = None
+) -> Optional[faiss.SearchParameters]:
+    """ID 선택자를 포함한 검색 파라미터 (선택자가 없으면 인덱스 기본값 사용)"""
+    if selector is None:
+        return None
+
+    index_type = detect_index_type(index)
+    if index_type in (IndexType.IVF_FLAT, IndexType.IVF_PQ):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=config.nprobe)
+    if index_type == IndexType.HNSW:
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=config.ef_search)
+    return faiss.SearchParameters(sel=selector)
+
+
+def detect_index_type(index: faiss.Index) -> IndexType:
+    """IDMap 래퍼 내부의 실제 인덱스 유형 판별"""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap2) else index
+
+    if isinstance(inner, faiss.IndexIVFPQ):
+        return IndexType.IVF_PQ
+    if isinstance(inner, faiss.IndexIVFFlat):
+        return IndexType.IVF_FLAT
+    if isinstance(inner, faiss.IndexHNSW):
+        return IndexType.HNSW
+    if isinstance(inner, faiss.IndexScalarQuantizer):
+        if inner.sq.qtype == faiss.ScalarQuantizer.QT_8bit:
+            return IndexType.SQ8
+        if inner.sq.qtype == faiss.ScalarQuantizer.QT_fp16:
+            return IndexType.SQ_FP16
+    return IndexType.FLAT
+
+
+def _sample_training_vectors(config: IndexConfig, vectors: np.ndarray) -> np.ndarray:
+    """k-means·양자화 범위 학습에 충분한 만큼만 무작위 표본 추출"""
+    if config.index_type.requires_training:
+        max_points = _MAX_POINTS_PER_CENTROID * config.resolve_nlist(len(vectors))
+        if config.index_type == IndexType.IVF_PQ:
+            max_points = max(max_points, _MAX_POINTS_PER_CENTROID * (1 << config.pq_nbits))
+    else:
+        max_points = _MAX_SQ_TRAINING_VECTORS
+
+    if len(vectors) <= max_points:
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(vectors), size=max_points, replace=False)
+    return np.ascontiguousarray(vectors[np.sort(sample)], dtype=np.float32)
+
+
+def evaluate_index_types(
+    config: IndexConfig,
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    index_types: Sequence[IndexType]
+) -> List[Dict]:
+    """저장된 벡터 표본으로 인덱스 유형별 메모리 사용량과 recall@k 측정
+
+    정답은 float32 전수 비교(Flat) 결과이며, 양자화 인덱스는 rerank_factor배 후보를
+    원본 벡터로 재채점한 recall도 함께 보고한다.
+    """
+    ids = np.arange(len(vectors), dtype=np.int64)
+    flat_index = build_index(replace(config, index_type=IndexType.FLAT), vectors.shape[1], vectors, ids)
+    _, truth = flat_index.search(queries, k)
+    baseline_bytes = vectors.nbytes
+
+    report = []
+    for index_type in index_types:
+        type_config = replace(config, index_type=index_type)
+        index = build_index(type_config, vectors.shape[1], vectors, ids)
+        built_type = detect_index_type(index)
+        index_bytes = len(faiss.serialize_index(index))
+
+        _, found = index.search(queries, k)
+        entry = {
+            "index_type": built_type.value,
+            "index_bytes": index_bytes,
+            "bytes_per_vector": index_bytes / max(len(vectors), 1),
+            "memory_saved_ratio": 1.0 - index_bytes / max(baseline_bytes, 1),
+            f"recall_at_{k}": _recall(found, truth),
+        }
+
+        if built_type.is_quantized and config.rerank_factor > 1:
+            _, candidates = index.search(queries, k * config.rerank_factor)
+            exact = np.einsum("qcd,qd->qc", vectors[np.maximum(candidates, 0)], queries)
+            exact[candidates < 0] = -np.inf
+            reranked = np.take_along_axis(candidates, np.argsort(-exact, axis=1)[:, :k], axis=1)
+            entry[f"recall_at_{k}_reranked"] = _recall(reranked, truth)
+
+        report.append(entry)
+    return report
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    """정답 상위 k개 중 찾아낸 비율"""
+    hits = sum(
+        len(set(row[row >= 0].tolist()) & set(expected.tolist()))
+        for row, expected in zip(found, truth)
+    )
+    return hits / max(truth.size, 1)
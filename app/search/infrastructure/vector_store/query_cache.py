@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 디스크 계층에 이만큼 기록할 때마다 만료·초과 항목 정리 (한도가 작으면 한도의 1/10마다)
+DISK_TRIM_INTERVAL = 1000
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키용 질의 정규화 (유니코드 NFKC, 공백 정리, 소문자화)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+
+class QueryEmbeddingCache:
+    """질의 임베딩 LRU + TTL 캐시
+
+    메모리 계층은 최대 항목 수로 크기를 제한하고 가장 오래 쓰이지 않은 항목부터 제거한다.
+    disk_path를 지정하면 SQLite 파일을 두 번째 계층으로 사용해 재시작 후에도 자주 묻는
+    질의는 임베딩 요청 없이 처리한다. 모델이나 차원이 바뀌면 키가 달라지도록 namespace를 키에 포함한다.
+    디스크 계층 조회·기록은 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400.0,
+        namespace: str = "",
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100000
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self.disk_max_entries = max(0, disk_max_entries)
+
+        # 키 -> (정규화된 벡터, 만료 시각)
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._disk: Optional[sqlite3.Connection] = None
+        # 스레드에서 함께 쓰는 SQLite 연결 보호
+        self._disk_lock = threading.Lock()
+        self._disk_puts = 0
+        if disk_path:
+            self._open_disk(disk_path)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def key(self, text: str, namespace: Optional[str] = None) -> str:
+        namespace = self.namespace if namespace is None else namespace
+        payload = f"{namespace}\0{normalize_query(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    async def get(self, text: str, namespace: Optional[str] = None) -> Optional[np.ndarray]:
+        """캐시된 질의 임베딩 (없거나 만료되면 None, namespace는 기본값과 다른 모델·차원용)"""
+        if not self.enabled:
+            return None
+
+        key = self.key(text, namespace)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            vector, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+            del self._entries[key]
+            self.expirations += 1
+
+        disk_entry = None
+        if self._disk is not None:
+            disk_entry = await asyncio.to_thread(self._disk_get, key, now)
+        if disk_entry is not None:
+            # 디스크 계층 적중은 남은 TTL 그대로 메모리 계층으로 승격
+            vector, expires_at = disk_entry
+            self._remember(key, vector, expires_at)
+            self.hits += 1
+            self.disk_hits += 1
+            return vector
+
+        self.misses += 1
+        return None
+
+    async def put(self, text: str, vector: np.ndarray, namespace: Optional[str] = None):
+        """질의 임베딩 저장"""
+        if not self.enabled:
+            return
+
+        key = self.key(text, namespace)
+        vector = np.array(vector, dtype=np.float32).reshape(-1)
+        vector.flags.writeable = False
+        now = time.time()
+
+        self._remember(key, vector, now + self.ttl_seconds)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk_put, key, vector, now)
+
+    def clear(self):
+        self._entries.clear()
+        if self._disk is not None:
+            with self._disk_lock, self._disk:
+                self._disk.execute("DELETE FROM query_embeddings")
+
+    def stats(self) -> Dict[str, float]:
+        """모니터링용 적중/미적중 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_bytes": sum(vector.nbytes for vector, _ in self._entries.values()),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_enabled": self._disk is not None
+        }
+
+    def _remember(self, key: str, vector: np.ndarray, expires_at: float):
+        self._entries[key] = (vector, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _open_disk(self, disk_path: str):
+        """디스크 계층 열기 (만료·초과 항목 정리)"""
+        directory = os.path.dirname(disk_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+        # WAL 모드에서는 커밋마다 fsync하지 않아 검색 경로를 막지 않고, 여러 워커가 함께 읽을 수 있다
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute("PRAGMA synchronous=NORMAL")
+        with self._disk:
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+        self._disk_trim()
+
+    def _disk_trim(self):
+        """디스크 계층의 만료 항목과 disk_max_entries를 넘는 오래된 항목 삭제"""
+        with self._disk:
+            self._disk.execute(
+                "DELETE FROM query_embeddings WHERE created_at <= ?",
+                (time.time() - self.ttl_seconds,)
+            )
+            self._disk.execute(
+                "DELETE FROM query_embeddings WHERE key NOT IN ("
+                "SELECT key FROM query_embeddings ORDER BY created_at DESC LIMIT ?)",
+                (self.disk_max_entries,)
+            )
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[np.ndarray, float]]:
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT vector, created_at FROM query_embeddings WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None or row[1] + self.ttl_seconds <= now:
+            return None
+
+        return np.frombuffer(row[0], dtype=np.float32), row[1] + self.ttl_seconds
+
+    def _disk_put(self, key: str, vector: np.ndarray, now: float):
+        with self._disk_lock:
+            with self._disk:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                    (key, vector.tobytes(), now)
+                )
+
+            # 실행 중에도 디스크 계층이 한도를 넘어 커지지 않도록 주기적으로 정리
+            self._disk_puts += 1
+            if self._disk_puts % max(1, min(DISK_TRIM_INTERVAL, self.disk_max_entries // 10)) == 0:
+                self._disk_trim()
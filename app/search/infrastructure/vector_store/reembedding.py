@@ -0,0 +1,196 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+from dataclasses import replace
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 실행 잠금 없이 단일 프로세스로만 사용
+    fcntl = None
+
+from app.search.infrastructure.vector_store.segment_store import SegmentStore, StoreSnapshot
+
+# 저장소 디렉토리 안의 그림자 저장소·진행 상황·실행 잠금 (그림자 저장소를 지워도 진행 기록은 남는다)
+SHADOW_DIR = "reembedding"
+PROGRESS_FILE = "reembedding.json"
+RUNNER_LOCK_FILE = "reembedding.lock"
+
+
+class ReembeddingState(str, Enum):
+    """재임베딩 작업 상태"""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ReembeddingMigration:
+    """컬렉션 저장소를 새 임베딩 모델로 다시 임베딩해 그림자 저장소를 채운 뒤 전환하는 백그라운드 작업
+
+    - 살아있는 청크를 batch_size개씩 새 모델로 임베딩해 같은 ID로 그림자 저장소에 기록하고,
+      배치 사이마다 batch_interval초 쉬어 임베딩 API와 검색 부하를 제한한다.
+    - 진행 상황은 그림자 저장소 자체(이미 기록된 ID)이므로 재시작 후에는 남은 청크만 이어서 처리한다.
+    - 그동안 원래 저장소는 이전 모델로 검색·추가·삭제를 계속 처리하고, 그림자 저장소가 차이를
+      모두 따라잡으면 `SegmentStore.adopt`로 한 번의 버전 공개로 전환한다.
+    - 여러 워커 중 실행 잠금을 잡은 하나만 실행한다.
+    """
+
+    def __init__(
+        self,
+        store: SegmentStore,
+        target_model: str,
+        target_dimension: int,
+        embed: Callable[[List[str]], Awaitable[np.ndarray]],
+        run_sync: Callable[..., Awaitable],
+        batch_size: int = 256,
+        batch_interval: float = 0.1
+    ):
+        self.store = store
+        self.target_model = target_model
+        self.target_dimension = target_dimension
+        self.embed = embed
+        self.run_sync = run_sync
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = max(0.0, batch_interval)
+
+        self.shadow_path = os.path.join(store.path, SHADOW_DIR)
+        self.progress_path = os.path.join(store.path, PROGRESS_FILE)
+        self.progress: Dict = {
+            "state": ReembeddingState.RUNNING.value,
+            "source_model": store.snapshot.embedding_model,
+            "target_model": target_model,
+            "dimension": target_dimension,
+            "total": len(store.snapshot),
+            "migrated": 0,
+            "started_at": time.time(),
+            "updated_at": time.time(),
+            "finished_at": None,
+            "error": None
+        }
+
+    @staticmethod
+    def read_progress(store_path: str) -> Optional[Dict]:
+        """마지막으로 기록된 진행 상황 (다른 워커가 실행 중인 작업도 조회 가능)"""
+        path = os.path.join(store_path, PROGRESS_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def running(self) -> bool:
+        return self.progress["state"] == ReembeddingState.RUNNING.value
+
+    def _save_progress(self, **changes):
+        self.progress.update(changes, updated_at=time.time())
+        tmp_path = self.progress_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.progress, f, ensure_ascii=False)
+        os.replace(tmp_path, self.progress_path)
+
+    async def run(self):
+        """전환까지 실행 (다른 워커가 실행 중이면 바로 반환)"""
+        lock_file = open(os.path.join(self.store.path, RUNNER_LOCK_FILE), "a+")
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return
+
+            previous = self.read_progress(self.store.path)
+            if previous is not None and previous.get("target_model") == self.target_model:
+                # 재시작 후 이어서 실행할 때는 처음 시작한 시각을 유지
+                self.progress["started_at"] = previous.get("started_at", self.progress["started_at"])
+            self._save_progress()
+
+            await self._migrate()
+            self._save_progress(
+                state=ReembeddingState.COMPLETED.value,
+                migrated=self.progress["total"],
+                finished_at=time.time()
+            )
+
+        except Exception as e:
+            print(f"재임베딩 중 오류: {e}")
+            self._save_progress(state=ReembeddingState.FAILED.value, error=str(e), finished_at=time.time())
+
+        finally:
+            lock_file.close()
+
+    async def _migrate(self):
+        shadow = await self.run_sync(self._open_shadow)
+        try:
+            await self._catch_up(shadow)
+        finally:
+            shadow.close()
+
+        await self.run_sync(shutil.rmtree, self.shadow_path, True)
+
+    async def _catch_up(self, shadow: SegmentStore):
+        """그림자 저장소를 현재 저장소와 맞추고 전환될 때까지 반복"""
+        while True:
+            live = self.store.snapshot
+            if live.embedding_model == self.target_model and live.dimension == self.target_dimension:
+                # 이미 전환됨 (전환 직후 중단된 경우 포함)
+                break
+
+            missing, stale = await self.run_sync(self._diff, live, shadow.snapshot)
+            self._save_progress(total=len(live), migrated=len(live) - len(missing))
+            if len(stale):
+                # 그림자 저장소를 채우는 동안 삭제된 청크
+                await self.run_sync(shadow.delete, stale)
+            if not len(missing):
+                # 차이를 모두 따라잡았으면 전환 (그사이 새 커밋이 있었다면 다시 맞춘 뒤 재시도)
+                if await self.run_sync(self.store.adopt, shadow, live.version):
+                    break
+                continue
+
+            await self._copy(live, shadow, missing)
+
+    def _open_shadow(self) -> SegmentStore:
+        """그림자 저장소 열기 (다른 모델로 채우던 것이면 비우고 새로 시작)"""
+        previous = self.read_progress(self.store.path)
+        if previous is not None and (
+            previous.get("target_model") != self.target_model
+            or previous.get("dimension") != self.target_dimension
+        ):
+            shutil.rmtree(self.shadow_path, ignore_errors=True)
+
+        os.makedirs(self.shadow_path, exist_ok=True)
+        return SegmentStore(
+            self.shadow_path,
+            self.target_dimension,
+            self.store.index_config,
+            delta_max_rows=self.store.delta_max_rows,
+            max_segments=self.store.max_segments,
+            max_deleted_ratio=self.store.max_deleted_ratio,
+            snapshot_retention=1,
+            embedding_model=self.target_model
+        )
+
+    @staticmethod
+    def _diff(live: StoreSnapshot, shadow: StoreSnapshot) -> Tuple[np.ndarray, np.ndarray]:
+        """(그림자 저장소에 아직 없는 ID, 원래 저장소에서 삭제된 ID)"""
+        live_ids = live.live_ids()
+        shadow_ids = shadow.live_ids()
+        return live_ids[~np.isin(live_ids, shadow_ids)], shadow_ids[~np.isin(shadow_ids, live_ids)]
+
+    async def _copy(self, live: StoreSnapshot, shadow: SegmentStore, missing: np.ndarray):
+        """빠진 청크를 세그먼트 순서대로 배치 단위로 다시 임베딩해 그림자 저장소에 기록"""
+        for name, segment in live.segments.items():
+            positions = live.live_rows(name)
+            positions = positions[np.isin(segment.ids[positions], missing)]
+
+            for start in range(0, len(positions), self.batch_size):
+                rows = await self.run_sync(segment.rows, positions[start:start + self.batch_size])
+                vectors = await self.embed([text.decode("utf-8") for text in rows.texts])
+                await self.run_sync(shadow.append, replace(rows, vectors=vectors), self.target_model)
+
+                self._save_progress(migrated=self.progress["migrated"] + len(rows))
+                await asyncio.sleep(self.batch_interval)
@@ -0,0 +1,101 @@
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.search.infrastructure.vector_store.segment_store import StoreSnapshot
+
+
+@dataclass
+class _PendingSearch:
+    snapshot: StoreSnapshot
+    query: np.ndarray
+    k: int
+    future: asyncio.Future
+
+
+def _search_batch(
+    snapshot: StoreSnapshot,
+    queries: List[np.ndarray],
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """여러 질의 벡터를 하나의 행렬로 묶어 한 번에 검색 (실행기 스레드에서 실행)"""
+    return snapshot.search(np.vstack(queries), k)
+
+
+class SearchBatcher:
+    """동시에 들어온 검색을 모아 한 번의 index.search로 처리하는 마이크로 배처
+
+    첫 요청이 들어오면 window_seconds 동안(또는 max_batch_size개가 찰 때까지) 요청을 모은 뒤,
+    같은 스냅샷을 보는 요청끼리 다중 행 질의 행렬로 묶어 전용 실행기에서 검색한다.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_batch_size: int = 64,
+        window_seconds: float = 0.001
+    ):
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = max(0.0, window_seconds)
+
+        self._pending: List[_PendingSearch] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def search(
+        self,
+        snapshot: StoreSnapshot,
+        query: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 벡터 하나의 (1, k) 점수·ID"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_PendingSearch(snapshot, query.reshape(1, -1), k, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """모인 요청을 스냅샷별로 묶어 실행기에 제출"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        groups: Dict[int, List[_PendingSearch]] = {}
+        for item in pending:
+            if not item.future.done():
+                groups.setdefault(id(item.snapshot), []).append(item)
+
+        for group in groups.values():
+            asyncio.ensure_future(self._run_group(group))
+
+    async def _run_group(self, group: List[_PendingSearch]):
+        loop = asyncio.get_running_loop()
+        k = max(item.k for item in group)
+
+        try:
+            scores, ids = await loop.run_in_executor(
+                self.executor,
+                _search_batch,
+                group[0].snapshot,
+                [item.query for item in group],
+                k
+            )
+        except Exception as e:
+            for item in group:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for row, item in enumerate(group):
+            if not item.future.done():
+                item.future.set_result((scores[row:row + 1, :item.k], ids[row:row + 1, :item.k]))
@@ -0,0 +1,1555 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 파일 잠금 없이 단일 프로세스로만 사용
+    fcntl = None
+
+from app.search.domain.value_objects.search_filter import SearchFilter
+from app.search.infrastructure.vector_store.chunk_store import ChunkRows, ChunkStore, open_array, write_array
+from app.search.infrastructure.vector_store.dedup import read_signatures, write_signatures
+from app.search.infrastructure.vector_store.index_factory import (
+    IndexConfig,
+    apply_search_params,
+    build_index,
+    detect_index_type,
+    search_parameters,
+)
+from app.search.infrastructure.vector_store.sparse_index import (
+    BM25_B,
+    BM25_K1,
+    SegmentPostings,
+    bm25_idf,
+    has_postings,
+    tokenize,
+    write_postings,
+)
+
+MANIFEST_FILE = "manifest.json"
+# 여러 워커 프로세스가 같은 저장소에 쓸 때 쓰기를 직렬화하는 잠금 파일
+LOCK_FILE = "store.lock"
+SEGMENTS_DIR = "segments"
+INDEXES_DIR = "indexes"
+# 버전별 매니페스트 기록 (목록 조회·롤백용, 보존 개수를 넘으면 오래된 것부터 정리)
+SNAPSHOTS_DIR = "snapshots"
+SEGMENT_PREFIX = "seg-"
+INDEX_PREFIX = "index-"
+SNAPSHOT_PREFIX = "manifest-"
+TMP_SUFFIX = ".tmp"
+# 기준 인덱스 파일 옆에 두는, 인덱스에 들어간 청크 ID 정렬 목록
+INDEX_IDS_SUFFIX = ".ids"
+
+# 세대 디렉토리(gen-NNNNNN) 형식의 인덱스 파일
+LEGACY_GENERATION_INDEX_FILE = "index.faiss"
+
+class EmbeddingModelMismatch(ValueError):
+    """저장소의 현재 임베딩 모델과 다른 모델로 만든 벡터를 기록하려 할 때"""
+
+
+# 필터에 맞는 행이 이 수 이하이면 인덱스 대신 해당 벡터만 직접 비교
+_BRUTE_FORCE_MAX_ROWS = 20000
+
+
+def _mmap_read_flags() -> int:
+    """인덱스를 복사 없이 메모리 매핑하는 읽기 플래그 (지원하지 않는 faiss 버전이면 0)"""
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    if mmap_flag is None:
+        return 0
+    return mmap_flag | faiss.IO_FLAG_READ_ONLY
+
+
+def _read_index(index_path: str) -> faiss.Index:
+    """메모리 매핑으로 인덱스 읽기 (매핑할 수 없으면 일반 읽기)
+
+    매핑된 인덱스는 읽기 전용이므로 절대 직접 수정하지 않는다.
+    """
+    flags = _mmap_read_flags()
+    if flags:
+        try:
+            return faiss.read_index(index_path, flags)
+        except RuntimeError:
+            pass
+    return faiss.read_index(index_path)
+
+
+def _fsync_dir(path: str):
+    """이름 변경이 디스크에 반영되도록 디렉토리 fsync"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_json(path: str, data: dict):
+    """임시 파일에 기록한 뒤 rename으로 교체 (중간에 중단되어도 이전 내용 유지)"""
+    tmp_path = path + TMP_SUFFIX
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def _checksum(paths: Iterable[str]) -> str:
+    """파일들의 내용을 순서대로 이어 계산한 SHA-256"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _segment_checksum(path: str) -> str:
+    """세그먼트 디렉토리의 모든 파일(이름순) 체크섬"""
+    return _checksum(os.path.join(path, name) for name in sorted(os.listdir(path)))
+
+
+def _empty_index(dimension: int) -> faiss.Index:
+    return faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+
+
+def _merge_top_k(
+    num_queries: int,
+    score_parts: List[np.ndarray],
+    id_parts: List[np.ndarray],
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """여러 부분 결과를 점수 순으로 병합한 상위 k개 (scores, ids)"""
+    if not score_parts:
+        empty = np.empty((num_queries, 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    scores = np.hstack(score_parts)
+    ids = np.hstack(id_parts)
+    scores[ids < 0] = -np.inf
+
+    order = np.argsort(-scores, axis=1)[:, :k]
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+
+def _adjust_source_counts(
+    source_segments: Dict[str, Dict[str, int]],
+    name: str,
+    counts: Dict[str, int]
+) -> Dict[str, Dict[str, int]]:
+    """출처 → 세그먼트별 청크 수 색인에 한 세그먼트의 증감을 반영한 새 색인 (0이 되면 제거)"""
+    updated = dict(source_segments)
+    for source, count in counts.items():
+        segment_counts = dict(updated.get(source, {}))
+        segment_counts[name] = segment_counts.get(name, 0) + count
+        if segment_counts[name] <= 0:
+            del segment_counts[name]
+        if segment_counts:
+            updated[source] = segment_counts
+        else:
+            updated.pop(source, None)
+    return updated
+
+
+def _in_base(ids: np.ndarray, base_ids: Optional[np.ndarray], base_max_id: int) -> np.ndarray:
+    """기준 인덱스에 들어 있는 ID 마스크 (ID 목록이 없는 이전 인덱스는 최대 ID로 판단)"""
+    ids = np.asarray(ids, dtype=np.int64)
+    if base_ids is None:
+        return ids <= base_max_id
+    if not len(base_ids):
+        return np.zeros(len(ids), dtype=bool)
+    positions = np.minimum(np.searchsorted(base_ids, ids), len(base_ids) - 1)
+    return base_ids[positions] == ids
+
+
+def _apply_aliases(ids: np.ndarray, aliases: Dict[int, int]) -> np.ndarray:
+    """검색 결과 ID 중 별칭이 있는 것을 바꾼 배열"""
+    if not aliases:
+        return ids
+    return np.array([[aliases.get(chunk_id, chunk_id) for chunk_id in row] for row in ids.tolist()], dtype=np.int64)
+
+
+def _bitmap_selector(ids: np.ndarray) -> Tuple[faiss.IDSelector, np.ndarray]:
+    """허용 ID 집합을 비트맵 선택자로 변환 (비트맵 배열도 함께 반환해 수명 유지)"""
+    bitmap = np.zeros((int(ids.max()) >> 3) + 1, dtype=np.uint8)
+    np.bitwise_or.at(bitmap, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+    # IDSelectorBitmap의 크기 인자는 비트가 아닌 바이트 수
+    return faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap)), bitmap
+
+
+class StoreSnapshot:
+    """매니페스트 한 버전의 불변 스냅샷
+
+    쓰기 작업은 스냅샷을 수정하지 않고 새 스냅샷을 만들어 참조를 교체한다.
+    검색은 시작할 때 잡은 스냅샷 하나로 인덱스와 청크 본문을 모두 읽으므로
+    잠금 없이도 반쯤 적용된 변경을 보지 않는다.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        embedding_model: Optional[str],
+        index_config: IndexConfig,
+        version: int,
+        segments: Dict[str, ChunkStore],
+        deleted: Dict[str, FrozenSet[int]],
+        index_file: Optional[str],
+        base_index: faiss.Index,
+        base_max_id: int,
+        base_ids: Optional[np.ndarray],
+        stale_ids: FrozenSet[int],
+        delta_indexes: Dict[str, faiss.Index],
+        postings: Dict[str, SegmentPostings],
+        source_segments: Dict[str, Dict[str, int]],
+        checksums: Dict[str, str]
+    ):
+        self.dimension = dimension
+        # 벡터를 만든 임베딩 모델 (질의도 같은 모델로 임베딩해야 한다)
+        self.embedding_model = embedding_model
+        self.index_config = index_config
+        self.version = version
+        self.segments = segments
+        self.deleted = deleted
+        self.index_file = index_file
+        self.base_index = base_index
+        self.base_max_id = base_max_id
+        # 기준 인덱스에 들어간 청크 ID (정렬, None이면 base_max_id 이하가 모두 들어 있는 이전 인덱스)
+        self.base_ids = base_ids
+        self.stale_ids = stale_ids
+        # 체크포인트 이후 추가된 세그먼트별 Flat 인덱스 (생성 후 수정하지 않음)
+        self.delta_indexes = delta_indexes
+        # 세그먼트별 BM25 역색인
+        self.postings = postings
+        # 출처 → {세그먼트: 살아있는 청크 수} (문서 단위 조회·삭제·목록용)
+        self.source_segments = source_segments
+        # 세그먼트 이름·기준 인덱스 파일 → SHA-256 (체크섬 도입 전 파일은 없음)
+        self.checksums = checksums
+
+        # 기준 인덱스의 삭제 ID와 증분 세그먼트의 삭제 ID를 검색에서 제외
+        excluded = set(stale_ids)
+        for name in delta_indexes:
+            excluded.update(deleted[name])
+        if excluded:
+            # 선택자가 참조하는 객체가 해제되지 않도록 함께 보관
+            self._excluded_batch = faiss.IDSelectorBatch(np.array(sorted(excluded), dtype=np.int64))
+            self._excluded_selector = faiss.IDSelectorNot(self._excluded_batch)
+        else:
+            self._excluded_batch = None
+            self._excluded_selector = None
+
+        self._live_count = sum(len(store) - len(deleted[name]) for name, store in segments.items())
+        # 손실 압축 기준 인덱스는 후보를 더 가져와 세그먼트의 원본 float32 벡터로 재채점
+        self._rerank_factor = (
+            index_config.rerank_factor
+            if detect_index_type(base_index).is_quantized and index_config.rerank_factor > 1
+            else 1
+        )
+
+    def replace(self, **changes) -> "StoreSnapshot":
+        """일부 값만 바꾼 새 스냅샷"""
+        fields = {
+            "dimension": self.dimension,
+            "embedding_model": self.embedding_model,
+            "index_config": self.index_config,
+            "version": self.version,
+            "segments": self.segments,
+            "deleted": self.deleted,
+            "index_file": self.index_file,
+            "base_index": self.base_index,
+            "base_max_id": self.base_max_id,
+            "base_ids": self.base_ids,
+            "stale_ids": self.stale_ids,
+            "delta_indexes": self.delta_indexes,
+            "postings": self.postings,
+            "source_segments": self.source_segments,
+            "checksums": self.checksums,
+        }
+        fields.update(changes)
+        return StoreSnapshot(**fields)
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    @property
+    def ntotal(self) -> int:
+        """검색 가능한 벡터 수"""
+        return self._live_count
+
+    @property
+    def delta_rows(self) -> int:
+        return sum(index.ntotal for index in self.delta_indexes.values())
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """기준·증분 인덱스를 함께 검색해 점수 순으로 병합한 (scores, ids)"""
+        return self._search_indexes(queries, k, self._excluded_selector)
+
+    def search_filtered(
+        self,
+        queries: np.ndarray,
+        k: int,
+        search_filter: SearchFilter
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """필터에 맞는 청크만 대상으로 검색
+
+        맞는 행이 적으면 해당 벡터만 직접 내적으로 비교하고(정확한 결과),
+        많으면 허용 ID 비트맵을 FAISS 선택자로 넘겨 인덱스에서 검색한다.
+        """
+        # 두 경로 모두 중복 청크 행 대신 대표 청크 행을 비교하고 결과 ID를 중복 청크로 되돌린다
+        matched, aliases = self._resolve_duplicates(self._matching_rows(search_filter))
+        total = sum(len(positions) for _, _, positions in matched)
+        if total == 0:
+            return _merge_top_k(len(queries), [], [], k)
+
+        if total <= _BRUTE_FORCE_MAX_ROWS:
+            score_parts, id_parts = [], []
+            for _, store, positions in matched:
+                vectors = np.asarray(store.vectors[positions], dtype=np.float32)
+                score_parts.append(queries @ vectors.T)
+                id_parts.append(np.broadcast_to(
+                    np.asarray(store.ids[positions], dtype=np.int64),
+                    (len(queries), len(positions))
+                ))
+            scores, ids = _merge_top_k(len(queries), score_parts, id_parts, k)
+            return scores, _apply_aliases(ids, aliases)
+
+        # 허용 ID는 살아있는 청크만 포함하므로 삭제 목록 선택자는 필요 없다
+        allowed = np.concatenate([
+            np.asarray(store.ids[positions], dtype=np.int64) for _, store, positions in matched
+        ])
+        selector, _bitmap = _bitmap_selector(allowed)
+        scores, ids = self._search_indexes(queries, k, selector)
+        return scores, _apply_aliases(ids, aliases)
+
+    def sparse_search(
+        self,
+        query: str,
+        k: int,
+        search_filter: Optional[SearchFilter] = None,
+        required_terms: Sequence[str] = ()
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25 어휘 검색으로 점수 순 상위 k개 (1, k) (scores, ids)
+
+        required_terms가 있으면 그 용어를 모두 포함한 청크만 반환한다.
+        문서 수·평균 길이·문서 빈도는 삭제 행까지 포함한 세그먼트 전체 기준의 근사값이다.
+        """
+        query_terms = Counter(tokenize(query))
+        query_terms.update(term for term in required_terms if term not in query_terms)
+        matched = self._matching_rows(search_filter or SearchFilter())
+        aliases: Dict[int, int] = {}
+        if search_filter is not None:
+            matched, aliases = self._resolve_duplicates(matched)
+        if not query_terms or not matched:
+            return _merge_top_k(1, [], [], k)
+
+        num_docs = sum(len(store) for store in self.segments.values())
+        total_length = sum(postings.total_length for postings in self.postings.values())
+        average_length = max(total_length / num_docs, 1.0)
+
+        found = {
+            name: {term: postings.lookup(term) for term in query_terms}
+            for name, postings in self.postings.items()
+        }
+        idf = {
+            term: bm25_idf(num_docs, sum(
+                len(terms[term][0]) for terms in found.values() if terms[term] is not None
+            ))
+            for term in query_terms
+        }
+
+        score_parts, id_parts = [], []
+        for name, store, positions in matched:
+            doc_lengths = self.postings[name].doc_lengths
+            scores = np.zeros(len(store), dtype=np.float32)
+            for term, query_freq in query_terms.items():
+                if found[name][term] is None:
+                    continue
+                docs, freqs = found[name][term]
+                freqs = freqs.astype(np.float32)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[docs] / average_length)
+                scores[docs] += idf[term] * query_freq * freqs * (BM25_K1 + 1) / (freqs + norm)
+
+            for term in required_terms:
+                required = np.zeros(len(store), dtype=bool)
+                if found[name][term] is not None:
+                    required[found[name][term][0]] = True
+                scores[~required] = 0
+
+            positions = positions[scores[positions] > 0]
+            top = positions[np.argsort(-scores[positions], kind="stable")[:k]]
+            score_parts.append(scores[top].reshape(1, -1))
+            id_parts.append(np.asarray(store.ids[top], dtype=np.int64).reshape(1, -1))
+
+        scores, ids = _merge_top_k(1, score_parts, id_parts, k)
+        return scores, _apply_aliases(ids, aliases)
+
+    def _search_indexes(
+        self,
+        queries: np.ndarray,
+        k: int,
+        selector: Optional[faiss.IDSelector]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        score_parts, id_parts = [], []
+        fetch = k * self._rerank_factor
+
+        # IndexIDMap은 검색 중 파라미터의 선택자를 잠시 바꾸므로 검색마다 새 파라미터를 만든다
+        indexes = [self.base_index, *self.delta_indexes.values()]
+        for index in indexes:
+            if not index.ntotal:
+                continue
+            params = search_parameters(index, self.index_config, selector)
+            scores, ids = index.search(queries, min(fetch, index.ntotal), params=params)
+            score_parts.append(scores)
+            id_parts.append(ids)
+
+        if self._rerank_factor > 1 and score_parts:
+            _, candidates = _merge_top_k(len(queries), score_parts, id_parts, fetch)
+            return self._rerank(queries, candidates, k)
+        return _merge_top_k(len(queries), score_parts, id_parts, k)
+
+    def _rerank(self, queries: np.ndarray, candidates: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """후보 ID들을 메모리 매핑된 원본 벡터와의 정확한 내적으로 다시 정렬"""
+        flat_ids = candidates.ravel()
+        exact = np.full(flat_ids.shape, -np.inf, dtype=np.float32)
+        for store in self.segments.values():
+            if not len(store):
+                continue
+            positions = np.minimum(np.searchsorted(store.ids, flat_ids), len(store) - 1)
+            rows = np.flatnonzero((flat_ids >= 0) & (store.ids[positions] == flat_ids))
+            if not len(rows):
+                continue
+            vectors = np.asarray(store.vectors[positions[rows]], dtype=np.float32)
+            exact[rows] = np.einsum("ij,ij->i", vectors, queries[rows // candidates.shape[1]])
+
+        exact = exact.reshape(candidates.shape)
+        candidates = np.where(np.isfinite(exact), candidates, -1)
+        return _merge_top_k(len(queries), [exact], [candidates], k)
+
+    def _matching_rows(self, search_filter: SearchFilter) -> List[Tuple[str, ChunkStore, np.ndarray]]:
+        """필터에 맞는 살아있는 행을 세그먼트별 (이름, 저장소, 행 위치)로 반환"""
+        if search_filter.sources is None:
+            candidates = {name: self.live_rows(name) for name in self.segments}
+        else:
+            candidates = self._source_rows(
+                source for source in self.source_segments if search_filter.matches_source(source)
+            )
+
+        matched = []
+        for name, positions in candidates.items():
+            store = self.segments[name]
+            if search_filter.pages is not None and len(positions):
+                pages = np.fromiter(search_filter.pages, dtype=np.int32)
+                positions = positions[np.isin(store.pages[positions], pages)]
+
+            if len(positions):
+                matched.append((name, store, positions))
+        return matched
+
+    def _resolve_duplicates(
+        self,
+        matched: List[Tuple[str, ChunkStore, np.ndarray]]
+    ) -> Tuple[List[Tuple[str, ChunkStore, np.ndarray]], Dict[int, int]]:
+        """중복 청크 행을 대표 청크 행으로 바꾼 목록과 {대표 청크 ID: 필터에 맞은 중복 청크 ID}
+
+        중복 청크는 인덱스·역색인에 없으므로 대표 청크로 검색한 뒤 결과 ID를 중복 청크로 되돌린다.
+        """
+        parts: Dict[str, List[np.ndarray]] = {}
+        canonical_parts, duplicate_parts = [], []
+        for name, store, positions in matched:
+            if store.canonical_ids is None:
+                parts.setdefault(name, []).append(positions)
+                continue
+            canonical_ids = np.asarray(store.canonical_ids[positions], dtype=np.int64)
+            is_duplicate = canonical_ids >= 0
+            parts.setdefault(name, []).append(positions[~is_duplicate])
+            canonical_parts.append(canonical_ids[is_duplicate])
+            duplicate_parts.append(np.asarray(store.ids[positions[is_duplicate]], dtype=np.int64))
+        if not any(len(part) for part in canonical_parts):
+            return matched, {}
+
+        # 대표 청크가 이미 필터에 맞으면 그대로 두고, 아니면 대표 청크 행을 추가하고 별칭을 남긴다
+        matched_ids = np.concatenate([
+            np.asarray(self.segments[name].ids[np.concatenate(positions)], dtype=np.int64)
+            for name, positions in parts.items()
+        ])
+        canonical_ids, first = np.unique(np.concatenate(canonical_parts), return_index=True)
+        duplicate_ids = np.concatenate(duplicate_parts)[first]
+        outside = ~np.isin(canonical_ids, matched_ids)
+
+        aliases: Dict[int, int] = {}
+        for canonical_id, duplicate_id in zip(canonical_ids[outside].tolist(), duplicate_ids[outside].tolist()):
+            located = self._locate_segment(canonical_id)
+            if located is None:
+                continue
+            name, position = located
+            parts.setdefault(name, []).append(np.array([position], dtype=np.int64))
+            aliases[canonical_id] = duplicate_id
+
+        resolved = []
+        for name, positions in parts.items():
+            positions = np.unique(np.concatenate(positions))
+            if len(positions):
+                resolved.append((name, self.segments[name], positions))
+        return resolved, aliases
+
+    def _source_rows(self, sources: Iterable[str]) -> Dict[str, np.ndarray]:
+        """출처들에 속한 살아있는 행 위치를 세그먼트별로 반환 (해당 청크 수에 비례)"""
+        parts: Dict[str, List[np.ndarray]] = {}
+        for source in sources:
+            for name in self.source_segments.get(source, {}):
+                parts.setdefault(name, []).append(self.segments[name].positions_for_source(source))
+
+        rows = {}
+        for name, positions in parts.items():
+            positions = np.sort(np.concatenate(positions))
+            if self.deleted[name]:
+                store = self.segments[name]
+                positions = positions[~np.isin(store.ids[positions], list(self.deleted[name]))]
+            rows[name] = positions
+        return rows
+
+    def locate(self, chunk_id: int) -> Optional[Tuple[ChunkStore, int]]:
+        """청크 ID가 있는 세그먼트와 행 위치 (삭제되었으면 None)"""
+        located = self._locate_segment(chunk_id)
+        if located is None:
+            return None
+        name, position = located
+        return self.segments[name], position
+
+    def _locate_segment(self, chunk_id: int) -> Optional[Tuple[str, int]]:
+        """청크 ID가 있는 세그먼트 이름과 행 위치 (삭제되었으면 None)"""
+        for name, store in self.segments.items():
+            if not len(store) or chunk_id < store.ids[0] or chunk_id > store.ids[-1]:
+                continue
+            position = store.position_of(chunk_id)
+            if position is not None:
+                return None if chunk_id in self.deleted[name] else (name, position)
+        return None
+
+    def content(self, chunk_id: int) -> Optional[str]:
+        """청크 본문 (없으면 None)"""
+        located = self.locate(chunk_id)
+        if located is None:
+            return None
+        store, position = located
+        return store.content(position)
+
+    def sources(self) -> List[str]:
+        """살아있는 청크가 있는 출처 목록"""
+        return list(self.source_segments)
+
+    def ids_for_sources(self, sources: Iterable[str]) -> np.ndarray:
+        """출처들에 속한 살아있는 청크 ID"""
+        matched = [
+            np.asarray(self.segments[name].ids[positions], dtype=np.int64)
+            for name, positions in self._source_rows(sources).items()
+        ]
+        return np.concatenate(matched) if matched else np.empty(0, dtype=np.int64)
+
+    def chunks_for_source(self, source: str) -> List[Tuple[int, bytes, int]]:
+        """출처에 속한 살아있는 청크의 (ID, 본문, 페이지)"""
+        chunks = []
+        for name, positions in self._source_rows([source]).items():
+            store = self.segments[name]
+            chunks.extend(
+                (int(store.ids[position]), store.text_bytes(position), int(store.pages[position]))
+                for position in positions.tolist()
+            )
+        return chunks
+
+    def ids_with_key_prefix(self, source: str, prefix: bytes) -> np.ndarray:
+        """출처에 속한 살아있는 청크 중 청크 키가 prefix로 시작하는 청크 ID"""
+        ids = []
+        for name, positions in self._source_rows([source]).items():
+            store = self.segments[name]
+            ids.extend(
+                int(store.ids[position]) for position in positions.tolist()
+                if store.chunk_key_bytes(position).startswith(prefix)
+            )
+        return np.array(ids, dtype=np.int64)
+
+    def live_ids(self) -> np.ndarray:
+        """살아있는 모든 청크 ID"""
+        parts = [np.empty(0, dtype=np.int64)]
+        for name, store in self.segments.items():
+            parts.append(np.asarray(store.ids[self.live_rows(name)], dtype=np.int64))
+        return np.concatenate(parts)
+
+    def live_rows(self, name: str) -> np.ndarray:
+        """세그먼트에서 삭제되지 않은 행 위치"""
+        store = self.segments[name]
+        if not self.deleted[name]:
+            return np.arange(len(store))
+        return np.flatnonzero(~np.isin(store.ids, list(self.deleted[name])))
+
+    def sample_vectors(self, size: int, seed: int = 0) -> np.ndarray:
+        """살아있는 청크 벡터 중 무작위 표본 (전체를 메모리에 올리지 않음)"""
+        live = [(store, self.live_rows(name)) for name, store in self.segments.items()]
+        total = sum(len(positions) for _, positions in live)
+        picks = np.sort(np.random.default_rng(seed).choice(total, size=min(size, total), replace=False))
+
+        parts = [np.empty((0, self.dimension), dtype=np.float32)]
+        start = 0
+        for store, positions in live:
+            selected = picks[(picks >= start) & (picks < start + len(positions))] - start
+            parts.append(np.asarray(store.vectors[positions[selected]], dtype=np.float32))
+            start += len(positions)
+        return np.vstack(parts)
+
+    def live_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """인덱스에 넣을 살아있는 대표 청크의 (벡터, ID) (중복 청크는 대표 청크로 검색된다)"""
+        vector_parts = [np.empty((0, self.dimension), dtype=np.float32)]
+        id_parts = [np.empty(0, dtype=np.int64)]
+        for name, store in self.segments.items():
+            positions = self.live_rows(name)
+            positions = positions[store.canonical_mask()[positions]]
+            vector_parts.append(np.asarray(store.vectors[positions], dtype=np.float32))
+            id_parts.append(np.asarray(store.ids[positions], dtype=np.int64))
+        return np.vstack(vector_parts), np.concatenate(id_parts)
+
+
+class SegmentStore:
+    """세그먼트 단위 append-only 청크 저장소
+
+    - 업로드마다 새 세그먼트 디렉토리(불변)를 기록하고 매니페스트만 원자적으로 교체한다.
+    - 기준 인덱스(base)는 체크포인트 시점의 모든 청크를 담고 메모리 매핑으로 읽는다.
+      이후 추가된 청크는 세그먼트별 Flat 증분 인덱스(delta)에 있고, 로드 시 세그먼트 벡터로 재구성된다.
+    - 삭제는 매니페스트의 삭제 목록(tombstone)으로 기록하고, 검색에서는 ID 선택자로 제외한다.
+    - 세그먼트마다 본문의 BM25 역색인을 함께 기록하므로 어휘 검색도 추가·삭제·병합을 그대로 따른다.
+    - 중복 청크는 대표 청크 ID를 가리키는 행으로 기록하고 인덱스·역색인에 넣지 않는다.
+      대표 청크가 삭제되면 남은 중복 청크를 새 ID로 다시 기록해 대표 청크로 승격한다.
+    - 증분 인덱스나 삭제 비율이 임계치를 넘으면 기준 인덱스를 다시 만들고 세그먼트를 병합한다.
+    - 쓰기는 잠금으로 직렬화하고 커밋마다 새 스냅샷을 공개하며, 읽기는 `snapshot`만 참조한다.
+    - 여러 워커 프로세스는 파일 잠금으로 쓰기를 직렬화하고, 매니페스트 버전이 오르면 `refresh`로
+      새 세그먼트만 열어 스냅샷을 교체한다.
+    - 커밋마다 체크섬이 담긴 매니페스트를 버전별로 보존하고, 보존된 버전이 참조하는 파일은 지우지 않으므로
+      재임베딩 없이 이전 버전으로 롤백할 수 있다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dimension: int,
+        index_config: IndexConfig,
+        delta_max_rows: int = 10000,
+        max_segments: int = 32,
+        max_deleted_ratio: float = 0.3,
+        snapshot_retention: int = 10,
+        embedding_model: Optional[str] = None
+    ):
+        self.path = path
+        # 매니페스트에 기록이 없을 때(새 저장소·이전 형식) 사용하는 차원과 임베딩 모델
+        self.default_dimension = dimension
+        self.default_embedding_model = embedding_model
+        self.index_config = index_config
+        self.delta_max_rows = max(1, delta_max_rows)
+        self.max_segments = max(2, max_segments)
+        self.max_deleted_ratio = max_deleted_ratio
+        self.snapshot_retention = max(1, snapshot_retention)
+
+        self.manifest_path = os.path.join(path, MANIFEST_FILE)
+        self.segments_path = os.path.join(path, SEGMENTS_DIR)
+        self.indexes_path = os.path.join(path, INDEXES_DIR)
+        self.snapshots_path = os.path.join(path, SNAPSHOTS_DIR)
+
+        os.makedirs(self.segments_path, exist_ok=True)
+        os.makedirs(self.indexes_path, exist_ok=True)
+        os.makedirs(self.snapshots_path, exist_ok=True)
+
+        self._write_lock = threading.RLock()
+        self._lock_file = open(os.path.join(path, LOCK_FILE), "a+")
+        self._lock_depth = 0
+        self._manifest_stat: Optional[Tuple[int, int, int]] = None
+        self._index_file_bytes: Tuple[Optional[str], int] = (None, 0)
+        self._load()
+
+    # ------------------------------------------------------------------ 로드
+
+    def _load(self):
+        """매니페스트를 읽어 세그먼트와 인덱스를 연다"""
+        # 이전 형식 변환·빈 매니페스트 생성·잔여물 정리는 다른 워커의 쓰기와 겹치지 않도록 배타 잠금 안에서
+        with self._write_lock, self._process_lock(exclusive=True):
+            manifest = self._read_manifest()
+            if manifest is not None and "generation" in manifest:
+                manifest = self._migrate_generation_layout(manifest)
+            if manifest is None:
+                manifest = {
+                    "version": 0,
+                    "next_id": 0,
+                    "dimension": self.default_dimension,
+                    "embedding_model": self.default_embedding_model,
+                    "segments": [],
+                    "index": None
+                }
+                _atomic_write_json(self.manifest_path, manifest)
+
+            self.next_id = manifest["next_id"]
+            self.snapshot = self._snapshot_from_manifest(manifest)
+            self._manifest_stat = self._stat_manifest()
+            # 기록 도입 전 저장소도 현재 버전부터 롤백 대상이 되도록
+            if not os.path.exists(self._snapshot_record_path(manifest["version"])):
+                _atomic_write_json(self._snapshot_record_path(manifest["version"]), manifest)
+            self._remove_orphans()
+
+    def _snapshot_from_manifest(
+        self,
+        manifest: dict,
+        previous: Optional[StoreSnapshot] = None
+    ) -> StoreSnapshot:
+        """매니페스트로 스냅샷 구성 (previous에 이미 열린 세그먼트·인덱스는 다시 열지 않음)"""
+        # 벡터 차원은 저장소마다 매니페스트를 따른다 (재임베딩 전환 후 달라질 수 있음)
+        dimension = manifest.get("dimension", self.default_dimension)
+        segments: Dict[str, ChunkStore] = {}
+        deleted: Dict[str, FrozenSet[int]] = {}
+        postings: Dict[str, SegmentPostings] = {}
+        checksums: Dict[str, str] = {}
+        for segment in manifest["segments"]:
+            name = segment["name"]
+            if segment.get("sha256"):
+                checksums[name] = segment["sha256"]
+            if previous is not None and name in previous.segments:
+                segments[name], postings[name] = previous.segments[name], previous.postings[name]
+            else:
+                segments[name], postings[name] = self._open_segment(name, dimension)
+            deleted[name] = frozenset(segment["deleted"])
+
+        index_info = manifest["index"]
+        if index_info is None:
+            index_file = None
+            base_index = _empty_index(dimension)
+            base_max_id = -1
+            base_ids = np.empty(0, dtype=np.int64)
+            stale_ids = frozenset()
+        else:
+            index_file = index_info["file"]
+            if index_info.get("sha256"):
+                checksums[index_file] = index_info["sha256"]
+            if previous is not None and previous.index_file == index_file:
+                base_index, base_ids = previous.base_index, previous.base_ids
+            else:
+                base_index, base_ids = self._open_base_index(index_file), self._open_base_ids(index_file)
+            base_max_id = index_info["max_id"]
+            stale_ids = frozenset(index_info["stale_ids"])
+
+        # 기준 인덱스가 같으면 기존 세그먼트의 증분 인덱스는 그대로 쓰고 (삭제는 선택자로 제외)
+        # 새 세그먼트의 증분 인덱스만 만든다. 증분 인덱스는 만들 때 삭제돼 있던 청크를 빼고 만들므로
+        # 롤백처럼 삭제 목록이 줄어든 세그먼트는 되살아난 청크가 들어가도록 다시 만든다
+        delta_indexes: Dict[str, faiss.Index] = {}
+        new_segments = segments
+        if previous is not None and previous.index_file == index_file and previous.base_max_id == base_max_id:
+            reusable = {
+                name for name in segments
+                if name in previous.segments and deleted[name] >= previous.deleted[name]
+            }
+            delta_indexes = {
+                name: index for name, index in previous.delta_indexes.items() if name in reusable
+            }
+            new_segments = {name: store for name, store in segments.items() if name not in reusable}
+        delta_indexes.update(self._delta_indexes(new_segments, deleted, base_max_id, base_ids, dimension))
+
+        return StoreSnapshot(
+            dimension=dimension,
+            embedding_model=manifest.get("embedding_model", self.default_embedding_model),
+            index_config=self.index_config,
+            version=manifest["version"],
+            segments=segments,
+            deleted=deleted,
+            index_file=index_file,
+            base_index=base_index,
+            base_max_id=base_max_id,
+            base_ids=base_ids,
+            stale_ids=stale_ids,
+            delta_indexes=delta_indexes,
+            postings=postings,
+            source_segments=manifest.get("sources") or self._count_sources(segments, deleted),
+            checksums=checksums
+        )
+
+    def _open_base_index(self, index_file: str) -> faiss.Index:
+        """기준 인덱스를 매핑해 열고 파일 크기를 기록 (다른 워커가 파일을 지운 뒤에도 메모리 추정에 사용)"""
+        index_path = os.path.join(self.indexes_path, index_file)
+        base_index = _read_index(index_path)
+        apply_search_params(base_index, self.index_config)
+        self._index_file_bytes = (index_file, os.path.getsize(index_path))
+        return base_index
+
+    def _open_base_ids(self, index_file: str) -> Optional[np.ndarray]:
+        """기준 인덱스에 들어간 청크 ID 목록 (목록을 기록하기 전에 만든 인덱스는 None)"""
+        path = os.path.join(self.indexes_path, index_file + INDEX_IDS_SUFFIX)
+        return open_array(path, np.int64) if os.path.exists(path) else None
+
+    def _open_segment(self, name: str, dimension: int) -> Tuple[ChunkStore, SegmentPostings]:
+        """세그먼트 열 파일과 역색인 열기 (역색인이 없던 이전 세그먼트는 본문으로 생성)"""
+        path = os.path.join(self.segments_path, name)
+        if not ChunkStore.has_source_index(path):
+            ChunkStore.index_sources(path)
+        store = ChunkStore(path, dimension)
+        if not has_postings(path):
+            write_postings(path, [store.text_bytes(position) for position in range(len(store))])
+        return store, SegmentPostings(path)
+
+    def _read_manifest(self) -> Optional[dict]:
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _migrate_generation_layout(self, manifest: dict) -> dict:
+        """세대 디렉토리(gen-NNNNNN) 형식을 세그먼트 형식으로 변환 (파일 이동만 수행)"""
+        generation_path = os.path.join(self.path, manifest["generation"])
+        segment_name = f"{SEGMENT_PREFIX}000000"
+        index_name = f"{INDEX_PREFIX}000000.faiss"
+
+        segment_path = os.path.join(self.segments_path, segment_name)
+        index_path = os.path.join(self.indexes_path, index_name)
+        shutil.rmtree(segment_path, ignore_errors=True)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+        # 하드링크로 옮긴 뒤 매니페스트를 교체하므로 중간에 중단되어도 기존 세대는 그대로 남는다
+        ChunkStore.link(generation_path, segment_path)
+        ChunkStore.index_sources(segment_path)
+        os.link(os.path.join(generation_path, LEGACY_GENERATION_INDEX_FILE), index_path)
+
+        store = ChunkStore(segment_path, self.default_dimension)
+        migrated = {
+            "version": 0,
+            "next_id": manifest["next_id"],
+            "segments": [{"name": segment_name, "deleted": []}] if len(store) else [],
+            "index": {"file": index_name, "max_id": manifest["next_id"] - 1, "stale_ids": []}
+        }
+        _atomic_write_json(self.manifest_path, migrated)
+        shutil.rmtree(generation_path, ignore_errors=True)
+        return migrated
+
+    @staticmethod
+    def _count_sources(
+        segments: Dict[str, ChunkStore],
+        deleted: Dict[str, FrozenSet[int]]
+    ) -> Dict[str, Dict[str, int]]:
+        """세그먼트를 훑어 출처 → 세그먼트별 청크 수 색인 생성 (색인이 없던 매니페스트용)"""
+        source_segments: Dict[str, Dict[str, int]] = {}
+        for name, store in segments.items():
+            positions = None
+            if deleted[name]:
+                positions = np.flatnonzero(~np.isin(store.ids, list(deleted[name])))
+            source_segments = _adjust_source_counts(source_segments, name, store.source_counts(positions))
+        return source_segments
+
+    def _delta_indexes(
+        self,
+        segments: Dict[str, ChunkStore],
+        deleted: Dict[str, FrozenSet[int]],
+        base_max_id: int,
+        base_ids: Optional[np.ndarray],
+        dimension: int
+    ) -> Dict[str, faiss.Index]:
+        """기준 인덱스에 없는 청크로 세그먼트별 증분 인덱스 구성 (임베딩 호출 없음)
+
+        재임베딩처럼 ID를 지정해 추가하면 체크포인트 이후에도 기준 인덱스의 최대 ID보다 작은 ID가
+        들어올 수 있으므로, 최대 ID가 아니라 기준 인덱스의 ID 목록으로 판단한다.
+        """
+        delta_indexes = {}
+        for name, store in segments.items():
+            mask = ~_in_base(store.ids, base_ids, base_max_id) & store.canonical_mask()
+            if deleted[name]:
+                mask &= ~np.isin(store.ids, list(deleted[name]))
+            if mask.any():
+                delta_index = _empty_index(dimension)
+                delta_index.add_with_ids(
+                    np.ascontiguousarray(store.vectors[mask]),
+                    np.asarray(store.ids[mask], dtype=np.int64)
+                )
+                delta_indexes[name] = delta_index
+        return delta_indexes
+
+    def _remove_orphans(self):
+        """현재 버전과 보존된 버전 어디에서도 참조하지 않는 세그먼트·인덱스 파일 정리
+
+        중단된 쓰기의 잔여물과 보존 기간이 지난 버전의 파일이 대상이다.
+        이전 스냅샷으로 검색 중인 요청은 이미 매핑한 파일을 계속 읽을 수 있다.
+        """
+        snapshot = self.snapshot
+        segment_names = set(snapshot.segments)
+        index_files = {snapshot.index_file}
+        for manifest in self._snapshot_records().values():
+            segment_names.update(segment["name"] for segment in manifest["segments"])
+            if manifest["index"] is not None:
+                index_files.add(manifest["index"]["file"])
+
+        for name in os.listdir(self.segments_path):
+            if name not in segment_names:
+                shutil.rmtree(os.path.join(self.segments_path, name), ignore_errors=True)
+        for name in os.listdir(self.indexes_path):
+            if name not in index_files and name[:-len(INDEX_IDS_SUFFIX)] not in index_files:
+                os.remove(os.path.join(self.indexes_path, name))
+
+    # ------------------------------------------------------------------ 워커 간 동기화
+
+    @contextmanager
+    def _process_lock(self, exclusive: bool):
+        """워커 프로세스 사이의 파일 잠금 (쓰기 잠금 안에서 호출, 중첩 호출은 바깥 잠금을 그대로 사용)"""
+        if fcntl is None or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self):
+        """쓰기 구간: 배타 잠금을 잡고 다른 워커가 커밋한 최신 매니페스트부터 반영
+
+        버전·청크 ID·세그먼트 이름은 항상 디스크의 최신 매니페스트를 기준으로 매기므로
+        여러 워커가 번갈아 써도 버전은 단조 증가하고 서로의 커밋을 덮어쓰지 않는다.
+        """
+        with self._write_lock, self._process_lock(exclusive=True):
+            self._refresh_locked()
+            yield
+
+    def _stat_manifest(self) -> Optional[Tuple[int, int, int]]:
+        """매니페스트 교체 여부 판별용 (inode, 수정 시각, 크기)"""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def has_newer_version(self) -> bool:
+        """다른 워커가 매니페스트를 교체했는지 확인 (stat 한 번이므로 요청마다 호출해도 된다)"""
+        return self._stat_manifest() != self._manifest_stat
+
+    def refresh(self) -> bool:
+        """디스크에 더 새 버전이 있으면 새 세그먼트·인덱스만 열어 스냅샷 교체, 교체 여부 반환
+
+        다시 읽는 동안에도 검색은 이전 스냅샷으로 계속 진행된다.
+        """
+        if not self.has_newer_version():
+            return False
+        with self._write_lock, self._process_lock(exclusive=False):
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        manifest_stat = self._stat_manifest()
+        if manifest_stat == self._manifest_stat:
+            return False
+        manifest = self._read_manifest()
+        self._manifest_stat = manifest_stat
+        if manifest is None or manifest["version"] <= self.snapshot.version:
+            return False
+
+        self.next_id = max(self.next_id, manifest["next_id"])
+        self.snapshot = self._snapshot_from_manifest(manifest, previous=self.snapshot)
+        return True
+
+    # ------------------------------------------------------------------ 조회
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    @property
+    def dimension(self) -> int:
+        """현재 스냅샷의 벡터 차원"""
+        return self.snapshot.dimension
+
+    def close(self):
+        """파일 잠금을 닫고 스냅샷(메모리 매핑된 세그먼트·기준 인덱스) 참조를 놓는다
+
+        진행 중인 검색은 이미 잡은 스냅샷을 계속 사용하고, 그 참조가 사라지면 매핑이 해제된다.
+        """
+        with self._write_lock:
+            if self._lock_file.closed:
+                return
+            self._lock_file.close()
+            self.snapshot = None
+
+    def resident_bytes(self) -> int:
+        """검색에 상주하는 메모리 추정치 (기준 인덱스 파일 + 증분 인덱스 벡터)"""
+        snapshot = self.snapshot
+        index_file, index_bytes = self._index_file_bytes
+        if index_file != snapshot.index_file:
+            index_bytes = 0
+        return index_bytes + snapshot.delta_rows * self.dimension * 4
+
+    # ------------------------------------------------------------------ 쓰기
+
+    def append(
+        self,
+        rows: ChunkRows,
+        embedding_model: Optional[str] = None,
+        batch_refs: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """새 청크들을 하나의 세그먼트로 기록하고 커밋, 부여된 ID 반환 (기존 파일은 다시 쓰지 않음)
+
+        rows.ids가 None이면 쓰기 잠금 안에서 새 ID를 부여하므로 ID 순서와 커밋 순서가 일치한다.
+        embedding_model을 주면 임베딩하는 사이 재임베딩 전환(모델이나 차원 변경)이 일어났는지 확인한다.
+        batch_refs는 같은 묶음 안의 대표 청크 위치(-1이면 없음)로, 부여된 ID로 바꿔 중복 참조로 기록한다.
+        """
+        with self._writing():
+            if embedding_model is not None and (
+                embedding_model != self.snapshot.embedding_model or rows.vectors.shape[1] != self.snapshot.dimension
+            ):
+                raise EmbeddingModelMismatch(
+                    f"저장소 임베딩 모델이 {self.snapshot.embedding_model}({self.snapshot.dimension}차원)(으)로 "
+                    f"바뀌었습니다 (요청: {embedding_model}, {rows.vectors.shape[1]}차원)"
+                )
+            if rows.ids is None:
+                rows = replace(rows, ids=np.arange(self.next_id, self.next_id + len(rows), dtype=np.int64))
+            if not len(rows):
+                return rows.ids
+            self.next_id = max(self.next_id, int(rows.ids.max()) + 1)
+            if batch_refs is not None:
+                rows = replace(rows, canonical_ids=self._resolve_references(rows, batch_refs))
+
+            snapshot = self.snapshot
+            name, checksum = self._write_segment(rows)
+            store, postings = self._open_segment(name, self.dimension)
+            segments = {**snapshot.segments, name: store}
+            deleted = {**snapshot.deleted, name: frozenset()}
+
+            self._publish(
+                segments=segments,
+                deleted=deleted,
+                postings={**snapshot.postings, name: postings},
+                source_segments=_adjust_source_counts(
+                    snapshot.source_segments, name, store.source_counts()
+                ),
+                checksums={**snapshot.checksums, name: checksum},
+                delta_indexes={
+                    **snapshot.delta_indexes,
+                    **self._delta_indexes(
+                        {name: store}, deleted, snapshot.base_max_id, snapshot.base_ids, self.dimension
+                    )
+                }
+            )
+            self._maybe_compact()
+            return rows.ids
+
+    def _resolve_references(self, rows: ChunkRows, batch_refs: np.ndarray) -> np.ndarray:
+        """묶음 안 참조를 부여된 ID로 바꾸고, 그사이 삭제된 대표 청크를 가리키는 행은 대표 청크로 기록"""
+        canonical_ids = rows.canonical().copy()
+        batch_refs = np.asarray(batch_refs, dtype=np.int64)
+        in_batch = batch_refs >= 0
+        canonical_ids[in_batch] = rows.ids[batch_refs[in_batch]]
+
+        for position in np.flatnonzero((canonical_ids >= 0) & ~in_batch).tolist():
+            located = self.snapshot.locate(int(canonical_ids[position]))
+            if located is None or located[0].canonical_ids is not None and located[0].canonical_ids[located[1]] >= 0:
+                canonical_ids[position] = -1
+        return canonical_ids
+
+    def delete(self, ids: np.ndarray) -> int:
+        """청크 ID들을 삭제 목록에 기록하고 커밋, 삭제된 수 반환
+
+        삭제된 대표 청크를 가리키던 살아있는 중복 청크는 새 ID로 다시 기록해 대표 청크로 승격한다.
+        """
+        with self._writing():
+            snapshot = self.snapshot
+            ids = np.unique(np.asarray(ids, dtype=np.int64))
+            segments = dict(snapshot.segments)
+            deleted = dict(snapshot.deleted)
+            delta_indexes = dict(snapshot.delta_indexes)
+            postings = dict(snapshot.postings)
+            checksums = dict(snapshot.checksums)
+            source_segments = snapshot.source_segments
+
+            def tombstone(ids: np.ndarray) -> List[int]:
+                nonlocal source_segments
+                removed: List[int] = []
+                for name, store in list(segments.items()):
+                    segment_ids = [
+                        chunk_id for chunk_id in ids[np.isin(ids, store.ids)].tolist()
+                        if chunk_id not in deleted[name]
+                    ]
+                    if not segment_ids:
+                        continue
+
+                    removed.extend(segment_ids)
+                    deleted[name] = deleted[name] | frozenset(segment_ids)
+                    positions = np.searchsorted(store.ids, segment_ids)
+                    source_segments = _adjust_source_counts(source_segments, name, {
+                        source: -count for source, count in store.source_counts(positions).items()
+                    })
+                    if len(deleted[name]) == len(store):
+                        # 세그먼트 전체가 삭제되면 목록에서 제거
+                        del segments[name]
+                        del deleted[name]
+                        del postings[name]
+                        delta_indexes.pop(name, None)
+                        checksums.pop(name, None)
+                return removed
+
+            removed = tombstone(ids)
+            if not removed:
+                return 0
+
+            promoted = self._promoted_rows(segments, deleted, np.array(removed, dtype=np.int64))
+            if promoted is not None:
+                replaced = promoted.ids
+                promoted = replace(promoted, ids=np.arange(self.next_id, self.next_id + len(promoted), dtype=np.int64))
+                promoted = replace(promoted, canonical_ids=self._regroup_promoted(promoted))
+                self.next_id += len(promoted)
+                # 재색인 대상이 아닌 중복 행이므로 기준 인덱스의 삭제 목록에는 넣지 않는다
+                tombstone(replaced)
+
+                name, checksums[name] = self._write_segment(promoted)
+                store, postings[name] = self._open_segment(name, self.dimension)
+                segments[name] = store
+                deleted[name] = frozenset()
+                delta_indexes.update(self._delta_indexes(
+                    {name: store}, deleted, snapshot.base_max_id, snapshot.base_ids, self.dimension
+                ))
+                source_segments = _adjust_source_counts(source_segments, name, store.source_counts())
+
+            removed_ids = np.array(removed, dtype=np.int64)
+            stale_ids = snapshot.stale_ids | frozenset(
+                removed_ids[_in_base(removed_ids, snapshot.base_ids, snapshot.base_max_id)].tolist()
+            )
+            self._publish(
+                segments=segments,
+                deleted=deleted,
+                stale_ids=stale_ids,
+                delta_indexes=delta_indexes,
+                postings=postings,
+                source_segments=source_segments,
+                checksums=checksums
+            )
+            self._remove_orphans()
+            self._maybe_compact()
+            return len(removed)
+
+    @staticmethod
+    def _promoted_rows(
+        segments: Dict[str, ChunkStore],
+        deleted: Dict[str, FrozenSet[int]],
+        removed: np.ndarray
+    ) -> Optional[ChunkRows]:
+        """삭제된 대표 청크를 가리키는 살아있는 중복 청크 행 (없으면 None)"""
+        promoted = None
+        for name, store in segments.items():
+            if store.canonical_ids is None:
+                continue
+            positions = np.flatnonzero(np.isin(store.canonical_ids, removed))
+            if deleted[name]:
+                positions = positions[~np.isin(store.ids[positions], list(deleted[name]))]
+            if len(positions):
+                rows = store.rows(positions)
+                promoted = rows if promoted is None else promoted.concat(rows)
+        return promoted
+
+    @staticmethod
+    def _regroup_promoted(rows: ChunkRows) -> np.ndarray:
+        """같은 대표 청크를 가리키던 행 중 첫 행을 새 대표 청크로, 나머지는 그 행을 가리키도록"""
+        canonical_ids = np.full(len(rows), -1, dtype=np.int64)
+        leaders: Dict[int, int] = {}
+        for position, previous in enumerate(rows.canonical().tolist()):
+            if previous in leaders:
+                canonical_ids[position] = leaders[previous]
+            else:
+                leaders[previous] = int(rows.ids[position])
+        return canonical_ids
+
+    def clear(self):
+        """모든 청크 삭제 (ID는 재사용하지 않음)"""
+        with self._writing():
+            self._publish(
+                segments={},
+                deleted={},
+                index_file=None,
+                base_index=_empty_index(self.dimension),
+                base_max_id=self.next_id - 1,
+                base_ids=np.empty(0, dtype=np.int64),
+                stale_ids=frozenset(),
+                delta_indexes={},
+                postings={},
+                source_segments={},
+                checksums={}
+            )
+            self._remove_orphans()
+
+    def needs_migration(self) -> bool:
+        """기준 인덱스가 설정된 유형과 다르고 전환이 가능한지 확인"""
+        snapshot = self.snapshot
+        return (
+            detect_index_type(snapshot.base_index) != self.index_config.index_type
+            and self.index_config.can_build(len(snapshot))
+        )
+
+    def checkpoint(self):
+        """살아있는 모든 벡터로 기준 인덱스를 다시 만들고 증분 인덱스를 비움"""
+        with self._writing():
+            snapshot = self.snapshot
+            vectors, ids = snapshot.live_vectors()
+            index = build_index(self.index_config, self.dimension, vectors, ids)
+
+            index_file = f"{INDEX_PREFIX}{snapshot.version + 1:06d}.faiss"
+            index_path = os.path.join(self.indexes_path, index_file)
+            # ID 목록을 먼저 확정하므로 공개된 인덱스에는 항상 목록이 있다
+            ids_path = index_path + INDEX_IDS_SUFFIX
+            write_array(ids_path + TMP_SUFFIX, np.sort(ids))
+            os.replace(ids_path + TMP_SUFFIX, ids_path)
+            faiss.write_index(index, index_path + TMP_SUFFIX)
+            checksum = _checksum([index_path + TMP_SUFFIX])
+            os.replace(index_path + TMP_SUFFIX, index_path)
+
+            base_index = self._open_base_index(index_file)
+            checksums = {name: value for name, value in snapshot.checksums.items() if name != snapshot.index_file}
+            self._publish(
+                index_config=self.index_config,
+                index_file=index_file,
+                base_index=base_index,
+                base_max_id=self.next_id - 1,
+                base_ids=self._open_base_ids(index_file),
+                stale_ids=frozenset(),
+                delta_indexes={},
+                checksums={**checksums, index_file: checksum}
+            )
+            # 이전 기준 인덱스는 보존된 버전이 참조하지 않게 되면 정리
+            self._remove_orphans()
+
+    def compact(self):
+        """삭제 비율이 높은 세그먼트를 다시 쓰고, 세그먼트가 많으면 작은 것부터 병합"""
+        with self._writing():
+            changed = False
+
+            for name, store in list(self.snapshot.segments.items()):
+                deleted_ratio = len(self.snapshot.deleted[name]) / len(store)
+                if deleted_ratio > self.max_deleted_ratio:
+                    self._replace_segments([name])
+                    changed = True
+
+            segments = self.snapshot.segments
+            if len(segments) > self.max_segments:
+                by_size = sorted(segments, key=lambda segment: len(segments[segment]))
+                merge_count = len(segments) - self.max_segments // 2 + 1
+                self._replace_segments(by_size[:merge_count])
+                changed = True
+
+            if changed:
+                self._remove_orphans()
+
+    def _maybe_compact(self):
+        """임계치를 넘으면 인덱스 체크포인트와 세그먼트 병합 수행"""
+        snapshot = self.snapshot
+        base_total = max(snapshot.base_index.ntotal, 1)
+        if (
+            snapshot.delta_rows > self.delta_max_rows
+            or len(snapshot.stale_ids) > self.max_deleted_ratio * base_total
+            or self.needs_migration()
+        ):
+            self.checkpoint()
+
+        self.compact()
+
+    def _replace_segments(self, names: List[str]):
+        """여러 세그먼트의 살아있는 행을 하나의 새 세그먼트로 다시 기록"""
+        snapshot = self.snapshot
+        rows = ChunkRows.empty(self.dimension)
+        signature_parts = []
+        for name in names:
+            positions = snapshot.live_rows(name)
+            rows = rows.concat(snapshot.segments[name].rows(positions))
+            signature_parts.append(np.asarray(read_signatures(snapshot.segments[name])[positions]))
+
+        order = np.argsort(rows.ids, kind="stable")
+        signatures = np.concatenate(signature_parts)[order] if signature_parts else None
+        rows = ChunkRows(
+            ids=rows.ids[order],
+            vectors=rows.vectors[order],
+            texts=[rows.texts[i] for i in order],
+            chunk_keys=[rows.chunk_keys[i] for i in order],
+            sources=[rows.sources[i] for i in order],
+            pages=[rows.pages[i] for i in order],
+            canonical_ids=None if rows.canonical_ids is None else rows.canonical_ids[order]
+        )
+
+        segments = {name: store for name, store in snapshot.segments.items() if name not in names}
+        deleted = {name: ids for name, ids in snapshot.deleted.items() if name not in names}
+        delta_indexes = {
+            name: index for name, index in snapshot.delta_indexes.items() if name not in names
+        }
+        postings = {name: index for name, index in snapshot.postings.items() if name not in names}
+        source_segments = {
+            source: {name: count for name, count in counts.items() if name not in names}
+            for source, counts in snapshot.source_segments.items()
+        }
+        source_segments = {source: counts for source, counts in source_segments.items() if counts}
+        checksums = {name: checksum for name, checksum in snapshot.checksums.items() if name not in names}
+        if len(rows):
+            new_name, checksums[new_name] = self._write_segment(rows, signatures)
+            store, postings[new_name] = self._open_segment(new_name, self.dimension)
+            segments[new_name] = store
+            deleted[new_name] = frozenset()
+            delta_indexes.update(self._delta_indexes(
+                {new_name: store}, deleted, snapshot.base_max_id, snapshot.base_ids, self.dimension
+            ))
+            source_segments = _adjust_source_counts(source_segments, new_name, store.source_counts())
+
+        self._publish(
+            segments=segments,
+            deleted=deleted,
+            delta_indexes=delta_indexes,
+            postings=postings,
+            source_segments=source_segments,
+            checksums=checksums
+        )
+
+    def _write_segment(self, rows: ChunkRows, signatures: Optional[np.ndarray] = None) -> Tuple[str, str]:
+        """임시 디렉토리에 세그먼트를 기록한 뒤 rename으로 확정, (이름, 체크섬) 반환"""
+        snapshot = self.snapshot
+        name = f"{SEGMENT_PREFIX}{snapshot.version + 1:06d}"
+        suffix = 0
+        while name in snapshot.segments:
+            suffix += 1
+            name = f"{SEGMENT_PREFIX}{snapshot.version + 1:06d}-{suffix}"
+
+        path = os.path.join(self.segments_path, name)
+        tmp_path = path + TMP_SUFFIX
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        shutil.rmtree(path, ignore_errors=True)
+
+        ChunkStore.write(tmp_path, self.dimension, rows)
+        # 중복 청크는 대표 청크로 검색되므로 역색인에서 뺀다
+        write_postings(tmp_path, [
+            b"" if canonical_id >= 0 else text for text, canonical_id in zip(rows.texts, rows.canonical().tolist())
+        ])
+        write_signatures(tmp_path, rows.texts, signatures)
+        checksum = _segment_checksum(tmp_path)
+        os.replace(tmp_path, path)
+        _fsync_dir(self.segments_path)
+        return name, checksum
+
+    def _publish(self, restored_from: Optional[int] = None, **changes) -> StoreSnapshot:
+        """변경을 반영한 새 버전의 매니페스트를 기록하고 포인터(manifest.json)를 원자적으로 교체한 뒤 스냅샷 교체"""
+        snapshot = self.snapshot.replace(version=self.snapshot.version + 1, **changes)
+        manifest = {
+            "version": snapshot.version,
+            "next_id": self.next_id,
+            "dimension": snapshot.dimension,
+            "embedding_model": snapshot.embedding_model,
+            "published_at": time.time(),
+            "segments": [
+                {
+                    "name": name,
+                    "deleted": sorted(snapshot.deleted[name]),
+                    "sha256": snapshot.checksums.get(name)
+                }
+                for name in snapshot.segments
+            ],
+            "index": None if snapshot.index_file is None else {
+                "file": snapshot.index_file,
+                "max_id": snapshot.base_max_id,
+                "stale_ids": sorted(snapshot.stale_ids),
+                "sha256": snapshot.checksums.get(snapshot.index_file)
+            },
+            "sources": snapshot.source_segments
+        }
+        if restored_from is not None:
+            manifest["restored_from"] = restored_from
+
+        # 버전 기록을 먼저 남기고 포인터를 교체하므로 공개된 버전은 항상 기록이 있다
+        _atomic_write_json(self._snapshot_record_path(snapshot.version), manifest)
+        _atomic_write_json(self.manifest_path, manifest)
+
+        # 참조 교체는 원자적이므로 읽기 쪽은 이전 또는 새 스냅샷 중 하나만 본다
+        self.snapshot = snapshot
+        self._manifest_stat = self._stat_manifest()
+        self._prune_snapshot_records(self.snapshot_retention)
+        return snapshot
+
+    # ------------------------------------------------------------------ 버전 기록
+
+    def _snapshot_record_path(self, version: int) -> str:
+        return os.path.join(self.snapshots_path, f"{SNAPSHOT_PREFIX}{version:06d}.json")
+
+    def _snapshot_records(self) -> Dict[int, dict]:
+        """보존된 버전 → 매니페스트"""
+        records = {}
+        for name in os.listdir(self.snapshots_path):
+            if not name.startswith(SNAPSHOT_PREFIX) or not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.snapshots_path, name), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            records[manifest["version"]] = manifest
+        return records
+
+    def _prune_snapshot_records(self, keep: int) -> int:
+        """최근 keep개(현재 버전 포함)를 넘는 버전 기록 삭제, 삭제한 수 반환 (파일은 _remove_orphans가 정리)"""
+        current = self.snapshot.version
+        versions = sorted(
+            int(name[len(SNAPSHOT_PREFIX):-len(".json")])
+            for name in os.listdir(self.snapshots_path)
+            if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".json")
+        )
+        expired = [version for version in versions[:-max(1, keep)] if version != current]
+        for version in expired:
+            os.remove(self._snapshot_record_path(version))
+        return len(expired)
+
+    def list_snapshots(self) -> List[Dict]:
+        """보존된 버전 목록 (최신순)"""
+        current = self.snapshot.version
+        snapshots = []
+        for version, manifest in sorted(self._snapshot_records().items(), reverse=True):
+            index_info = manifest["index"]
+            snapshots.append({
+                "version": version,
+                "current": version == current,
+                "published_at": manifest.get("published_at"),
+                "restored_from": manifest.get("restored_from"),
+                "segments": len(manifest["segments"]),
+                "chunks": sum(
+                    count for counts in manifest.get("sources", {}).values() for count in counts.values()
+                ),
+                "index_file": None if index_info is None else index_info["file"],
+                # 체크섬 도입 전에 기록된 파일이 있으면 롤백 시 내용 검증을 건너뛴다
+                "checksummed": all(segment.get("sha256") for segment in manifest["segments"])
+                and (index_info is None or bool(index_info.get("sha256")))
+            })
+        return snapshots
+
+    def _verify(self, manifest: dict):
+        """버전이 참조하는 파일이 모두 남아 있고 체크섬이 일치하는지 확인 (아니면 ValueError)"""
+        for segment in manifest["segments"]:
+            path = os.path.join(self.segments_path, segment["name"])
+            if not os.path.isdir(path):
+                raise ValueError(f"버전 {manifest['version']}의 세그먼트 파일이 없습니다: {segment['name']}")
+            if segment.get("sha256") and _segment_checksum(path) != segment["sha256"]:
+                raise ValueError(f"버전 {manifest['version']}의 세그먼트 체크섬이 일치하지 않습니다: {segment['name']}")
+
+        index_info = manifest["index"]
+        if index_info is not None:
+            path = os.path.join(self.indexes_path, index_info["file"])
+            if not os.path.exists(path):
+                raise ValueError(f"버전 {manifest['version']}의 인덱스 파일이 없습니다: {index_info['file']}")
+            if index_info.get("sha256") and _checksum([path]) != index_info["sha256"]:
+                raise ValueError(f"버전 {manifest['version']}의 인덱스 체크섬이 일치하지 않습니다: {index_info['file']}")
+
+    def rollback(self, version: int) -> int:
+        """보존된 버전의 상태를 새 버전으로 다시 공개하고 새 버전 반환 (재임베딩·재색인 없음)
+
+        버전 번호와 청크 ID는 계속 증가하므로 다른 워커는 일반 커밋처럼 새 스냅샷을 다시 읽는다.
+        """
+        with self._writing():
+            if version == self.snapshot.version:
+                return version
+            manifest = self._snapshot_records().get(version)
+            if manifest is None:
+                raise ValueError(f"보존된 버전이 아닙니다: {version}")
+            self._verify(manifest)
+
+            restored = self._snapshot_from_manifest(manifest, previous=self.snapshot)
+            return self._publish_state(restored, restored_from=version).version
+
+    def _publish_state(self, state: StoreSnapshot, restored_from: Optional[int] = None) -> StoreSnapshot:
+        """다른 매니페스트로 구성한 스냅샷의 상태 전체를 새 버전으로 공개"""
+        return self._publish(
+            restored_from=restored_from,
+            dimension=state.dimension,
+            embedding_model=state.embedding_model,
+            segments=state.segments,
+            deleted=state.deleted,
+            index_file=state.index_file,
+            base_index=state.base_index,
+            base_max_id=state.base_max_id,
+            base_ids=state.base_ids,
+            stale_ids=state.stale_ids,
+            delta_indexes=state.delta_indexes,
+            postings=state.postings,
+            source_segments=state.source_segments,
+            checksums=state.checksums
+        )
+
+    # ------------------------------------------------------------------ 재임베딩 전환
+
+    def adopt(self, shadow: "SegmentStore", expected_version: int) -> bool:
+        """다른 임베딩 모델로 채운 그림자 저장소의 내용을 새 버전으로 공개 (전환), 성공 여부 반환
+
+        그림자 저장소를 채우는 동안 이 저장소에 커밋이 있었다면(버전이 expected_version과 다르면)
+        전환하지 않고 False를 반환하므로 호출자는 차이를 다시 맞춘 뒤 재시도한다.
+        파일은 하드링크로 가져오므로 공개 전에 중단되어도 그림자 저장소는 그대로 남는다.
+        """
+        with self._writing():
+            if self.snapshot.version != expected_version:
+                return False
+
+            with shadow._writing():
+                source = shadow.snapshot
+                version = self.snapshot.version + 1
+                names = {
+                    name: f"{SEGMENT_PREFIX}{version:06d}-{position}"
+                    for position, name in enumerate(source.segments)
+                }
+                for name, new_name in names.items():
+                    target = os.path.join(self.segments_path, new_name)
+                    shutil.rmtree(target, ignore_errors=True)
+                    os.makedirs(target)
+                    segment_path = os.path.join(shadow.segments_path, name)
+                    for file_name in os.listdir(segment_path):
+                        os.link(os.path.join(segment_path, file_name), os.path.join(target, file_name))
+                _fsync_dir(self.segments_path)
+
+                index_info = None
+                if source.index_file is not None:
+                    index_file = f"{INDEX_PREFIX}{version:06d}.faiss"
+                    index_path = os.path.join(self.indexes_path, index_file)
+                    if os.path.exists(index_path):
+                        os.remove(index_path)
+                    os.link(os.path.join(shadow.indexes_path, source.index_file), index_path)
+                    ids_path = os.path.join(shadow.indexes_path, source.index_file + INDEX_IDS_SUFFIX)
+                    if os.path.exists(ids_path):
+                        if os.path.exists(index_path + INDEX_IDS_SUFFIX):
+                            os.remove(index_path + INDEX_IDS_SUFFIX)
+                        os.link(ids_path, index_path + INDEX_IDS_SUFFIX)
+                    _fsync_dir(self.indexes_path)
+                    index_info = {
+                        "file": index_file,
+                        "max_id": source.base_max_id,
+                        "stale_ids": sorted(source.stale_ids),
+                        "sha256": source.checksums.get(source.index_file)
+                    }
+
+                manifest = {
+                    "version": version,
+                    "dimension": source.dimension,
+                    "embedding_model": source.embedding_model,
+                    "segments": [
+                        {"name": new_name, "deleted": sorted(source.deleted[name]), "sha256": source.checksums.get(name)}
+                        for name, new_name in names.items()
+                    ],
+                    "index": index_info,
+                    "sources": {
+                        source_name: {names[name]: count for name, count in counts.items()}
+                        for source_name, counts in source.source_segments.items()
+                    }
+                }
+
+            self._publish_state(self._snapshot_from_manifest(manifest))
+            # 이전 모델의 파일은 보존된 버전이 참조하지 않게 되면 정리
+            self._remove_orphans()
+            return True
+
+    def gc_snapshots(self, keep: Optional[int] = None) -> int:
+        """최근 keep개(기본은 보존 설정값) 버전만 남기고 나머지 기록과 그 버전만 참조하던 파일 삭제"""
+        with self._writing():
+            removed = self._prune_snapshot_records(self.snapshot_retention if keep is None else keep)
+            self._remove_orphans()
+            return removed
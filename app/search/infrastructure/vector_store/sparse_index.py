@@ -0,0 +1,150 @@
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.search.infrastructure.vector_store.chunk_store import (
+    open_array,
+    open_blob,
+    write_array,
+    write_strings,
+)
+
+TERMS_FILE = "terms.bin"
+TERM_OFFSETS_FILE = "term_offsets.i64"
+POSTING_OFFSETS_FILE = "posting_offsets.i64"
+POSTING_DOCS_FILE = "posting_docs.i32"
+POSTING_FREQS_FILE = "posting_freqs.i32"
+# 마지막에 기록하므로 이 파일이 있으면 역색인이 완성된 것으로 본다
+DOC_LENGTHS_FILE = "doc_lengths.i32"
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+_SCRIPT_RUN_PATTERN = re.compile(r"[가-힣]+|[0-9]+|[a-z]+")
+# 조문 인용 (제750조, 제3조의2, 제1항, 제2호)
+_CITATION_PATTERN = re.compile(r"제\s*(\d+)\s*(조|항|호)(?:\s*의\s*(\d+))?")
+# 인용만으로 이루어진 질의 (예: "제750조", "민법 제750조 제1항")
+_CITATION_QUERY_PATTERN = re.compile(
+    r"^\s*(?:[가-힣]+(?:법|령|규칙)\s*)?"
+    r"(?:제\s*\d+\s*조(?:\s*의\s*\d+)?)"
+    r"(?:\s*제\s*\d+\s*(?:항|호))*\s*$"
+)
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def citation_tokens(text: str) -> List[str]:
+    """텍스트에 나온 조문 인용 토큰 (제750조, 제3조의2 등)"""
+    text = _normalize(text)
+    tokens = []
+    for number, unit, sub_number in _CITATION_PATTERN.findall(text):
+        token = f"제{number}{unit}"
+        tokens.append(token)
+        if sub_number:
+            tokens.append(f"{token}의{sub_number}")
+    return tokens
+
+
+def tokenize(text: str) -> List[str]:
+    """한국어 검색용 토큰화
+
+    형태소 분석기 없이 조사·어미가 붙은 어절도 맞도록 한글은 음절 bigram으로 나누고,
+    숫자·영문은 덩어리 그대로, 조문 인용(제750조 등)은 하나의 토큰으로 추가한다.
+    """
+    text = _normalize(text)
+    tokens = citation_tokens(text)
+    for word in _WORD_PATTERN.findall(text):
+        for run in _SCRIPT_RUN_PATTERN.findall(word):
+            if "가" <= run[0] <= "힣" and len(run) > 1:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            else:
+                tokens.append(run)
+    return tokens
+
+
+def is_citation_query(query: str) -> bool:
+    """조문 인용만으로 이루어진 질의인지 확인 (의미 검색 없이 어휘 검색으로 충분)"""
+    return bool(_CITATION_QUERY_PATTERN.match(_normalize(query)))
+
+
+def has_postings(path: str) -> bool:
+    return os.path.exists(os.path.join(path, DOC_LENGTHS_FILE))
+
+
+def write_postings(path: str, texts: Sequence[bytes]):
+    """세그먼트 청크 본문들의 역색인(용어 → 행 위치·빈도)을 기록"""
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    doc_lengths = np.zeros(len(texts), dtype=np.int32)
+    for position, text in enumerate(texts):
+        counts = Counter(tokenize(text.decode("utf-8")))
+        doc_lengths[position] = sum(counts.values())
+        for term, freq in counts.items():
+            postings.setdefault(term, []).append((position, freq))
+
+    terms = sorted(postings)
+    posting_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    if terms:
+        np.cumsum([len(postings[term]) for term in terms], out=posting_offsets[1:])
+    entries = [entry for term in terms for entry in postings[term]]
+    pairs = np.array(entries, dtype=np.int32).reshape(-1, 2)
+
+    write_strings(
+        os.path.join(path, TERMS_FILE),
+        os.path.join(path, TERM_OFFSETS_FILE),
+        [term.encode("utf-8") for term in terms]
+    )
+    write_array(os.path.join(path, POSTING_OFFSETS_FILE), posting_offsets)
+    write_array(os.path.join(path, POSTING_DOCS_FILE), pairs[:, 0])
+    write_array(os.path.join(path, POSTING_FREQS_FILE), pairs[:, 1])
+
+    doc_lengths_path = os.path.join(path, DOC_LENGTHS_FILE)
+    write_array(doc_lengths_path + ".tmp", doc_lengths)
+    os.replace(doc_lengths_path + ".tmp", doc_lengths_path)
+
+
+class SegmentPostings:
+    """세그먼트 하나의 BM25 역색인 (memmap으로 읽고 생성 후 수정하지 않음)"""
+
+    def __init__(self, path: str):
+        self.doc_lengths = open_array(os.path.join(path, DOC_LENGTHS_FILE), np.int32)
+        self.posting_offsets = open_array(os.path.join(path, POSTING_OFFSETS_FILE), np.int64)
+        self.posting_docs = open_array(os.path.join(path, POSTING_DOCS_FILE), np.int32)
+        self.posting_freqs = open_array(os.path.join(path, POSTING_FREQS_FILE), np.int32)
+        self.total_length = int(self.doc_lengths.sum())
+
+        # 다른 워커의 병합으로 파일이 지워져도 읽을 수 있도록 매핑은 바로 열고, 사전은 첫 검색 때 만든다
+        self._terms_blob = open_blob(os.path.join(path, TERMS_FILE))
+        self._term_offsets = open_array(os.path.join(path, TERM_OFFSETS_FILE), np.int64)
+        self._term_ids: Optional[Dict[str, int]] = None
+
+    def _load_terms(self) -> Dict[str, int]:
+        """용어 사전은 첫 검색 때 읽어 둔다"""
+        if self._term_ids is None:
+            blob = self._terms_blob
+            offsets = self._term_offsets.tolist()
+            self._term_ids = {
+                blob[offsets[i]:offsets[i + 1]].decode("utf-8"): i
+                for i in range(len(offsets) - 1)
+            }
+        return self._term_ids
+
+    def lookup(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """용어가 나온 (행 위치, 빈도) (없으면 None)"""
+        term_id = self._load_terms().get(term)
+        if term_id is None:
+            return None
+        start, end = self.posting_offsets[term_id], self.posting_offsets[term_id + 1]
+        return self.posting_docs[start:end], self.posting_freqs[start:end]
+
+
+def bm25_idf(num_docs: int, doc_freq: int) -> float:
+    return math.log(1.0 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
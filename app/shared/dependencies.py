@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from functools import lru_cache
 
 from fastapi import Depends
@@ -20,25 +21,52 @@ from app.chat.infrastructure.repositories.sqlalchemy_chat_session_repository imp
     SqlAlchemyChatSessionRepository,
 )
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.documents.application.services.document_processor import (
     LangChainDocumentProcessor,
 )
+from app.documents.application.services.ingestion_queue import IngestionQueue
+from app.documents.application.services.upload_storage import ContentAddressedUploadStorage
 from app.documents.application.use_cases.document_use_cases import DocumentUseCases
 from app.documents.infrastructure.repositories.sqlalchemy_document_repository import (
     SqlAlchemyDocumentRepository,
 )
+from app.documents.infrastructure.repositories.sqlalchemy_ingestion_job_repository import (
+    SqlAlchemyIngestionJobRepository,
+)
+from app.search.application.services.embedding_service import (
+    DEFAULT_EMBEDDING_DIMENSION,
+    EmbeddingProvider,
+    HashingEmbeddingService,
+    OpenAIEmbeddingService,
+    create_embedding_service,
+)
 from app.search.application.use_cases.search_use_cases import SearchUseCases
 from app.search.infrastructure.repositories.faiss_vector_store_repository import (
     FAISSVectorStoreRepository,
 )
+from app.search.infrastructure.vector_store.embedding_cache import ContentEmbeddingCache
+from app.search.infrastructure.vector_store.index_factory import IndexConfig, IndexType
+from app.search.infrastructure.vector_store.query_cache import QueryEmbeddingCache
 from app.shared.services.mlflow_tracker import StandardMLflowTracker
 
 
 @lru_cache()
 def get_document_processor():
     """문서 처리기 의존성"""
-    return LangChainDocumentProcessor()
+    return LangChainDocumentProcessor(
+        max_workers=settings.document_parse_workers,
+        pages_per_task=settings.pdf_pages_per_task
+    )
+
+
+@lru_cache()
+def get_upload_storage():
+    """업로드 파일 저장소 의존성 (본문 해시 경로)"""
+    return ContentAddressedUploadStorage(
+        upload_dir=settings.upload_dir,
+        chunk_size=settings.upload_chunk_size_kb * 1024
+    )
 
 
 @lru_cache()
@@ -73,12 +101,86 @@ def get_google_oauth_service():
     return GoogleOAuthService()
 
 
+@lru_cache()
+def get_embedding_service():
+    """임베딩 서비스 의존성 (EMBEDDING_PROVIDER로 선택)"""
+    provider = EmbeddingProvider(settings.embedding_provider.lower())
+    if provider == EmbeddingProvider.HASHING:
+        return HashingEmbeddingService(dimension=settings.embedding_dimension or DEFAULT_EMBEDDING_DIMENSION)
+    return OpenAIEmbeddingService(
+        api_key=settings.openai_api_key,
+        model=settings.embedding_model,
+        dimension=settings.embedding_dimension or None,
+        max_concurrency=settings.embedding_max_concurrency,
+        timeout=settings.embedding_timeout,
+        max_retries=settings.embedding_max_retries
+    )
+
+
+def get_embedding_service_for_model(model: str, dimension: int):
+    """저장소에 기록된 이전 임베딩 모델의 서비스 (재임베딩 전환 전 질의용)"""
+    return create_embedding_service(
+        model,
+        dimension,
+        settings.openai_api_key,
+        max_concurrency=settings.embedding_max_concurrency,
+        timeout=settings.embedding_timeout,
+        max_retries=settings.embedding_max_retries
+    )
+
+
 @lru_cache()
 def get_vector_store_repository():
     """벡터 저장소 의존성"""
     return FAISSVectorStoreRepository(
         faiss_db_path=settings.faiss_db_path,
-        openai_api_key=settings.openai_api_key
+        openai_api_key=settings.openai_api_key,
+        dimension=get_embedding_service().dimension,
+        embedding_batch_size=settings.embedding_batch_size,
+        embedding_batch_max_tokens=settings.embedding_batch_max_tokens,
+        index_config=IndexConfig(
+            index_type=IndexType(settings.faiss_index_type.lower()),
+            nlist=settings.faiss_nlist,
+            nprobe=settings.faiss_nprobe,
+            pq_m=settings.faiss_pq_m,
+            pq_nbits=settings.faiss_pq_nbits,
+            hnsw_m=settings.faiss_hnsw_m,
+            ef_construction=settings.faiss_ef_construction,
+            ef_search=settings.faiss_ef_search,
+            min_train_size=settings.faiss_min_train_size,
+            rerank_factor=settings.faiss_rerank_factor
+        ),
+        delta_max_rows=settings.faiss_delta_max_rows,
+        max_segments=settings.faiss_max_segments,
+        max_deleted_ratio=settings.faiss_max_deleted_ratio,
+        executor_workers=settings.vector_executor_workers,
+        omp_threads=settings.faiss_omp_threads,
+        search_batch_size=settings.search_batch_size,
+        search_batch_window_ms=settings.search_batch_window_ms,
+        hybrid_search=settings.hybrid_search_enabled,
+        hybrid_candidates=settings.hybrid_candidates,
+        rrf_k=settings.hybrid_rrf_k,
+        dedup_enabled=settings.dedup_enabled,
+        dedup_similarity_threshold=settings.dedup_similarity_threshold,
+        dedup_vector_threshold=settings.dedup_vector_threshold,
+        collection_memory_budget_mb=settings.vector_collection_memory_budget_mb,
+        reload_check_interval_ms=settings.faiss_reload_check_interval_ms,
+        snapshot_retention=settings.faiss_snapshot_retention,
+        embedding_service_factory=get_embedding_service_for_model,
+        reembed_batch_size=settings.reembed_batch_size,
+        reembed_batch_interval_ms=settings.reembed_batch_interval_ms,
+        embedding_service=get_embedding_service(),
+        query_cache=QueryEmbeddingCache(
+            max_entries=settings.query_cache_max_entries,
+            ttl_seconds=settings.query_cache_ttl_seconds,
+            namespace=get_embedding_service().cache_namespace,
+            disk_path=settings.query_cache_disk_path,
+            disk_max_entries=settings.query_cache_disk_max_entries
+        ),
+        embedding_cache=(
+            ContentEmbeddingCache(settings.embedding_cache_path)
+            if settings.embedding_cache_path else None
+        )
     )
 
 
@@ -87,6 +189,11 @@ def get_document_repository(db: Session = Depends(get_db)):
     return SqlAlchemyDocumentRepository(db)
 
 
+def get_ingestion_job_repository(db: Session = Depends(get_db)):
+    """문서 수집 작업 저장소 의존성"""
+    return SqlAlchemyIngestionJobRepository(db)
+
+
 def get_chat_session_repository(db: Session = Depends(get_db)):
     """채팅 세션 저장소 의존성"""
     return SqlAlchemyChatSessionRepository(db)
@@ -117,14 +224,46 @@ def get_document_use_cases(
     document_repository=Depends(get_document_repository),
     vector_store_repository=Depends(get_vector_store_repository),
     document_processor=Depends(get_document_processor),
-    mlflow_tracker=Depends(get_mlflow_tracker)
+    mlflow_tracker=Depends(get_mlflow_tracker),
+    ingestion_job_repository=Depends(get_ingestion_job_repository)
 ):
     """문서 유스케이스 의존성"""
     return DocumentUseCases(
         document_repository=document_repository,
         vector_store_repository=vector_store_repository,
         document_processor=document_processor,
-        mlflow_tracker=mlflow_tracker
+        mlflow_tracker=mlflow_tracker,
+        ingestion_job_repository=ingestion_job_repository,
+        ingestion_max_attempts=settings.ingestion_max_attempts,
+        ingestion_retry_backoff_seconds=settings.ingestion_retry_backoff_seconds,
+        ingestion_batch_chunks=settings.ingestion_batch_chunks
+    )
+
+
+@contextmanager
+def document_use_cases_session():
+    """요청 밖(수집 워커)에서 쓰는 문서 유스케이스 (자체 DB 세션을 열고 닫음)"""
+    db = SessionLocal()
+    try:
+        yield get_document_use_cases(
+            document_repository=get_document_repository(db),
+            vector_store_repository=get_vector_store_repository(),
+            document_processor=get_document_processor(),
+            mlflow_tracker=get_mlflow_tracker(),
+            ingestion_job_repository=get_ingestion_job_repository(db)
+        )
+    finally:
+        db.close()
+
+
+@lru_cache()
+def get_ingestion_queue():
+    """문서 수집 워커 풀 의존성"""
+    return IngestionQueue(
+        document_use_cases_session,
+        concurrency=settings.ingestion_concurrency,
+        poll_interval=settings.ingestion_poll_interval_seconds,
+        lease_seconds=settings.ingestion_lease_seconds
     )
 
 
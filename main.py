@@ -5,6 +5,12 @@ from app.auth.presentation.controllers.auth_controller import AuthController
 from app.chat.presentation.controllers.chat_controller import ChatController
 from app.db.database import create_tables
 from app.documents.presentation.controllers.document_controller import DocumentController
+from app.shared.dependencies import (
+    get_document_processor,
+    get_embedding_service,
+    get_ingestion_queue,
+    get_vector_store_repository,
+)
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -23,6 +29,24 @@ async def startup_event():
     except Exception as e:
         print(f"❌ 데이터베이스 테이블 생성 중 오류 발생: {e}")
 
+    # 문서 수집 워커 시작 (이전 실행에서 남은 대기 작업도 이어서 처리)
+    get_ingestion_queue().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 실행"""
+    # 처리 중인 수집 작업은 대기열로 되돌린 뒤 워커 종료
+    if get_ingestion_queue.cache_info().currsize:
+        await get_ingestion_queue().stop()
+    # 생성된 경우에만 임베딩 커넥션 풀, 벡터 연산 실행기, 문서 파싱 프로세스 풀 종료
+    if get_embedding_service.cache_info().currsize:
+        await get_embedding_service().aclose()
+    if get_vector_store_repository.cache_info().currsize:
+        get_vector_store_repository().close()
+    if get_document_processor.cache_info().currsize:
+        get_document_processor().close()
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -77,17 +101,17 @@ async def architecture_info():
             "architecture": "Domain-Driven Design (DDD)",
             "layers": {
                 "domain": {
-                    "entities": ["Document", "ChatSession", "ChatMessage", "SearchResult", "User"],
+                    "entities": ["Document", "IngestionJob", "ChatSession", "ChatMessage", "SearchResult", "User"],
                     "value_objects": ["DocumentChunk", "EmbeddingResult", "PerformanceMetrics"],
-                    "repositories": ["DocumentRepository", "ChatSessionRepository", "ChatMessageRepository", "VectorStoreRepository", "UserRepository"]
+                    "repositories": ["DocumentRepository", "IngestionJobRepository", "ChatSessionRepository", "ChatMessageRepository", "VectorStoreRepository", "UserRepository"]
                 },
                 "application": {
                     "use_cases": ["DocumentUseCases", "ChatUseCases", "SearchUseCases", "UserUseCases"],
-                    "services": ["DocumentProcessor", "LLMService", "MLflowTracker", "GoogleOAuthService"]
+                    "services": ["DocumentProcessor", "IngestionQueue", "LLMService", "EmbeddingService", "MLflowTracker", "GoogleOAuthService"]
                 },
                 "infrastructure": {
                     "repositories": ["SqlAlchemyRepositories", "FAISSVectorStoreRepository"],
-                    "services": ["OpenAILLMService", "StandardMLflowTracker"]
+                    "services": ["OpenAILLMService", "OpenAIEmbeddingService", "StandardMLflowTracker"]
                 },
                 "presentation": {
                     "controllers": ["ChatController", "DocumentController", "AuthController"],
@@ -0,0 +1,4 @@
+import os
+
+# 설정 모듈이 필수 값을 검증하므로 테스트에서는 임의 키 사용 (외부 API는 호출하지 않는다)
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,147 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, List
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.documents.application.services.document_processor import DocumentProcessor
+from app.documents.application.use_cases.document_use_cases import DocumentUseCases
+from app.documents.domain.entities.document import DocumentStatus
+from app.documents.domain.repositories.document_repository import DuplicateUploadError
+from app.documents.domain.value_objects.document_chunk import DocumentChunk
+from app.documents.infrastructure.repositories.sqlalchemy_document_repository import SqlAlchemyDocumentRepository
+from app.documents.infrastructure.repositories.sqlalchemy_ingestion_job_repository import (
+    SqlAlchemyIngestionJobRepository,
+)
+from app.search.application.services.embedding_service import HashingEmbeddingService
+from app.search.infrastructure.repositories.faiss_vector_store_repository import FAISSVectorStoreRepository
+from app.search.infrastructure.vector_store.index_factory import IndexConfig
+
+
+class VersionedProcessor(DocumentProcessor):
+    """파일 경로별로 정해 둔 페이지 본문을 청크로 내보내고, fail_after 묶음 뒤에 실패하는 처리기"""
+
+    def __init__(self):
+        self.pages: Dict[str, List[List[str]]] = {}
+        self.fail_after: Dict[str, int] = {}
+
+    async def process_document(self, file_path: str) -> List[DocumentChunk]:
+        return [chunk async for batch in self.stream_document(file_path) for chunk in batch]
+
+    async def stream_document(self, file_path: str):
+        for page, texts in enumerate(self.pages[file_path]):
+            if self.fail_after.get(file_path) == page:
+                raise RuntimeError("파싱 실패")
+            yield [
+                DocumentChunk(content=text, chunk_id=f"{file_path}_{page}_{i}", source=file_path, page=page)
+                for i, text in enumerate(texts)
+            ]
+
+
+class NullTracker:
+    @contextmanager
+    def start_run(self, run_name: str):
+        yield
+
+    async def log_params(self, params): pass
+
+    async def log_metrics(self, metrics): pass
+
+    async def log_metric(self, key, value): pass
+
+    async def log_text(self, text, artifact_file): pass
+
+
+def article(number: int, revision: int = 0) -> str:
+    return f"제{number}조 이 법은 조항 {number}에 관한 규정이다. {'개정 ' * revision}시행일 {number * 7919}"
+
+
+@pytest.fixture
+def use_cases(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/db.sqlite3")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    vector_store = FAISSVectorStoreRepository(
+        str(tmp_path / "faiss"),
+        "",
+        embedding_service=HashingEmbeddingService(64),
+        index_config=IndexConfig(),
+        reload_check_interval_ms=0
+    )
+    use_cases = DocumentUseCases(
+        SqlAlchemyDocumentRepository(session),
+        vector_store,
+        VersionedProcessor(),
+        NullTracker(),
+        SqlAlchemyIngestionJobRepository(session),
+        ingestion_max_attempts=1,
+        ingestion_retry_backoff_seconds=0,
+        ingestion_batch_chunks=2
+    )
+    yield use_cases
+    vector_store.close()
+    session.close()
+
+
+async def ingest(use_cases: DocumentUseCases, filename: str, file_path: str):
+    await use_cases.enqueue_document(filename, file_path, 1, ".txt")
+    job = await use_cases.claim_next_ingestion_job()
+    return await use_cases.process_ingestion_job(job)
+
+
+def stored_texts(use_cases: DocumentUseCases, source: str) -> List[str]:
+    snapshot = use_cases.vector_store_repository.collections.acquire("default").snapshot
+    use_cases.vector_store_repository.collections.release("default")
+    return sorted(text.decode("utf-8") for _, text, _ in snapshot.chunks_for_source(source))
+
+
+def test_replacement_indexes_only_changed_chunks(use_cases):
+    processor = use_cases.document_processor
+    processor.pages["/u/v1.txt"] = [[article(0), article(1), article(2)], [article(3)]]
+    processor.pages["/u/v2.txt"] = [[article(0), article(1, 1), article(2)], [article(4)]]
+
+    asyncio.run(ingest(use_cases, "law.txt", "/u/v1.txt"))
+    job = asyncio.run(ingest(use_cases, "law.txt", "/u/v2.txt"))
+
+    assert job.chunk_count == 4
+    assert stored_texts(use_cases, "/u/v1.txt") == sorted(processor.pages["/u/v2.txt"][0] + [article(4)])
+    documents = asyncio.run(use_cases.document_repository.find_all_by_filename("law.txt"))
+    assert [document.file_path for document in documents] == ["/u/v2.txt"]
+
+
+def test_failed_replacement_keeps_only_previous_version_chunks(use_cases):
+    """대체 작업이 끝내 실패하면 새 버전으로 추가된 청크는 지워지고 이전 버전만 남는다"""
+    processor = use_cases.document_processor
+    processor.pages["/u/v1.txt"] = [[article(0), article(1)], [article(2)], [article(3)]]
+    processor.pages["/u/v2.txt"] = [[article(0, 1), article(1, 1)], [article(2, 1)], [article(3, 1)]]
+    processor.fail_after["/u/v2.txt"] = 2
+
+    asyncio.run(ingest(use_cases, "law.txt", "/u/v1.txt"))
+    job = asyncio.run(ingest(use_cases, "law.txt", "/u/v2.txt"))
+
+    assert job.error is not None
+    assert stored_texts(use_cases, "/u/v1.txt") == sorted(text for page in processor.pages["/u/v1.txt"] for text in page)
+    statuses = {
+        document.file_path: document.status
+        for document in asyncio.run(use_cases.document_repository.find_all_by_filename("law.txt"))
+    }
+    assert statuses == {"/u/v1.txt": DocumentStatus.COMPLETED, "/u/v2.txt": DocumentStatus.FAILED}
+
+
+def test_concurrent_upload_of_same_content_returns_existing_job(use_cases):
+    """같은 본문이 같은 컬렉션에 동시에 등록되면 하나만 등록되고 나머지는 먼저 등록된 작업을 받는다"""
+    async def register(collection: str):
+        return await use_cases.enqueue_document("law.txt", "/u/same.txt", 1, ".txt", collection)
+
+    first = asyncio.run(register("default"))
+    with pytest.raises(DuplicateUploadError) as duplicate:
+        asyncio.run(register("default"))
+
+    assert duplicate.value.document.id == first.document_id
+    assert duplicate.value.document.metadata["ingestion_job_id"] == first.job_id
+    assert asyncio.run(use_cases.get_ingestion_job(first.job_id)).document_id == first.document_id
+    # 다른 컬렉션에는 같은 본문도 등록된다
+    assert asyncio.run(register("other")).document_id != first.document_id
@@ -0,0 +1,28 @@
+from app.search.infrastructure.vector_store.collection_registry import CollectionRegistry
+from app.search.infrastructure.vector_store.index_factory import IndexConfig
+from app.search.infrastructure.vector_store.segment_store import SegmentStore
+
+from tests.search.test_segment_store import DIMENSION, make_rows
+
+
+def test_evicted_and_shutdown_stores_release_lock_files(tmp_path):
+    """예산을 넘어 내보낸 저장소와 종료 시 남은 저장소는 파일 잠금을 닫고 스냅샷을 놓는다"""
+    opened = []
+
+    def open_store(name: str, path: str) -> SegmentStore:
+        opened.append(SegmentStore(path, DIMENSION, IndexConfig()))
+        return opened[-1]
+
+    registry = CollectionRegistry(str(tmp_path), open_store, memory_budget_bytes=0)
+    for name in ("first", "second"):
+        store = registry.acquire(name)
+        store.append(make_rows(0, 5))
+        registry.release(name)
+
+    assert registry.loaded() == []
+    assert all(store._lock_file.closed and store.snapshot is None for store in opened)
+
+    store = registry.acquire("first")
+    registry.close()
+    assert store._lock_file.closed
+    assert registry.loaded() == []
@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+from typing import List
+
+import numpy as np
+
+from app.documents.domain.value_objects.document_chunk import DocumentChunk
+from app.search.application.services.embedding_service import HashingEmbeddingService
+from app.search.infrastructure.repositories.faiss_vector_store_repository import FAISSVectorStoreRepository
+from app.search.infrastructure.vector_store.chunk_store import ChunkRows
+from app.search.infrastructure.vector_store.index_factory import IndexConfig
+from app.search.infrastructure.vector_store.reembedding import ReembeddingMigration, ReembeddingState
+from app.search.infrastructure.vector_store.segment_store import SegmentStore
+
+SOURCE_DIMENSION = 16
+TARGET_DIMENSION = 8
+
+
+def embed_text(text: str, dimension: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimension).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def make_rows(start: int, count: int) -> ChunkRows:
+    texts = [f"본문 {start + i}" for i in range(count)]
+    return ChunkRows(
+        ids=None,
+        vectors=np.stack([embed_text(text, SOURCE_DIMENSION) for text in texts]),
+        texts=[text.encode("utf-8") for text in texts],
+        chunk_keys=[f"/u/doc.pdf_{start + i}".encode("utf-8") for i in range(count)],
+        sources=["/u/doc.pdf"] * count,
+        pages=[0] * count
+    )
+
+
+class SameModelEmbeddingService(HashingEmbeddingService):
+    """차원만 다르고 모델 이름은 같은 임베딩 (EMBEDDING_DIMENSION만 바꾼 경우)"""
+
+    def __init__(self, dimension: int):
+        super().__init__(dimension)
+        self.model = "same-model"
+
+
+def open_repository(path, dimension: int) -> FAISSVectorStoreRepository:
+    return FAISSVectorStoreRepository(
+        str(path),
+        "",
+        embedding_service=SameModelEmbeddingService(dimension),
+        embedding_service_factory=lambda model, dimension: SameModelEmbeddingService(dimension),
+        reload_check_interval_ms=0,
+        reembed_batch_interval_ms=0
+    )
+
+
+async def embed(texts: List[str]) -> np.ndarray:
+    return np.stack([embed_text(text, TARGET_DIMENSION) for text in texts])
+
+
+async def run_sync(func, *args):
+    return func(*args)
+
+
+def test_adopt_after_merge_compaction_keeps_every_chunk_searchable(tmp_path):
+    """병합으로 세그먼트 순서와 ID 순서가 어긋난 저장소도 전환 후 모든 청크가 검색된다"""
+    store = SegmentStore(
+        str(tmp_path), SOURCE_DIMENSION, IndexConfig(),
+        delta_max_rows=5, max_segments=4, embedding_model="old-model"
+    )
+    for start in range(0, 20, 5):
+        store.append(make_rows(start, 5))
+    # 세그먼트가 max_segments를 넘어 작은 세그먼트 넷(ID 0~19)이 20~29 뒤의 새 세그먼트로 병합된다
+    store.append(make_rows(20, 10))
+    segment_ids = [int(segment.ids[0]) for segment in store.snapshot.segments.values()]
+    assert segment_ids != sorted(segment_ids)
+
+    migration = ReembeddingMigration(store, "new-model", TARGET_DIMENSION, embed, run_sync, batch_size=10, batch_interval=0)
+    asyncio.run(migration.run())
+
+    assert migration.progress["state"] == ReembeddingState.COMPLETED.value
+    snapshot = store.snapshot
+    assert snapshot.embedding_model == "new-model"
+    assert len(snapshot) == 30
+    for chunk_id in range(30):
+        query = embed_text(f"본문 {chunk_id}", TARGET_DIMENSION).reshape(1, -1)
+        _, ids = snapshot.search(query, 1)
+        assert int(ids[0][0]) == chunk_id
+
+
+def test_dimension_only_change_keeps_serving_and_migrates(tmp_path):
+    """모델은 그대로 두고 차원만 바꿔도 저장소가 열리고, 전환 전에는 이전 차원으로 검색한 뒤 새 차원으로 옮겨진다"""
+    texts = [f"제{i}조 근로계약 해지 사례 {i * 7919}" for i in range(12)]
+    chunks = [
+        DocumentChunk(content=text, chunk_id=f"/u/law.txt_{i}", source="/u/law.txt", page=0)
+        for i, text in enumerate(texts)
+    ]
+
+    repository = open_repository(tmp_path, SOURCE_DIMENSION)
+    assert asyncio.run(repository.add_documents(chunks))
+    repository.close()
+
+    async def migrate(repository: FAISSVectorStoreRepository):
+        before = await repository.search_similar(texts[3], k=1)
+        await repository.start_reembedding()
+        await repository._reembedding_tasks["default"]
+        after = await repository.search_similar(texts[3], k=1)
+        return before, after, await repository.get_reembedding_status()
+
+    repository = open_repository(tmp_path, TARGET_DIMENSION)
+    before, after, status = asyncio.run(migrate(repository))
+    snapshot = repository.collections.acquire("default").snapshot
+    repository.collections.release("default")
+    repository.close()
+
+    assert before.contexts == [texts[3]]
+    assert status["state"] == ReembeddingState.COMPLETED.value
+    assert snapshot.dimension == TARGET_DIMENSION
+    assert after.contexts == [texts[3]]
@@ -0,0 +1,90 @@
+import numpy as np
+
+from app.search.domain.value_objects.search_filter import SearchFilter
+from app.search.infrastructure.vector_store.chunk_store import ChunkRows
+from app.search.infrastructure.vector_store.index_factory import IndexConfig
+from app.search.infrastructure.vector_store.segment_store import SegmentStore
+
+DIMENSION = 16
+
+
+def make_rows(start: int, count: int, seed: int = 0, source: str = "/u/doc.pdf") -> ChunkRows:
+    rng = np.random.default_rng(seed + start)
+    vectors = rng.standard_normal((count, DIMENSION)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return ChunkRows(
+        ids=None,
+        vectors=vectors,
+        texts=[f"본문 {start + i}".encode("utf-8") for i in range(count)],
+        chunk_keys=[f"{source}_{start + i}".encode("utf-8") for i in range(count)],
+        sources=[source] * count,
+        pages=[0] * count
+    )
+
+
+def open_store(path, **kwargs) -> SegmentStore:
+    # 삭제 비율로 병합이 일어나지 않도록 (증분 인덱스를 그대로 두고 검증)
+    kwargs.setdefault("max_deleted_ratio", 0.9)
+    return SegmentStore(str(path), DIMENSION, IndexConfig(), **kwargs)
+
+
+def nearest(store: SegmentStore, vector: np.ndarray) -> int:
+    _, ids = store.snapshot.search(vector.reshape(1, -1), 1)
+    return int(ids[0][0])
+
+
+def test_rollback_after_delete_and_reopen_restores_searchable_chunks(tmp_path):
+    """삭제 후 다시 연 저장소를 삭제 전 버전으로 롤백하면 되살아난 청크도 검색된다"""
+    first = make_rows(0, 5)
+    store = open_store(tmp_path)
+    store.append(first)
+    store.append(make_rows(5, 5))
+    before_delete = store.snapshot.version
+
+    store = open_store(tmp_path)
+    store.delete(np.array([0, 1]))
+    store = open_store(tmp_path)
+    store.rollback(before_delete)
+
+    assert len(store.snapshot) == 10
+    assert nearest(store, first.vectors[0]) == 0
+    assert nearest(store, first.vectors[1]) == 1
+
+
+def test_refresh_picks_up_rollback_from_another_worker(tmp_path):
+    """다른 워커의 롤백을 refresh로 받으면 되살아난 청크도 검색된다"""
+    first = make_rows(0, 5)
+    writer = open_store(tmp_path)
+    writer.append(first)
+    writer.append(make_rows(5, 5))
+    before_delete = writer.snapshot.version
+
+    writer.delete(np.array([0, 1]))
+    # 삭제 후에 연 워커의 증분 인덱스에는 삭제된 청크가 없다
+    reader = open_store(tmp_path)
+    assert nearest(reader, first.vectors[0]) != 0
+
+    writer.rollback(before_delete)
+    assert reader.refresh()
+    assert len(reader.snapshot) == 10
+    assert nearest(reader, first.vectors[0]) == 0
+
+
+def test_filtered_search_scores_duplicates_through_their_canonical_chunk(tmp_path):
+    """필터에 맞는 행이 적어 직접 비교할 때도 중복 청크 행은 대표 청크로 한 번만 나온다"""
+    first = make_rows(0, 5, source="/u/a.pdf")
+    duplicates = make_rows(5, 5, seed=1, source="/u/b.pdf")
+    duplicates.vectors[0] = first.vectors[0]
+    duplicates.canonical_ids = np.array([0, -1, -1, -1, -1], dtype=np.int64)
+    store = open_store(tmp_path)
+    store.append(first)
+    store.append(duplicates)
+    query = first.vectors[0].reshape(1, -1)
+
+    _, ids = store.snapshot.search_filtered(query, 2, SearchFilter.create(sources=["/u/a.pdf", "/u/b.pdf"]))
+    assert int(ids[0][0]) == 0
+    assert 5 not in ids[0].tolist()
+
+    # 대표 청크가 필터 밖이면 대표 청크로 찾은 결과를 중복 청크 ID로 돌려준다
+    _, ids = store.snapshot.search_filtered(query, 1, SearchFilter.create(sources=["/u/b.pdf"]))
+    assert int(ids[0][0]) == 5